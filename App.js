@@ -18,6 +18,7 @@ export default function App() {
   const [currentWorkOrderId, setCurrentWorkOrderId] = useState(null);
   const [user, setUser] = useState(null);
   const [notifications, setNotifications] = useState([]);
+  const [unseenNotificationsCount, setUnseenNotificationsCount] = useState(0);
   const [isNotificationMenuOpen, setIsNotificationMenuOpen] = useState(false);
 
   const handleLogin = async (userData) => {
@@ -68,10 +69,18 @@ export default function App() {
       const token = await storage.getItem('token');
       if (!token) return;
 
-      const res = await api.get('/api/notifications', {
-        headers: { Authorization: `Bearer ${token}` },
-      });
-      setNotifications(res.data);
+      // Son bildirimlerin ilk sayfası ve rozet için okunmamış sayısı
+      const [res, countRes] = await Promise.all([
+        api.get('/api/notifications', {
+          params: { limit: 20 },
+          headers: { Authorization: `Bearer ${token}` },
+        }),
+        api.get('/api/notifications/unread_count', {
+          headers: { Authorization: `Bearer ${token}` },
+        }),
+      ]);
+      setNotifications(res.data.items);
+      setUnseenNotificationsCount(countRes.data.unread_count);
     } catch (err) {
       console.error('Bildirimler alınamadı:', err);
       onMessage(err.response?.data || err.message, 'error');
@@ -105,8 +114,6 @@ export default function App() {
     checkUser();
   }, []);
 
-  const unseenNotificationsCount = notifications.filter(n => !n.is_read).length;
-
   const renderPage = () => {
     const props = { onNavigate: handleNavigate, onMessage };
     switch (currentPage) {
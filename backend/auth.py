@@ -1,21 +1,23 @@
 # auth.py
-from fastapi import APIRouter, Depends, HTTPException, status # Bu satırın başında boşluk olmadığından emin olun
+from fastapi import APIRouter, Depends, HTTPException, Request, status # Bu satırın başında boşluk olmadığından emin olun
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
-from .database import get_db
+from . import config
+from .cache import TTLCache
+from .database import get_async_db
 from .models import User
+from .hashing import get_password_hash_async, verify_password_async
+from .metrics import TimedRoute
 from pydantic import BaseModel
-from typing import Optional
 
 SECRET_KEY = "cok-gizli-anahtar" # BURAYI GÜVENLİ BİR ANAHTARLA DEĞİŞTİRİN!
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+router = APIRouter(route_class=TimedRoute)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 class UserCreate(BaseModel):
@@ -23,18 +25,10 @@ class UserCreate(BaseModel):
     email: str
     password: str
 
-# Şifre doğrulama
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-# Şifre hashleme
-def get_password_hash(password):
-    return pwd_context.hash(password)
-
-# Kullanıcıyı veritabanından doğrula
-def authenticate_user(db, username: str, password: str):
-    user = db.query(User).filter(User.username == username).first()
-    if not user or not verify_password(password, user.hashed_password):
+# Kullanıcıyı veritabanından doğrula (bcrypt işi process havuzunda çalışır)
+async def authenticate_user(db: AsyncSession, username: str, password: str):
+    user = (await db.execute(select(User).where(User.username == username))).scalars().first()
+    if not user or not await verify_password_async(password, user.hashed_password):
         return None
     return user
 
@@ -45,8 +39,35 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+# Kimliği doğrulanmış kullanıcılar için process içi önbellek. Anahtar token'daki "uid"
+# (eski token'larda kullanıcı adı); değer oturumdan ayrılmış (detached) User nesnesi.
+_user_cache = TTLCache(maxsize=config.USER_CACHE_SIZE, ttl=config.USER_CACHE_TTL)
+
+def invalidate_cached_user(user: User):
+    _user_cache.pop(user.id)
+    _user_cache.pop(user.username)
+
+# ORM üzerinden yapılan her kullanıcı değişikliği/silme işleminde önbelleği temizle
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _on_user_changed(mapper, connection, target):
+    invalidate_cached_user(target)
+
 # Token'dan kullanıcıyı al
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(request: Request, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    # /api/batch alt isteklerinde kimlik toplu istekte bir kez doğrulanmıştır (bkz. batch.py)
+    batch_user = getattr(request.state, "batch_user", None)
+    if batch_user is not None:
+        return await db.merge(batch_user, load=False)
+    return await user_from_token(token, db)
+
+async def user_from_token(token: str, db: AsyncSession):
+    cached_user = await authenticate_token(token, db)
+    # Sorgu atmadan bu oturuma bağlı bir kopya döndür (load=False)
+    return await db.merge(cached_user, load=False)
+
+# Token'ı doğrular ve oturumdan ayrılmış (detached) kullanıcıyı döndürür
+async def authenticate_token(token: str, db: AsyncSession) -> User:
     credentials_exception = HTTPException(status_code=401, detail="Geçersiz kimlik bilgileri")
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -55,33 +76,46 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
-        raise credentials_exception
-    return user
+    user_id = payload.get("uid")
+    cache_key = user_id if user_id is not None else username
+
+    cached_user = _user_cache.get(cache_key)
+    if cached_user is None or cached_user.username != username:
+        query = select(User)
+        if user_id is not None:
+            query = query.where(User.id == user_id)
+        else:
+            query = query.where(User.username == username)
+        user = (await db.execute(query)).scalars().first()
+        if user is None or user.username != username:
+            raise credentials_exception
+        # Önbellekteki kopya bu isteğin oturumuna bağlı kalmasın
+        db.expunge(user)
+        _user_cache.set(cache_key, user)
+        cached_user = user
+    return cached_user
 
 # Login endpoint
 @router.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=401, detail="Geçersiz kullanıcı adı veya şifre")
-    access_token = create_access_token(data={"sub": user.username})
+    access_token = create_access_token(data={"sub": user.username, "uid": user.id})
     return {"access_token": access_token, "token_type": "bearer"}
 
 # Register endpoint
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.username == user.username).first()
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing_user = (await db.execute(select(User.id).where(User.username == user.username))).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Kullanıcı adı zaten mevcut")
-    existing_email = db.query(User).filter(User.email == user.email).first()
+    existing_email = (await db.execute(select(User.id).where(User.email == user.email))).first()
     if existing_email:
         raise HTTPException(status_code=400, detail="E-posta zaten kayıtlı")
 
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     new_user = User(username=user.username, email=user.email, hashed_password=hashed_password)
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
     return {"message": "Kayıt başarılı"}
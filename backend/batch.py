@@ -0,0 +1,130 @@
+# backend/batch.py
+# Toplu istek: mobil istemci bir ekran için gereken istekleri (iş emri, kullanıcı listesi, bildirimler...)
+# tek gidiş-dönüşte gönderir. Alt istekler mevcut router'lar üzerinden (app.router) sırayla yürütülür;
+# kimlik toplu istekte bir kez doğrulanır ve tüm alt istekler aynı veritabanı oturumunu kullanır
+# (request.state.batch_user / batch_db; bkz. auth.get_current_user, database.get_async_db).
+#
+# - Alt istekler middleware'lerden (CORS, metrikler, Idempotency-Key) ayrıca geçmez; toplu istek geçer.
+# - Her alt isteğin sonucu ayrıdır; biri hata verse de sonrakiler yürütülür.
+# - Akış yanıtı dönen uç noktalar (SSE, dışa aktarma) ve iç içe toplu istek desteklenmez.
+# - JSON gövdeler yeniden ayrıştırılmadan toplu yanıta eklenir.
+
+import logging
+from typing import Dict, List, Tuple
+from urllib.parse import quote, unquote
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from . import config, schemas, serializers
+from .auth import authenticate_token, oauth2_scheme
+from .database import get_async_db
+from .metrics import TimedRoute
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=TimedRoute)
+
+UNSUPPORTED_PATHS = ("/api/batch", "/api/notifications/stream", "/api/emirler/export")
+# Alt isteğin kendi belirleyemeyeceği başlıklar; kimlik ve gövde bilgisi toplu istekten gelir
+RESERVED_HEADERS = {"authorization", "host", "content-length", "content-type", "idempotency-key"}
+# Routing sırasında scope'a eklenen ve alt istekte yeniden belirlenecek anahtarlar
+ROUTING_KEYS = ("endpoint", "route", "path_params", "router")
+
+SubResult = Tuple[int, Dict[str, str], bytes, bool]
+
+def _check_batch_size(count: int):
+    if count > config.BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"Tek istekte en fazla {config.BATCH_MAX_REQUESTS} alt istek gönderilebilir")
+
+def _sub_scope(parent: dict, sub: schemas.BatchSubRequest, state: dict, body: bytes) -> dict:
+    # İstemci yolu kodlamadan da gönderebilir (?q=pompa arıza); sunucunun alacağı biçime çevrilir
+    path, _, query = sub.path.partition("?")
+    raw_path = quote(path, safe="/%:@")
+    headers = [(name, value) for name, value in parent["headers"] if name in (b"host", b"authorization")]
+    headers += [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in sub.headers.items() if name.lower() not in RESERVED_HEADERS
+    ]
+    if sub.body is not None:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    scope = {key: value for key, value in parent.items() if key not in ROUTING_KEYS}
+    scope.update(
+        method=sub.method,
+        path=unquote(raw_path),
+        raw_path=raw_path.encode(),
+        query_string=quote(query, safe="=&%+:,;/").encode(),
+        headers=headers,
+        state=state,
+    )
+    return scope
+
+async def _dispatch(request: Request, sub: schemas.BatchSubRequest, state: dict) -> SubResult:
+    path = unquote(sub.path.partition("?")[0])
+    if not path.startswith("/api/") or path.rstrip("/") in UNSUPPORTED_PATHS:
+        return 400, {}, serializers.dumps({"detail": f"Toplu istekte desteklenmeyen yol: {path}"}), True
+
+    body = serializers.dumps(sub.body) if sub.body is not None else b""
+    scope = _sub_scope(request.scope, sub, state, body)
+    status_code = 500
+    headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await request.receive()
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            for name, value in message.get("headers", ()):
+                if name != b"content-length":
+                    headers[name.decode("latin-1")] = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app.router(scope, receive, send)
+    except StarletteHTTPException as exc:
+        # Eşleşmeyen yol / yöntem: router hatayı uygulamanın middleware'ine bırakır
+        return exc.status_code, dict(exc.headers or {}), serializers.dumps({"detail": exc.detail}), True
+    except Exception:
+        logger.exception("Toplu istekteki alt istek başarısız: %s %s", sub.method, sub.path)
+        return 500, {}, serializers.dumps({"detail": "Internal Server Error"}), True
+    return status_code, headers, b"".join(chunks), headers.get("content-type", "").startswith("application/json")
+
+def _render(results: List[SubResult]) -> bytes:
+    parts = []
+    for status_code, headers, body, is_json in results:
+        if not body:
+            body = b"null"
+        elif not is_json:
+            body = serializers.dumps(body.decode("utf-8", "replace"))
+        parts.append(b'{"status":%d,"headers":%s,"body":%s}' % (status_code, serializers.dumps(headers), body))
+    return b'{"responses":[' + b",".join(parts) + b"]}"
+
+@router.post("/batch", response_model=schemas.BatchResponse)
+async def batch(
+    payload: schemas.BatchRequest,
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    _check_batch_size(len(payload.requests))
+    user = await authenticate_token(token, db)
+    state = {**request.scope.get("state", {}), "batch_db": db, "batch_user": user}
+
+    results = []
+    for sub in payload.requests:
+        result = await _dispatch(request, sub, state)
+        results.append(result)
+        # Başarısız ya da yazan bir alt istekten kalan değişiklikler sonraki alt istekle commit edilmesin
+        if sub.method != "GET" or result[0] >= 400:
+            await db.rollback()
+    return Response(_render(results), media_type="application/json")
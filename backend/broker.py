@@ -0,0 +1,121 @@
+# backend/broker.py
+# Bildirimlerin anlık iletimi için yayınla/abone ol (pub/sub) aracısı.
+# Varsayılan aracı tek process içinde çalışır; birden fazla uvicorn worker'ı varsa
+# NOTIFICATION_BROKER_URL=redis://... ile tüm process'lerin paylaştığı Redis kullanılır.
+
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, Optional
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+class Broker(ABC):
+    # Mesajı kanala gönderir; bloklamaz, event loop thread'inden çağrılmalıdır
+    @abstractmethod
+    def publish(self, channel: str, message: dict):
+        ...
+
+    # Kanala abone olur ve mesajların düştüğü asyncio.Queue'yu verir (async context manager)
+    @abstractmethod
+    def subscribe(self, channel: str) -> "AsyncContextManager[asyncio.Queue]":
+        ...
+
+    async def close(self):
+        pass
+
+class InMemoryBroker(Broker):
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers = defaultdict(set)
+
+    def publish(self, channel: str, message: dict):
+        for queue in list(self._subscribers.get(channel, ())):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Yavaş abone diğerlerini bekletmesin; en eski mesaj düşürülür
+                queue.get_nowait()
+                queue.put_nowait(message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[channel].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[channel].discard(queue)
+            if not self._subscribers[channel]:
+                del self._subscribers[channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self._subscribers.get(channel, ()))
+
+# Process başına tek bir Redis pubsub bağlantısı açılır; gelen mesajlar yerel abonelere dağıtılır
+class RedisBroker(Broker):
+    def __init__(self, url: str, queue_size: int):
+        import redis.asyncio as redis  # isteğe bağlı bağımlılık: pip install redis
+
+        self._redis = redis.from_url(url)
+        self._pubsub = self._redis.pubsub()
+        self._local = InMemoryBroker(queue_size)
+        self._reader = None
+        self._tasks = set()
+
+    def publish(self, channel: str, message: dict):
+        task = asyncio.get_running_loop().create_task(self._redis.publish(channel, json.dumps(message)))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_published)
+
+    def _on_published(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.warning("Bildirim Redis'e gönderilemedi: %s", task.exception())
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        async with self._local.subscribe(channel) as queue:
+            if self._local.subscriber_count(channel) == 1:
+                await self._pubsub.subscribe(channel)
+            if self._reader is None:
+                self._reader = asyncio.create_task(self._forward())
+            try:
+                yield queue
+            finally:
+                if self._local.subscriber_count(channel) == 1:
+                    await self._pubsub.unsubscribe(channel)
+
+    async def _forward(self):
+        while True:
+            item = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if item and item.get("type") == "message":
+                self._local.publish(item["channel"].decode(), json.loads(item["data"]))
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+        await self._pubsub.close()
+        await self._redis.close()
+
+_broker: Optional[Broker] = None
+
+def get_broker() -> Broker:
+    global _broker
+    if _broker is None:
+        if config.NOTIFICATION_BROKER_URL.startswith(("redis://", "rediss://")):
+            _broker = RedisBroker(config.NOTIFICATION_BROKER_URL, config.BROKER_QUEUE_SIZE)
+        else:
+            _broker = InMemoryBroker(config.BROKER_QUEUE_SIZE)
+    return _broker
+
+async def close_broker():
+    global _broker
+    if _broker is not None:
+        await _broker.close()
+        _broker = None
@@ -0,0 +1,81 @@
+# backend/config.py
+# Ortam değişkenlerinden (ve backend/.env dosyasından) okunan ayarlar
+
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+# Veritabanı bağlantısı ve havuz ayarları
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
+# Boş bırakılırsa DATABASE_URL'den türetilir (sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "")
+DB_POOL_SIZE = env_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = env_int("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = env_int("DB_POOL_TIMEOUT", 30)
+DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+DB_POOL_RECYCLE = env_int("DB_POOL_RECYCLE", 1800)
+DB_ECHO = env_bool("DB_ECHO", False)
+# Yalnızca SQLite: kilit beklerken hata vermeden önce beklenecek süre ve sayfa önbelleği boyutu
+SQLITE_BUSY_TIMEOUT_MS = env_int("SQLITE_BUSY_TIMEOUT_MS", 5000)
+SQLITE_CACHE_SIZE_KB = env_int("SQLITE_CACHE_SIZE_KB", 65536)
+
+# Şifre hashleme (bcrypt) işlerini yürüten process havuzu.
+# 0 verilirse işler ayrı process yerine uygulamanın thread havuzunda çalışır.
+PASSWORD_HASH_WORKERS = env_int("PASSWORD_HASH_WORKERS", os.cpu_count() or 1)
+# Sırada bekleyebilecek en fazla hashleme işi; aşılırsa istek 503 ile hemen reddedilir
+PASSWORD_HASH_MAX_PENDING = env_int("PASSWORD_HASH_MAX_PENDING", 64)
+# Yakın zamanda doğrulanmış şifreler için önbellek (saniye / kayıt sayısı)
+CREDENTIAL_CACHE_TTL = env_int("CREDENTIAL_CACHE_TTL", 300)
+CREDENTIAL_CACHE_SIZE = env_int("CREDENTIAL_CACHE_SIZE", 10000)
+# get_current_user için doğrulanmış kullanıcı önbelleği (saniye / kayıt sayısı)
+USER_CACHE_TTL = env_int("USER_CACHE_TTL", 60)
+USER_CACHE_SIZE = env_int("USER_CACHE_SIZE", 10000)
+# Anlık bildirim aracısı: boş ise process içi, "redis://..." ise Redis pub/sub
+NOTIFICATION_BROKER_URL = os.getenv("NOTIFICATION_BROKER_URL", "")
+# Abone başına bekleyen en fazla mesaj; dolarsa en eskisi düşürülür
+BROKER_QUEUE_SIZE = env_int("BROKER_QUEUE_SIZE", 100)
+# Bağlantının proxy'lerde kapanmaması için SSE akışına yorum satırı gönderme aralığı
+SSE_KEEPALIVE_SECONDS = env_int("SSE_KEEPALIVE_SECONDS", 15)
+# Delta senkronizasyon: token'dan bu kadar saniye öncesi de tekrar gönderilir, böylece
+# token verildiği sırada commit edilmemiş transaction'lardaki değişiklikler kaçırılmaz
+SYNC_OVERLAP_SECONDS = env_int("SYNC_OVERLAP_SECONDS", 5)
+# Tek yanıtta her kayıt türü için dönecek en fazla satır
+SYNC_PAGE_SIZE = env_int("SYNC_PAGE_SIZE", 500)
+# Toplu iş emri uç noktalarında tek istekte işlenebilecek en fazla kayıt
+BULK_MAX_ITEMS = env_int("BULK_MAX_ITEMS", 500)
+# Dışa aktarımda veritabanından tek seferde okunan satır sayısı
+EXPORT_CHUNK_SIZE = env_int("EXPORT_CHUNK_SIZE", 1000)
+# Outbox: tek seferde işlenen olay sayısı, en fazla deneme, ilk yeniden deneme gecikmesi (her denemede
+# iki katına çıkar), işleyen çökerse olayın yeniden alınabilmesi için kilit süresi ve worker bekleme aralığı
+OUTBOX_BATCH_SIZE = env_int("OUTBOX_BATCH_SIZE", 100)
+OUTBOX_MAX_ATTEMPTS = env_int("OUTBOX_MAX_ATTEMPTS", 5)
+OUTBOX_RETRY_SECONDS = env_int("OUTBOX_RETRY_SECONDS", 5)
+OUTBOX_LEASE_SECONDS = env_int("OUTBOX_LEASE_SECONDS", 60)
+OUTBOX_POLL_SECONDS = env_int("OUTBOX_POLL_SECONDS", 2)
+# /metrics uç noktası ve istek ölçümleri (Prometheus metin biçimi)
+METRICS_ENABLED = env_bool("METRICS_ENABLED", True)
+# Bu süreyi (ms) aşan istekler en yavaş SQL ifadeleriyle birlikte günlüğe yazılır; 0 kapalı
+METRICS_SLOW_REQUEST_MS = env_int("METRICS_SLOW_REQUEST_MS", 0)
+# Yavaş istek günlüğünde gösterilecek en fazla SQL ifadesi
+METRICS_SLOW_SQL_LIMIT = env_int("METRICS_SLOW_SQL_LIMIT", 5)
+# Liste, detay ve arama yanıtları Pydantic doğrulaması yerine doğrudan dict'ten (ve kuruluysa
+# orjson ile) serileştirilir; bkz. serializers.py
+FAST_JSON_RESPONSES = env_bool("FAST_JSON_RESPONSES", True)
+# Idempotency-Key ile gelen POST isteklerinin yanıtlarının saklanma süresi (saniye); 0 özelliği kapatır
+IDEMPOTENCY_TTL_SECONDS = env_int("IDEMPOTENCY_TTL_SECONDS", 86400)
+# İşlenmekte olan anahtarın kilidi; istek bu sürede tamamlanmazsa (ör. process çöktüyse) anahtar yeniden kullanılabilir
+IDEMPOTENCY_LOCK_SECONDS = env_int("IDEMPOTENCY_LOCK_SECONDS", 60)
+# /api/batch ile tek istekte gönderilebilecek en fazla alt istek
+BATCH_MAX_REQUESTS = env_int("BATCH_MAX_REQUESTS", 20)
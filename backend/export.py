@@ -0,0 +1,103 @@
+# backend/export.py
+# İş emirlerinin güncelleme geçmişiyle birlikte CSV / NDJSON olarak akış halinde dışa aktarımı.
+# Satırlar veritabanından sunucu tarafı imleçle (yield_per) parça parça okunur ve her parça
+# yazılıp gönderildikten sonra bırakılır; tablo ne kadar büyük olursa olsun bellek kullanımı sabit kalır.
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import select
+
+from . import config, models
+from .database import AsyncSessionLocal
+
+CSV_COLUMNS = [
+    "id", "is_emri_no", "title", "description", "priority", "status",
+    "assigned_user_id", "assignee_name", "created_at", "updated_at", "update_count", "updates",
+]
+
+def export_query(status_filter: Optional[str], created_from: Optional[datetime], created_to: Optional[datetime]):
+    query = (
+        select(
+            models.WorkOrder.id,
+            models.WorkOrder.is_emri_no,
+            models.WorkOrder.title,
+            models.WorkOrder.description,
+            models.WorkOrder.priority,
+            models.WorkOrder.status,
+            models.WorkOrder.assigned_user_id,
+            models.User.username.label("assignee_name"),
+            models.WorkOrder.created_at,
+            models.WorkOrder.updated_at,
+        )
+        .outerjoin(models.User, models.WorkOrder.assigned_user_id == models.User.id)
+        .order_by(models.WorkOrder.id)
+    )
+    if status_filter:
+        query = query.where(models.WorkOrder.status == status_filter)
+    if created_from:
+        query = query.where(models.WorkOrder.created_at >= created_from)
+    if created_to:
+        query = query.where(models.WorkOrder.created_at < created_to)
+    return query
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+# Her parça için iş emirleri ve o parçadaki iş emirlerinin güncellemeleri (tek sorguyla) döner
+async def _chunks(query) -> AsyncIterator[List[Dict]]:
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(query.execution_options(yield_per=config.EXPORT_CHUNK_SIZE))
+        async for rows in result.partitions():
+            orders = {row.id: dict(row._mapping, updates=[]) for row in rows}
+            updates = await session.execute(
+                select(
+                    models.WorkOrderUpdate.work_order_id,
+                    models.WorkOrderUpdate.created_at,
+                    models.WorkOrderUpdate.description,
+                    models.User.username,
+                )
+                .outerjoin(models.User, models.WorkOrderUpdate.user_id == models.User.id)
+                .where(models.WorkOrderUpdate.work_order_id.in_(orders))
+                .order_by(models.WorkOrderUpdate.work_order_id, models.WorkOrderUpdate.created_at, models.WorkOrderUpdate.id)
+            )
+            for update in updates:
+                orders[update.work_order_id]["updates"].append({
+                    "created_at": _isoformat(update.created_at),
+                    "username": update.username,
+                    "description": update.description,
+                })
+            yield list(orders.values())
+
+async def csv_stream(query) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # Excel'in Türkçe karakterleri doğru açması için UTF-8 BOM
+    buffer.write("\ufeff")
+    writer.writerow(CSV_COLUMNS)
+    async for orders in _chunks(query):
+        for order in orders:
+            history = "\n".join(
+                f"{update['created_at']} {update['username'] or '-'}: {update['description']}" for update in order["updates"]
+            )
+            writer.writerow([
+                order["id"], order["is_emri_no"], order["title"], order["description"], order["priority"], order["status"],
+                order["assigned_user_id"], order["assignee_name"], _isoformat(order["created_at"]),
+                _isoformat(order["updated_at"]), len(order["updates"]), history,
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+async def ndjson_stream(query) -> AsyncIterator[str]:
+    async for orders in _chunks(query):
+        lines = []
+        for order in orders:
+            order["created_at"] = _isoformat(order["created_at"])
+            order["updated_at"] = _isoformat(order["updated_at"])
+            lines.append(json.dumps(order, ensure_ascii=False))
+        yield "\n".join(lines) + "\n"
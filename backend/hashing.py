@@ -0,0 +1,96 @@
+# backend/hashing.py
+# bcrypt işlemleri CPU yoğun olduğundan (~100-300 ms) event loop ve thread havuzu yerine
+# sınırlı bir process havuzunda çalıştırılır. Bu modül process havuzundaki işçiler tarafından
+# da import edildiği için veritabanı veya router importu içermemelidir.
+
+import asyncio
+import hashlib
+import hmac
+import multiprocessing
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from passlib.context import CryptContext
+
+from . import config, metrics
+from .cache import TTLCache
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# Şifre doğrulama
+def verify_password(plain_password, hashed_password):
+    return pwd_context.verify(plain_password, hashed_password)
+
+# Şifre hashleme
+def get_password_hash(password):
+    return pwd_context.hash(password)
+
+_executor = None
+_pending = 0
+
+# Uygulama process'i çok thread'li (thread havuzu, aiosqlite) olduğundan işçiler fork ile değil,
+# temiz bir process'ten başlatılır; fork o anda başka thread'in tuttuğu kilitleri de kopyalar
+def _mp_context():
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+def _get_executor():
+    global _executor
+    if _executor is None and config.PASSWORD_HASH_WORKERS > 0:
+        _executor = ProcessPoolExecutor(max_workers=config.PASSWORD_HASH_WORKERS, mp_context=_mp_context())
+    return _executor
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+async def _run(func, *args):
+    global _pending
+    # Kuyruk doluysa istekleri biriktirmek yerine hemen 503 dön
+    if _pending >= config.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin",
+            headers={"Retry-After": "1"},
+        )
+    _pending += 1
+    started = time.perf_counter()
+    try:
+        executor = _get_executor()
+        if executor is None:
+            return await run_in_threadpool(func, *args)
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    except BrokenProcessPool:
+        # Bir işçi process'i öldüyse havuz bir sonraki istekte yeniden kurulur
+        shutdown_executor()
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin")
+    finally:
+        _pending -= 1
+        metrics.observe_password_hash(func.__name__, time.perf_counter() - started)
+
+# Doğrulanmış kimlik bilgileri önbelleği: bcrypt hash'i -> şifrenin HMAC'i.
+# Şifrenin kendisi saklanmaz; anahtar process ile birlikte yok olur. Şifre değişirse
+# hash de değişeceği için eski kayıt kendiliğinden geçersiz kalır.
+_credential_cache = TTLCache(maxsize=config.CREDENTIAL_CACHE_SIZE, ttl=config.CREDENTIAL_CACHE_TTL)
+_cache_key = secrets.token_bytes(32)
+
+def _fingerprint(plain_password: str) -> bytes:
+    return hmac.new(_cache_key, plain_password.encode(), hashlib.sha256).digest()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    cached = _credential_cache.get(hashed_password)
+    if cached is not None and hmac.compare_digest(cached, _fingerprint(plain_password)):
+        return True
+    verified = await _run(verify_password, plain_password, hashed_password)
+    if verified:
+        _credential_cache.set(hashed_password, _fingerprint(plain_password))
+    return verified
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run(get_password_hash, password)
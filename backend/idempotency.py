@@ -0,0 +1,254 @@
+# backend/idempotency.py
+# Idempotency-Key desteği: mobil istemci zaman aşımından sonra aynı POST isteğini aynı anahtarla
+# tekrar gönderdiğinde işlem ikinci kez yürütülmez (çift iş emri, çift bildirim oluşmaz), ilk yanıt
+# kayıtlı haliyle ve "Idempotent-Replayed: true" başlığıyla döner.
+#
+# - Anahtar kullanıcıya özeldir; kimliği doğrulanmamış istekler (ör. /api/login) olduğu gibi geçer.
+# - Yanıtlar idempotency_keys tablosunda IDEMPOTENCY_TTL_SECONDS boyunca saklanır; yalnızca başarılı
+#   (2xx) yanıtlar saklanır, hata alan istek aynı anahtarla yeniden denenebilir.
+# - Aynı process'te aynı anahtarla eşzamanlı gelen istekler ilkinin sonucunu bekler; başka bir
+#   process'te işlenmekte olan anahtar için 409 döner ve istemci biraz sonra tekrar dener.
+# - Aynı anahtar farklı bir yol veya gövdeyle kullanılırsa 422 döner.
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+from jose import JWTError, jwt
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from starlette.datastructures import Headers
+
+from . import config, metrics, models
+from .auth import ALGORITHM, SECRET_KEY
+from .database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+HEADER = "idempotency-key"
+MAX_KEY_LENGTH = 255
+# Süresi dolan kayıtların silinme sıklığı (saniye); her istekte ayrıca DELETE çalıştırılmaz
+PURGE_INTERVAL_SECONDS = 300
+# Saklanan yanıtta tutulmayan başlıklar; tekrar gönderilirken yeniden eklenir
+SKIPPED_HEADERS = {"content-length", "date", "server"}
+
+@dataclass
+class StoredResponse:
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+# Bu process'te işlenmekte olan anahtarlar: eşzamanlı tekrarlar aynı sonucu bekler
+_inflight: Dict[str, Tuple[str, asyncio.Future]] = {}
+_last_purge = 0.0
+
+# Token yalnızca anahtarı kullanıcıya bağlamak için çözülür; geçersizse istek olduğu gibi geçer
+# ve kimlik doğrulama hatasını endpoint verir
+def _subject(authorization: Optional[str]) -> Optional[str]:
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    subject = payload.get("uid", payload.get("sub"))
+    return str(subject) if subject is not None else None
+
+def _fingerprint(scope, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+def _replay_receive(body: bytes, receive):
+    consumed = False
+
+    async def wrapped():
+        nonlocal consumed
+        if not consumed:
+            consumed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+    return wrapped
+
+async def _send_stored(stored: StoredResponse, send):
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in stored.headers]
+    headers.append((b"content-length", str(len(stored.body)).encode()))
+    headers.append((b"idempotent-replayed", b"true"))
+    await send({"type": "http.response.start", "status": stored.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": stored.body})
+
+async def _purge_expired(db, now: datetime):
+    global _last_purge
+    if time.monotonic() - _last_purge < PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = time.monotonic()
+    await db.execute(delete(models.IdempotencyKey).where(models.IdempotencyKey.expires_at < now))
+
+# Anahtarı işlenmekte olarak kaydeder. Dönüş: "claimed", "busy", "mismatch" veya saklanan yanıtla "stored"
+async def _claim(key: str, fingerprint: str) -> Tuple[str, Optional[StoredResponse]]:
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as db:
+        row = await db.get(models.IdempotencyKey, key)
+        if row is not None and row.expires_at > now:
+            if row.fingerprint != fingerprint:
+                return "mismatch", None
+            if row.status_code is None:
+                return "busy", None
+            headers = [tuple(header) for header in row.headers or ()]
+            return "stored", StoredResponse(row.status_code, headers, row.body or b"")
+        if row is not None:
+            await db.delete(row)
+            await db.flush()
+        await _purge_expired(db, now)
+        db.add(models.IdempotencyKey(
+            key=key, fingerprint=fingerprint, expires_at=now + timedelta(seconds=config.IDEMPOTENCY_LOCK_SECONDS),
+        ))
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Başka bir process aynı anda aynı anahtarı aldı
+            return "busy", None
+    return "claimed", None
+
+async def _store(key: str, response: StoredResponse):
+    expires_at = datetime.utcnow() + timedelta(seconds=config.IDEMPOTENCY_TTL_SECONDS)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(models.IdempotencyKey)
+            .where(models.IdempotencyKey.key == key)
+            .values(status_code=response.status_code, headers=response.headers, body=response.body, expires_at=expires_at)
+        )
+        await db.commit()
+
+# İstek başarısız olduysa anahtar serbest bırakılır; aynı anahtarla yeniden denenebilir
+async def _release(key: str):
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            delete(models.IdempotencyKey)
+            .where(models.IdempotencyKey.key == key, models.IdempotencyKey.status_code.is_(None))
+        )
+        await db.commit()
+
+def _error(status_code: int, detail: str) -> JSONResponse:
+    return JSONResponse({"detail": detail}, status_code=status_code)
+
+class IdempotencyMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        client_key = headers.get(HEADER)
+        subject = _subject(headers.get("authorization")) if client_key else None
+        if subject is None:
+            await self.app(scope, receive, send)
+            return
+        if len(client_key) > MAX_KEY_LENGTH:
+            await _error(400, f"Idempotency-Key en fazla {MAX_KEY_LENGTH} karakter olabilir")(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        key = f"{subject}:{client_key}"
+        fingerprint = _fingerprint(scope, body)
+
+        while True:
+            inflight = _inflight.get(key)
+            if inflight is None:
+                break
+            # Aynı process'te işlenmekte: sonucunu bekle (ilk istek iptal edilse de bekleyen etkilenmez)
+            inflight_fingerprint, future = inflight
+            if inflight_fingerprint != fingerprint:
+                await self._mismatch(scope, receive, send)
+                return
+            stored = await asyncio.shield(future)
+            if stored is not None:
+                metrics.observe_idempotency("coalesced")
+                await _send_stored(stored, send)
+                return
+            # İlk istek yanıt üretemeden hata verdi; bu istek kendisi yürütür
+
+        future = asyncio.get_running_loop().create_future()
+        _inflight[key] = (fingerprint, future)
+        try:
+            outcome, stored = await _claim(key, fingerprint)
+            if outcome == "mismatch":
+                await self._mismatch(scope, receive, send)
+                return
+            if outcome == "stored":
+                future.set_result(stored)
+                metrics.observe_idempotency("replayed")
+                await _send_stored(stored, send)
+                return
+            if outcome == "busy":
+                metrics.observe_idempotency("conflict")
+                await _error(409, "Bu Idempotency-Key ile gönderilen istek hâlâ işleniyor")(scope, receive, send)
+                return
+            await self._execute(key, future, scope, _replay_receive(body, receive), send)
+        finally:
+            if not future.done():
+                future.set_result(None)
+            if _inflight.get(key, (None, None))[1] is future:
+                del _inflight[key]
+
+    async def _mismatch(self, scope, receive, send):
+        metrics.observe_idempotency("mismatch")
+        await _error(422, "Bu Idempotency-Key farklı bir istek için kullanılmış")(scope, receive, send)
+
+    async def _execute(self, key, future, scope, receive, send):
+        status_code = 500
+        response_headers: List[Tuple[str, str]] = []
+        chunks: List[bytes] = []
+        stored = False
+
+        # Yanıt istemciye gönderilmeden önce saklanır; process gönderimden sonra çökse bile tekrar aynı yanıtı alır.
+        # Arka plan görevleri (BackgroundTasks) son parçadan sonra çalıştığından saklamayı geciktirmez.
+        async def send_wrapper(message):
+            nonlocal status_code, response_headers, stored
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = [
+                    (name.decode("latin-1"), value.decode("latin-1")) for name, value in message.get("headers", ())
+                    if name.decode("latin-1").lower() not in SKIPPED_HEADERS
+                ]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body"):
+                    response = StoredResponse(status_code, response_headers, b"".join(chunks))
+                    if 200 <= status_code < 300:
+                        await _store(key, response)
+                        stored = True
+                    future.set_result(response)
+            await send(message)
+
+        metrics.observe_idempotency("executed")
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not stored:
+                try:
+                    await _release(key)
+                except Exception:
+                    # Serbest bırakılamayan anahtar kilit süresi dolunca yeniden kullanılabilir
+                    logger.exception("Idempotency anahtarı serbest bırakılamadı: %s", key)
@@ -1,124 +1,633 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from collections import Counter
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, noload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
+from typing import Dict, List, Optional, Union
 
-from . import models, schemas
-from .database import get_db, engine
+from . import config, export, models, outbox, schemas, serializers, stats, versions
+from .database import get_async_db, engine
 from .auth import get_current_user
+from .sequences import allocate_work_order_numbers
+from .migrations import upgrade_schema
+from .search import query_tokens, search_statement
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, after_cursor, decode_cursor, encode_cursor
+from .metrics import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
-models.Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
 
-@router.get("/emirler", response_model=List[schemas.WorkOrderOut])
-def get_work_orders(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    orders = db.query(models.WorkOrder).all()
-    return orders
+# WorkOrderOut serileştirilirken her iş emri için atanan kullanıcı, güncellemeler ve
+# güncellemeyi yapan kullanıcı ayrı ayrı yüklenmesin (N+1) diye ilişkileri önceden yüklüyoruz.
+WORK_ORDER_OUT_OPTIONS = (
+    joinedload(models.WorkOrder.assigned_to_user),
+    selectinload(models.WorkOrder.updates).joinedload(models.WorkOrderUpdate.user),
+)
 
-@router.get("/emirler/{work_order_id}", response_model=schemas.WorkOrderOut)
-def get_work_order_detail(work_order_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    order = db.query(models.WorkOrder).filter(models.WorkOrder.id == work_order_id).first()
+# Özet görünümde SQL seviyesinde seçilen sütunlar (fields= ile bunların alt kümesi istenebilir)
+SUMMARY_COLUMNS = {
+    "id": models.WorkOrder.id,
+    "is_emri_no": models.WorkOrder.is_emri_no,
+    "title": models.WorkOrder.title,
+    "status": models.WorkOrder.status,
+    "priority": models.WorkOrder.priority,
+    "assignee_name": models.User.username.label("assignee_name"),
+}
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return list(SUMMARY_COLUMNS)
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in SUMMARY_COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Geçersiz alan: {', '.join(unknown)}")
+    # Sayfalama ve istemci tarafı anahtar için id her zaman döner
+    return ["id"] + [name for name in requested if name != "id"]
+
+def _filter_work_orders(query, status_filter, priority, assigned_user_id, cursor):
+    if status_filter:
+        query = query.where(models.WorkOrder.status == status_filter)
+    if priority:
+        query = query.where(models.WorkOrder.priority == priority)
+    if assigned_user_id is not None:
+        query = query.where(models.WorkOrder.assigned_user_id == assigned_user_id)
+
+    position = decode_cursor(cursor)
+    if position:
+        query = query.where(after_cursor(models.WorkOrder.created_at, models.WorkOrder.id, position))
+
+    return query.order_by(models.WorkOrder.created_at.desc(), models.WorkOrder.id.desc())
+
+# Async oturumda lazy load yapılamadığı için yanıt dönecek iş emri ilişkileriyle birlikte yüklenir
+async def _get_work_order_out(db: AsyncSession, work_order_id: int):
+    query = (
+        select(models.WorkOrder)
+        .options(*WORK_ORDER_OUT_OPTIONS)
+        .where(models.WorkOrder.id == work_order_id)
+        .execution_options(populate_existing=True)
+    )
+    return (await db.execute(query)).scalars().first()
+
+# Güncelleme zaman çizelgesi (created_at DESC, id DESC); ix_work_order_updates_order_created kullanılır
+def _work_order_updates_query(work_order_id: int, position):
+    query = (
+        select(models.WorkOrderUpdate)
+        .options(joinedload(models.WorkOrderUpdate.user))
+        .where(models.WorkOrderUpdate.work_order_id == work_order_id)
+    )
+    if position:
+        query = query.where(after_cursor(models.WorkOrderUpdate.created_at, models.WorkOrderUpdate.id, position))
+    return query.order_by(models.WorkOrderUpdate.created_at.desc(), models.WorkOrderUpdate.id.desc())
+
+# Detayda yalnızca son N güncelleme: koleksiyonun tamamı yüklenmez, son kayıtlar indeksten okunur.
+# Sayaç yalnızca N kaydın hepsi dolduğunda ayrıca sorgulanır.
+async def _get_work_order_with_latest_updates(db: AsyncSession, work_order_id: int, limit: int):
+    query = (
+        select(models.WorkOrder)
+        .options(joinedload(models.WorkOrder.assigned_to_user), noload(models.WorkOrder.updates))
+        .where(models.WorkOrder.id == work_order_id)
+        .execution_options(populate_existing=True)
+    )
+    order = (await db.execute(query)).scalars().first()
+    if order is None:
+        return None, 0, None
+    latest = []
+    if limit:
+        latest = (await db.execute(_work_order_updates_query(work_order_id, None).limit(limit))).scalars().all()
+    total = len(latest)
+    if total == limit:
+        count = select(func.count()).select_from(models.WorkOrderUpdate).where(models.WorkOrderUpdate.work_order_id == work_order_id)
+        total = await db.scalar(count)
+    next_cursor = encode_cursor(latest[-1].created_at, latest[-1].id) if latest and total > len(latest) else None
+    # Tam listedeki gibi eskiden yeniye; geçmişe yazılmadan atanır ki flush'ta diğer kayıtlar silinmiş sayılmasın
+    set_committed_value(order, "updates", list(reversed(latest)))
+    return order, total, next_cursor
+
+# SQLite silinen id'leri yeniden kullanabildiğinden ETag'de hiç tekrar etmeyen iş emri numarası yer alır
+def _work_order_etag(is_emri_no: str, version: int) -> str:
+    return versions.make_etag("emir", is_emri_no, version)
+
+# Güncelleme kayıtları da iş emri detayının parçası; eklenip değiştiklerinde iş emrinin sürümü artırılır
+def _touch(work_order: models.WorkOrder):
+    work_order.updated_at = datetime.utcnow()
+
+@router.get(
+    "/emirler",
+    response_model=Union[schemas.WorkOrderPage, schemas.WorkOrderSummaryPage],
+    response_model_exclude_unset=True,
+)
+async def get_work_orders(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    priority: Optional[str] = None,
+    assigned_user_id: Optional[int] = None,
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    # Sürüm sorgudan önce okunur; arada yapılan bir değişiklik en kötü ihtimalle gereksiz bir yenilemeye yol açar
+    etag = versions.make_etag("emirler", await versions.current(db, versions.WORK_ORDERS))
+    cached = versions.not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
+
+    # Bir fazla satır çekerek sonraki sayfa olup olmadığını anlıyoruz
+    if view == "summary" or fields:
+        names = _parse_fields(fields)
+        query = select(*(SUMMARY_COLUMNS[name] for name in names), models.WorkOrder.created_at)
+        if "assignee_name" in names:
+            query = query.outerjoin(models.User, models.WorkOrder.assigned_user_id == models.User.id)
+        query = _filter_work_orders(query, status_filter, priority, assigned_user_id, cursor).limit(limit + 1)
+        rows = (await db.execute(query)).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        if config.FAST_JSON_RESPONSES:
+            items = serializers.rows_to_dicts(names, rows)
+            return serializers.json_response({"items": items, "next_cursor": next_cursor}, headers={"ETag": etag})
+        items = [schemas.WorkOrderSummary(**{name: getattr(row, name) for name in names}) for row in rows]
+        return schemas.WorkOrderSummaryPage(items=items, next_cursor=next_cursor)
+
+    query = select(models.WorkOrder).options(*WORK_ORDER_OUT_OPTIONS)
+    query = _filter_work_orders(query, status_filter, priority, assigned_user_id, cursor).limit(limit + 1)
+    orders = (await db.execute(query)).scalars().all()
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id)
+    if config.FAST_JSON_RESPONSES:
+        return serializers.json_response(serializers.work_order_page(orders, next_cursor), headers={"ETag": etag})
+    return {"items": orders, "next_cursor": next_cursor}
+
+# Pano istatistikleri: tabloyu taramadan sayaç tablolarından okunur (bkz. stats.py)
+@router.get("/emirler/stats", response_model=schemas.WorkOrderStats)
+async def get_work_order_stats(db: AsyncSession = Depends(get_async_db), current_user: models.User = Depends(get_current_user)):
+    return await stats.get_stats(db)
+
+# İş kuyruğu imlecinin taşıdığı sıralama anahtarı: (priority_rank, created_at, id)
+QUEUE_CURSOR_KEY = (int, datetime, int)
+
+# Teknisyenin iş kuyruğu: kendisine atanmış açık iş emirleri, önce en acil, sonra en eski.
+# (assigned_user_id, status, priority_rank, created_at) indeksinden okunur; kapanmış geçmiş iş emirleri taranmaz.
+@router.get("/emirler/mine", response_model=schemas.WorkOrderPage)
+async def get_my_work_orders(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    etag = versions.make_etag("kuyruk", current_user.id, await versions.current(db, versions.WORK_ORDERS))
+    cached = versions.not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
+
+    order_key = (models.WorkOrder.priority_rank, models.WorkOrder.created_at, models.WorkOrder.id)
+    query = (
+        select(models.WorkOrder)
+        .options(*WORK_ORDER_OUT_OPTIONS)
+        .where(models.WorkOrder.assigned_user_id == current_user.id, models.WorkOrder.status.in_(stats.OPEN_STATUSES))
+    )
+    position = decode_cursor(cursor, QUEUE_CURSOR_KEY)
+    if position:
+        query = query.where(tuple_(*order_key) > tuple_(*position))
+    orders = (await db.execute(query.order_by(*order_key).limit(limit + 1))).scalars().all()
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        last = orders[-1]
+        next_cursor = encode_cursor(last.priority_rank, last.created_at, last.id)
+    if config.FAST_JSON_RESPONSES:
+        return serializers.json_response(serializers.work_order_page(orders, next_cursor), headers={"ETag": etag})
+    return {"items": orders, "next_cursor": next_cursor}
+
+# Tam metin arama: başlık, açıklama ve güncelleme kayıtlarında (bkz. search.py)
+@router.get("/emirler/search", response_model=schemas.WorkOrderSearchPage)
+async def search_work_orders(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=10000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    tokens = query_tokens(q)
+    if not tokens:
+        return {"items": [], "next_offset": None}
+    statement, params = search_statement(db.get_bind().dialect.name, tokens, limit + 1, offset)
+    hits = (await db.execute(statement, params)).all()
+    next_offset = offset + limit if len(hits) > limit else None
+    ranked_ids = [hit.work_order_id for hit in hits[:limit]]
+    if not ranked_ids:
+        return {"items": [], "next_offset": None}
+
+    query = (
+        select(*SUMMARY_COLUMNS.values())
+        .outerjoin(models.User, models.WorkOrder.assigned_user_id == models.User.id)
+        .where(models.WorkOrder.id.in_(ranked_ids))
+    )
+    rows = {row.id: row for row in (await db.execute(query)).all()}
+    ranked_rows = [rows[work_order_id] for work_order_id in ranked_ids if work_order_id in rows]
+    if config.FAST_JSON_RESPONSES:
+        items = serializers.rows_to_dicts(list(SUMMARY_COLUMNS), ranked_rows)
+        return serializers.json_response({"items": items, "next_offset": next_offset})
+    items = [schemas.WorkOrderSummary(**row._mapping) for row in ranked_rows]
+    return {"items": items, "next_offset": next_offset}
+
+# Büyük raporlar için akış halinde dışa aktarım (bkz. export.py)
+@router.get("/emirler/export")
+async def export_work_orders(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    # Akış kendi oturumunu açar; istek oturumunun bağlantısı aktarım boyunca tutulmasın
+    await db.close()
+    query = export.export_query(status_filter, created_from, created_to)
+    filename = f"is-emirleri-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    if format == "csv":
+        body, media_type = export.csv_stream(query), "text/csv; charset=utf-8"
+    else:
+        body, media_type = export.ndjson_stream(query), "application/x-ndjson"
+    return StreamingResponse(body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+PRIORITIES = set(models.WorkOrder.priority.type.enums)
+STATUSES = set(models.WorkOrder.status.type.enums)
+
+def _check_bulk_size(count: int):
+    if count > config.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Tek istekte en fazla {config.BULK_MAX_ITEMS} kayıt gönderilebilir")
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors())
+
+# Alan değerlerini kontrol eder; hata yoksa None döner
+def _bulk_field_error(values: Dict, user_ids: set) -> Optional[str]:
+    if values.get("priority") is not None and values["priority"] not in PRIORITIES:
+        return f"Geçersiz öncelik: {values['priority']}"
+    if values.get("status") is not None and values["status"] not in STATUSES:
+        return f"Geçersiz durum: {values['status']}"
+    if values.get("assigned_user_id") is not None and values["assigned_user_id"] not in user_ids:
+        return "Atanan kullanıcı bulunamadı"
+    return None
+
+async def _existing_user_ids(db: AsyncSession, values: List[Dict]) -> set:
+    ids = {item.get("assigned_user_id") for item in values} - {None}
+    if not ids:
+        return set()
+    return set((await db.execute(select(models.User.id).where(models.User.id.in_(ids)))).scalars())
+
+def _bulk_result(results: List[schemas.BulkItemResult]) -> schemas.BulkResult:
+    failed = sum(1 for result in results if result.error)
+    return schemas.BulkResult(succeeded=len(results) - failed, failed=failed, results=results)
+
+# Toplu oluşturma: tek transaction, numaralar blok halinde ayrılır, satırlar executemany ile eklenir.
+# Core INSERT ORM olaylarını tetiklemediğinden sayaçlar ve koleksiyon sürümü burada güncellenir.
+@router.post("/emirler/bulk", response_model=schemas.BulkResult)
+async def bulk_create_work_orders(
+    payload: schemas.WorkOrderBulkCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    _check_bulk_size(len(payload.items))
+    results = [schemas.BulkItemResult(index=index) for index in range(len(payload.items))]
+    parsed = {}
+    for index, item in enumerate(payload.items):
+        try:
+            parsed[index] = schemas.WorkOrderIn.model_validate(item).model_dump()
+        except ValidationError as error:
+            results[index].error = _validation_message(error)
+
+    user_ids = await _existing_user_ids(db, list(parsed.values()))
+    valid = []
+    for index, values in parsed.items():
+        error = _bulk_field_error(values, user_ids)
+        if error:
+            results[index].error = error
+        else:
+            valid.append(index)
+    if not valid:
+        return _bulk_result(results)
+
+    now = datetime.utcnow()
+    numbers = await allocate_work_order_numbers(db, len(valid))
+    rows = [dict(parsed[index], is_emri_no=number, created_at=now, updated_at=now) for index, number in zip(valid, numbers)]
+    stmt = insert(models.WorkOrder).returning(models.WorkOrder.id, sort_by_parameter_order=True)
+    ids = (await db.execute(stmt, rows)).scalars().all()
+
+    deltas = Counter()
+    for row in rows:
+        deltas.update(stats.diff(None, stats.stat_key(models.WorkOrder(**row))))
+    await stats.apply(db, deltas)
+    await versions.bump(db, versions.WORK_ORDERS)
+
+    # Atama bildirimleri outbox'a yazılır ve yanıt gönderildikten sonra toplu olarak oluşturulur
+    assigned = [models.WorkOrder(id=work_order_id, **row) for row, work_order_id in zip(rows, ids) if row["assigned_user_id"]]
+    for order in assigned:
+        outbox.enqueue_assignment(db, order)
+    await db.commit()
+    if assigned:
+        background_tasks.add_task(outbox.drain)
+
+    for index, row, work_order_id in zip(valid, rows, ids):
+        results[index].id = work_order_id
+        results[index].is_emri_no = row["is_emri_no"]
+    return _bulk_result(results)
+
+@router.put("/emirler/bulk", response_model=schemas.BulkResult)
+async def bulk_update_work_orders(
+    payload: schemas.WorkOrderBulkUpdate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    _check_bulk_size(len(payload.items))
+    results = [schemas.BulkItemResult(index=index) for index in range(len(payload.items))]
+    parsed = {}
+    for index, item in enumerate(payload.items):
+        try:
+            parsed[index] = schemas.WorkOrderBulkUpdateItem.model_validate(item)
+        except ValidationError as error:
+            results[index].error = _validation_message(error)
+
+    work_order_ids = {item.id for item in parsed.values()}
+    orders = {}
+    if work_order_ids:
+        query = select(models.WorkOrder).where(models.WorkOrder.id.in_(work_order_ids))
+        orders = {order.id: order for order in (await db.execute(query)).scalars()}
+    changes = {index: item.model_dump(exclude_unset=True, exclude={"id", "version"}) for index, item in parsed.items()}
+    user_ids = await _existing_user_ids(db, list(changes.values()))
+
+    deltas = Counter()
+    reassigned = []
+    for index, item in parsed.items():
+        order = orders.get(item.id)
+        error = _bulk_field_error(changes[index], user_ids)
+        if not order:
+            error = "İş emri bulunamadı"
+        elif item.version is not None and item.version != order.version:
+            error = "İş emri siz görüntüledikten sonra değiştirilmiş"
+        results[index].id = item.id
+        if error:
+            results[index].error = error
+            continue
+        old_key = stats.stat_key(order)
+        old_assignee = order.assigned_user_id
+        for key, value in changes[index].items():
+            setattr(order, key, value)
+        deltas.update(stats.diff(old_key, stats.stat_key(order)))
+        if order.assigned_user_id and order.assigned_user_id != old_assignee:
+            reassigned.append(order)
+        results[index].is_emri_no = order.is_emri_no
+
+    await stats.apply(db, deltas)
+    for order in reassigned:
+        outbox.enqueue_assignment(db, order)
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(status_code=412, detail="İş emirlerinden biri bu işlem sırasında başka bir istekle değiştirildi")
+    if reassigned:
+        background_tasks.add_task(outbox.drain)
+    return _bulk_result(results)
+
+@router.delete("/emirler/bulk", response_model=schemas.BulkResult)
+async def bulk_delete_work_orders(
+    ids: List[int] = Query(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    _check_bulk_size(len(ids))
+    # Cascade silme ve silinen kayıt izleri (tombstone) için ORM üzerinden silinir
+    query = select(models.WorkOrder).options(selectinload(models.WorkOrder.updates)).where(models.WorkOrder.id.in_(ids))
+    orders = {order.id: order for order in (await db.execute(query)).scalars()}
+
+    results = []
+    deltas = Counter()
+    for index, work_order_id in enumerate(ids):
+        order = orders.pop(work_order_id, None)
+        if not order:
+            results.append(schemas.BulkItemResult(index=index, id=work_order_id, error="İş emri bulunamadı"))
+            continue
+        deltas.update(stats.diff(stats.stat_key(order), None))
+        await db.delete(order)
+        results.append(schemas.BulkItemResult(index=index, id=order.id, is_emri_no=order.is_emri_no))
+
+    await stats.apply(db, deltas)
+    await db.commit()
+    return _bulk_result(results)
+
+@router.get("/emirler/{work_order_id}", response_model=schemas.WorkOrderDetail)
+async def get_work_order_detail(
+    work_order_id: int,
+    request: Request,
+    response: Response,
+    updates_limit: Optional[int] = Query(None, ge=0, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    # Önce yalnızca sürüm okunur; istemcideki kopya güncelse ilişkiler hiç yüklenmez
+    query = select(models.WorkOrder.is_emri_no, models.WorkOrder.version).where(models.WorkOrder.id == work_order_id)
+    current = (await db.execute(query)).first()
+    if current is None:
+        raise HTTPException(status_code=404, detail="İş emri bulunamadı")
+    cached = versions.not_modified(request, _work_order_etag(current.is_emri_no, current.version))
+    if cached:
+        return cached
+
+    if updates_limit is None:
+        order = await _get_work_order_out(db, work_order_id)
+        updates_total, updates_next_cursor = (len(order.updates), None) if order else (0, None)
+    else:
+        order, updates_total, updates_next_cursor = await _get_work_order_with_latest_updates(db, work_order_id, updates_limit)
     if not order:
         raise HTTPException(status_code=404, detail="İş emri bulunamadı")
-    return order
+    etag = _work_order_etag(order.is_emri_no, order.version)
+    if config.FAST_JSON_RESPONSES:
+        content = serializers.work_order_detail_out(order, updates_total, updates_next_cursor)
+        return serializers.json_response(content, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return schemas.WorkOrderDetail(
+        **schemas.WorkOrderOut.model_validate(order).model_dump(),
+        updates_total=updates_total,
+        updates_next_cursor=updates_next_cursor,
+    )
 
 @router.post("/emirler", response_model=schemas.WorkOrderOut, status_code=status.HTTP_201_CREATED)
-def create_work_order(
+async def create_work_order(
     work_order: schemas.WorkOrderIn,
-    db: Session = Depends(get_db),
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    is_emri_no = "WO" + str(len(db.query(models.WorkOrder).all()) + 1).zfill(4)
+    # Numara, iş emriyle aynı transaction içinde sayaç tablosundan ayrılır
+    is_emri_no = (await allocate_work_order_numbers(db))[0]
+    now = datetime.utcnow()
     new_order = models.WorkOrder(
         is_emri_no=is_emri_no,
         title=work_order.title,
         description=work_order.description,
         priority=work_order.priority,
         status=work_order.status,
-        assigned_user_id=work_order.assigned_user_id
+        assigned_user_id=work_order.assigned_user_id,
+        created_at=now,
+        updated_at=now
     )
+    # Pano sayaçları iş emriyle aynı transaction içinde güncellenir. Kilit sırası her yazma yolunda
+    # aynıdır: pano sayaçları, sonra flush'ta koleksiyon sürümü (bkz. versions.py), sonra iş emri satırı
+    await stats.record_change(db, None, stats.stat_key(new_order))
     db.add(new_order)
-    db.commit()
-    db.refresh(new_order)
-
-    # YENİ: Atanan kullanıcıya bildirim oluştur
+    await db.flush()
+    # Atanan kullanıcıya bildirim: olay aynı commit ile outbox'a yazılır, bildirim yanıttan sonra oluşturulur
     if new_order.assigned_user_id:
-        assigned_user = db.query(models.User).filter(models.User.id == new_order.assigned_user_id).first()
-        if assigned_user:
-            notification_message = f"Size yeni bir iş emri atandı: {new_order.title} ({new_order.is_emri_no})"
-            new_notification = models.Notification(
-                message=notification_message,
-                user_id=assigned_user.id
-            )
-            db.add(new_notification)
-            db.commit()
-    return new_order
+        outbox.enqueue_assignment(db, new_order)
+        background_tasks.add_task(outbox.drain)
+    await db.commit()
+
+    order = await _get_work_order_out(db, new_order.id)
+    response.headers["ETag"] = _work_order_etag(order.is_emri_no, order.version)
+    return order
 
 @router.put("/emirler/{work_order_id}", response_model=schemas.WorkOrderOut)
-def update_work_order(
+async def update_work_order(
     work_order_id: int,
     work_order: schemas.WorkOrderIn,
-    db: Session = Depends(get_db),
+    response: Response,
+    background_tasks: BackgroundTasks,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    existing_order = db.query(models.WorkOrder).filter(models.WorkOrder.id == work_order_id).first()
+    existing_order = await db.get(models.WorkOrder, work_order_id)
     if not existing_order:
         raise HTTPException(status_code=404, detail="İş emri bulunamadı")
+    # İyimser eşzamanlılık: istemcinin gördüğü sürüm değişmişse güncelleme reddedilir
+    if not versions.matches(if_match, _work_order_etag(existing_order.is_emri_no, existing_order.version)):
+        raise HTTPException(status_code=412, detail="İş emri siz görüntüledikten sonra değiştirilmiş")
 
+    old_key = stats.stat_key(existing_order)
+    old_assignee = existing_order.assigned_user_id
     for key, value in work_order.model_dump(exclude_unset=True).items():
         setattr(existing_order, key, value)
 
-    db.commit()
-    db.refresh(existing_order)
-    return existing_order
+    await stats.record_change(db, old_key, stats.stat_key(existing_order))
+    # Başka bir kullanıcıya yeniden atandıysa yeni kullanıcı da bildirim alır
+    if existing_order.assigned_user_id and existing_order.assigned_user_id != old_assignee:
+        outbox.enqueue_assignment(db, existing_order)
+        background_tasks.add_task(outbox.drain)
+    try:
+        await db.commit()
+    except StaleDataError:
+        # Kontrolden sonra başka bir istek aynı satırı güncellemiş (UPDATE ... WHERE version = ?)
+        await db.rollback()
+        raise HTTPException(status_code=412, detail="İş emri siz görüntüledikten sonra değiştirilmiş")
+    order = await _get_work_order_out(db, work_order_id)
+    response.headers["ETag"] = _work_order_etag(order.is_emri_no, order.version)
+    return order
 
 @router.delete("/emirler/{work_order_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_work_order(work_order_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    order = db.query(models.WorkOrder).filter(models.WorkOrder.id == work_order_id).first()
+async def delete_work_order(work_order_id: int, db: AsyncSession = Depends(get_async_db), current_user: models.User = Depends(get_current_user)):
+    # Cascade silme için güncellemeler de yüklenmeli (async oturumda lazy load yok)
+    query = select(models.WorkOrder).options(selectinload(models.WorkOrder.updates)).where(models.WorkOrder.id == work_order_id)
+    order = (await db.execute(query)).scalars().first()
     if not order:
         raise HTTPException(status_code=404, detail="İş emri bulunamadı")
 
-    db.delete(order)
-    db.commit()
+    await stats.record_change(db, stats.stat_key(order), None)
+    await db.delete(order)
+    await db.commit()
     return {"ok": True}
 
 @router.post("/emirler/{work_order_id}/updates", response_model=schemas.WorkOrderUpdateOut, status_code=status.HTTP_201_CREATED)
-def create_work_order_update(
+async def create_work_order_update(
     work_order_id: int,
     update_data: schemas.WorkOrderUpdateBase,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    work_order = db.query(models.WorkOrder).filter(models.WorkOrder.id == work_order_id).first()
+    work_order = await db.get(models.WorkOrder, work_order_id)
     if not work_order:
         raise HTTPException(status_code=404, detail="İş emri bulunamadı.")
 
+    # Yanıttaki kullanıcı zaten oturumda; commit sonrası kaydı yeniden okumaya gerek yok
     db_update = models.WorkOrderUpdate(
         description=update_data.description,
         work_order_id=work_order_id,
-        user_id=current_user.id
+        user=current_user
     )
     db.add(db_update)
-    db.commit()
-    db.refresh(db_update)
-    
-    db_update = db.query(models.WorkOrderUpdate).filter(models.WorkOrderUpdate.id == db_update.id).first()
-    
+    _touch(work_order)
+    await db.commit()
+
     return db_update
 
+@router.get("/emirler/{work_order_id}/updates", response_model=schemas.WorkOrderUpdatePage)
+async def get_work_order_updates(
+    work_order_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    # Güncelleme eklenip değiştiğinde iş emrinin sürümü de artar (_touch); ETag detaydakiyle aynıdır
+    query = select(models.WorkOrder.is_emri_no, models.WorkOrder.version).where(models.WorkOrder.id == work_order_id)
+    current = (await db.execute(query)).first()
+    if current is None:
+        raise HTTPException(status_code=404, detail="İş emri bulunamadı")
+    etag = _work_order_etag(current.is_emri_no, current.version)
+    cached = versions.not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
+
+    query = _work_order_updates_query(work_order_id, decode_cursor(cursor)).limit(limit + 1)
+    updates = (await db.execute(query)).scalars().all()
+    next_cursor = None
+    if len(updates) > limit:
+        updates = updates[:limit]
+        next_cursor = encode_cursor(updates[-1].created_at, updates[-1].id)
+    if config.FAST_JSON_RESPONSES:
+        items = [serializers.work_order_update_out(update) for update in updates]
+        return serializers.json_response({"items": items, "next_cursor": next_cursor}, headers={"ETag": etag})
+    return {"items": updates, "next_cursor": next_cursor}
+
 @router.put("/updates/{update_id}", response_model=schemas.WorkOrderUpdateOut)
-def update_work_order_update(
+async def update_work_order_update(
     update_id: int,
     update_data: schemas.WorkOrderUpdateBase,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    db_update = db.query(models.WorkOrderUpdate).filter(models.WorkOrderUpdate.id == update_id).first()
+    query = select(models.WorkOrderUpdate).options(joinedload(models.WorkOrderUpdate.user)).where(models.WorkOrderUpdate.id == update_id)
+    db_update = (await db.execute(query)).scalars().first()
     if not db_update:
         raise HTTPException(status_code=404, detail="Güncelleme bulunamadı")
 
     db_update.description = update_data.description
-    db.commit()
-    db.refresh(db_update)
+    work_order = await db.get(models.WorkOrder, db_update.work_order_id)
+    if work_order:
+        _touch(work_order)
+    await db.commit()
 
-    return db_update
\ No newline at end of file
+    return db_update
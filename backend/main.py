@@ -1,9 +1,26 @@
-﻿from fastapi import FastAPI
+﻿from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from . import isemri, users, auth
+from . import batch, config, isemri, users, auth
 from . import notifications # YENİ: notifications'u import et
+from . import hashing, idempotency, metrics, sync
+from .broker import close_broker
+from .database import async_engine, engine
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Uygulama kapanırken şifre hashleme process havuzunu ve bağlantı havuzunu kapat
+    hashing.shutdown_executor()
+    await close_broker()
+    await async_engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
+
+# Idempotency-Key ile tekrarlanan POST istekleri ilk yanıtı alır (bkz. idempotency.py).
+# CORS'un içinde kalmalı ki tekrar gönderilen yanıtlara da CORS başlıkları eklensin.
+if config.IDEMPOTENCY_TTL_SECONDS > 0:
+    app.add_middleware(idempotency.IdempotencyMiddleware)
 
 # CORS ayarları
 origins = [
@@ -18,11 +35,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# İstek süreleri, SQL sayıları ve serileştirme süresi; /metrics üzerinden Prometheus'a sunulur.
+# En dışta olmalı ki CORS dahil tüm yığın ölçülsün.
+if config.METRICS_ENABLED:
+    metrics.instrument_engine(engine)
+    metrics.instrument_engine(async_engine.sync_engine)
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics():
+        return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 # Router'larınızı buraya dahil edin
 app.include_router(isemri.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
 app.include_router(notifications.router, prefix="/api") # YENİ: Bildirim router'ını ekle
+app.include_router(sync.router, prefix="/api")
+app.include_router(batch.router, prefix="/api")
 
 # Ana rota
 @app.get("/")
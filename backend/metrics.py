@@ -0,0 +1,351 @@
+# backend/metrics.py
+# İstek ölçümleri: rota başına süre histogramları, işlenmekte olan istek sayısı, istek başına SQL
+# ifadesi sayısı ve süresi, yanıtın serileştirilme süresi ve şifre hashleme süresi. /metrics
+# uç noktasında Prometheus metin biçiminde sunulur. Değerler process başınadır; birden fazla
+# uvicorn worker'ı varsa her scrape yalnızca isteği karşılayan worker'ın değerlerini gösterir.
+#
+# Bu modül hashing.py tarafından da import edildiği için (process havuzu işçileri dahil)
+# veritabanı veya router importu içermemelidir; engine'ler instrument_engine ile bağlanır.
+
+import functools
+import heapq
+import inspect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi.routing import APIRoute
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+# Eşleşmeyen yollar (404, CORS preflight) tek etiket altında toplanır; aksi halde her
+# rastgele URL yeni bir zaman serisi oluşturur
+UNMATCHED = "<unmatched>"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # etiketler -> [kova sayıları..., toplam, adet]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str):
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, series in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            inf = _labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {_number(series[-1])}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {_number(series[-1])}")
+        return lines
+
+REQUESTS = Counter("http_requests_total", "Tamamlanan HTTP istekleri", ("method", "route", "status"))
+IN_PROGRESS = Gauge("http_requests_in_progress", "Şu anda işlenen HTTP istekleri", ("method",))
+REQUEST_DURATION = Histogram("http_request_duration_seconds", "İstek süresi (SSE akışları hariç)", ("method", "route"))
+REQUEST_SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements", "İstek başına çalıştırılan SQL ifadesi", ("method", "route"), buckets=COUNT_BUCKETS,
+)
+REQUEST_SQL_DURATION = Histogram("http_request_sql_duration_seconds", "İstek başına SQL'de geçen toplam süre", ("method", "route"))
+SERIALIZATION_DURATION = Histogram(
+    "http_response_serialization_seconds", "Yanıtın doğrulanıp JSON'a çevrilme süresi", ("method", "route"),
+)
+SQL_STATEMENTS = Counter("db_statements_total", "Çalıştırılan SQL ifadeleri (arka plan işleri dahil)")
+SQL_DURATION = Histogram("db_statement_duration_seconds", "Tek bir SQL ifadesinin süresi")
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds", "bcrypt işlemlerinin kuyrukta bekleme dahil süresi", ("operation",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+IDEMPOTENCY_REQUESTS = Counter(
+    "idempotency_requests_total", "Idempotency-Key taşıyan isteklerin sonucu (bkz. idempotency.py)", ("outcome",),
+)
+
+REGISTRY: List[_Metric] = [
+    REQUESTS, IN_PROGRESS, REQUEST_DURATION, REQUEST_SQL_STATEMENTS, REQUEST_SQL_DURATION,
+    SERIALIZATION_DURATION, SQL_STATEMENTS, SQL_DURATION, PASSWORD_HASH_DURATION, IDEMPOTENCY_REQUESTS,
+]
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+class RequestStats:
+    __slots__ = ("sql_count", "sql_time", "hash_time", "endpoint_done", "serialization", "slow_statements")
+
+    def __init__(self, capture_sql: bool):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.hash_time = 0.0
+        self.endpoint_done: Optional[float] = None
+        self.serialization: Optional[float] = None
+        # Yavaş istek günlüğü için en yavaş ifadeler (süre, sıra, SQL); kapalıysa None
+        self.slow_statements: Optional[List[Tuple[float, int, str]]] = [] if capture_sql else None
+
+    # Yanıtın son parçası gönderildiği andaki değerler; sonra çalışan arka plan görevleri sayılmaz
+    def snapshot(self) -> "RequestStats":
+        copied = RequestStats(capture_sql=False)
+        for name in self.__slots__:
+            setattr(copied, name, getattr(self, name))
+        if self.slow_statements is not None:
+            copied.slow_statements = list(self.slow_statements)
+        return copied
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def current() -> Optional[RequestStats]:
+    return _current.get()
+
+# --- SQL ---
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    SQL_STATEMENTS.inc()
+    SQL_DURATION.observe(elapsed)
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.sql_count += 1
+    stats.sql_time += elapsed
+    if stats.slow_statements is not None:
+        entry = (elapsed, stats.sql_count, statement)
+        if len(stats.slow_statements) < config.METRICS_SLOW_SQL_LIMIT:
+            heapq.heappush(stats.slow_statements, entry)
+        else:
+            heapq.heappushpop(stats.slow_statements, entry)
+
+def instrument_engine(engine):
+    # Async engine için engine.sync_engine verilmelidir
+    from sqlalchemy import event
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+# --- Şifre hashleme ---
+
+def observe_password_hash(operation: str, elapsed: float):
+    PASSWORD_HASH_DURATION.observe(elapsed, operation)
+    stats = _current.get()
+    if stats is not None:
+        stats.hash_time += elapsed
+
+# --- Idempotency ---
+
+# Tekrarlanan istekler router'a ulaşmadığından http_requests_total'da <unmatched> olarak görünür
+def observe_idempotency(outcome: str):
+    IDEMPOTENCY_REQUESTS.inc(outcome)
+
+# --- Serileştirme ---
+
+def _add_serialization(stats: RequestStats, elapsed: float):
+    stats.serialization = (stats.serialization or 0.0) + elapsed
+
+# Hızlı yolda (serializers.json_response) JSON endpoint içinde, endpoint dönmeden üretilir;
+# bu süre TimedRoute'un ölçtüğü süreye eklenir
+@contextmanager
+def serialization():
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _current.get()
+        if stats is not None:
+            _add_serialization(stats, time.perf_counter() - started)
+
+def _mark_endpoint_done():
+    stats = _current.get()
+    if stats is not None:
+        stats.endpoint_done = time.perf_counter()
+
+def _timed_endpoint(call):
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def endpoint(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                _mark_endpoint_done()
+    else:
+        @functools.wraps(call)
+        def endpoint(*args, **kwargs):
+            try:
+                return call(*args, **kwargs)
+            finally:
+                _mark_endpoint_done()
+    return endpoint
+
+class TimedRoute(APIRoute):
+    # Endpoint'in döndüğü an işaretlenir; oradan yanıt nesnesinin hazır olmasına kadar geçen süre
+    # (response_model doğrulaması ve JSON'a çevirme) serileştirme süresine eklenir. Endpoint yanıtı
+    # kendisi ürettiyse bu süre ~0'dır; JSON'a çevirme serialization() ile ayrıca ölçülür.
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            stats = _current.get()
+            if stats is not None and stats.endpoint_done is not None:
+                _add_serialization(stats, time.perf_counter() - stats.endpoint_done)
+            return response
+
+        return timed_handler
+
+def route_label(scope) -> str:
+    # Yol parametreleri yeniden şablona çevrilir (/api/emirler/5 -> /api/emirler/{work_order_id});
+    # router'ın önek ekleme biçimine bağlı kalmadan dahil edilen router'larda da tam yolu verir
+    if "endpoint" not in scope:
+        return UNMATCHED
+    path = scope.get("path", "")
+    params = scope.get("path_params") or {}
+    if not params:
+        return path
+    names = {str(value): name for name, value in params.items()}
+    return "/".join("{" + names[segment] + "}" if segment in names else segment for segment in path.split("/"))
+
+# --- Middleware ---
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats(capture_sql=config.METRICS_SLOW_REQUEST_MS > 0)
+        token = _current.set(stats)
+        status_code = 500
+        event_stream = False
+        # Yanıtın son parçasının gönderildiği an ve o andaki ölçümler. Starlette'in BackgroundTasks'ı
+        # (ör. outbox'ın boşaltılması) yanıttan sonra aynı çağrı içinde çalışır; istek süresine ve
+        # SQL sayısına katılmaz.
+        response_sent: Optional[Tuple[float, RequestStats]] = None
+
+        async def send_wrapper(message):
+            nonlocal status_code, event_stream, response_sent
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name.lower() == b"content-type" and value.startswith(b"text/event-stream"):
+                        event_stream = True
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body") and response_sent is None:
+                response_sent = (time.perf_counter(), stats.snapshot())
+
+        IN_PROGRESS.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finished, observed = response_sent or (time.perf_counter(), stats)
+            duration = finished - started
+            IN_PROGRESS.dec(method)
+            _current.reset(token)
+            route_path = route_label(scope)
+            REQUESTS.inc(method, route_path, str(status_code))
+            # SSE bağlantısının süresi istek gecikmesi değildir; histogramları bozmaması için atlanır
+            if not event_stream:
+                self._observe(method, route_path, status_code, duration, observed, scope)
+
+    def _observe(self, method, route_path, status_code, duration, stats, scope):
+        REQUEST_DURATION.observe(duration, method, route_path)
+        REQUEST_SQL_STATEMENTS.observe(stats.sql_count, method, route_path)
+        REQUEST_SQL_DURATION.observe(stats.sql_time, method, route_path)
+        if stats.serialization is not None:
+            SERIALIZATION_DURATION.observe(stats.serialization, method, route_path)
+
+        if stats.slow_statements is not None and duration * 1000 >= config.METRICS_SLOW_REQUEST_MS:
+            statements = "".join(
+                f"\n  [{elapsed * 1000:.1f} ms #{order}] {' '.join(statement.split())[:500]}"
+                for elapsed, order, statement in sorted(stats.slow_statements, reverse=True)
+            )
+            logger.warning(
+                "Yavaş istek: %s %s -> %d, %.1f ms (SQL: %d ifade, %.1f ms; serileştirme: %.1f ms; hash: %.1f ms)%s",
+                method, scope.get("path", route_path), status_code, duration * 1000,
+                stats.sql_count, stats.sql_time * 1000, (stats.serialization or 0) * 1000, stats.hash_time * 1000,
+                statements,
+            )
@@ -0,0 +1,43 @@
+# backend/migrations.py
+# Tablolar create_all ile oluşturulur; ancak create_all mevcut tablolara sonradan eklenen
+# sütunları ve indeksleri oluşturmaz. Bu modül eksik kalanları, arama indeksini ve türetilmiş
+# tabloların ilk doldurulmasını tamamlar. Kapsamlı şema değişiklikleri (sütun silme, tip
+# değiştirme) için Alembic gibi bir migration aracı kullanılmalıdır.
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+
+from . import models, stats
+from .search import create_search_index
+
+# Sonradan eklenen sütun yalnızca NULL ile dolacağından tüm satırların ilk değeri verilir
+def _add_missing_columns(connection, inspector, table):
+    existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+    for column in table.columns:
+        if column.name in existing_columns:
+            continue
+        column_ddl = CreateColumn(column).compile(dialect=connection.dialect)
+        if column.computed is not None and connection.dialect.name == "sqlite":
+            # SQLite mevcut tabloya saklanan (STORED) hesaplanmış sütun ekleyemez; sanal sütun da indekslenebilir
+            column_type = column.type.compile(dialect=connection.dialect)
+            column_ddl = f"{column.name} {column_type} GENERATED ALWAYS AS ({column.computed.sqltext}) VIRTUAL"
+        connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}"))
+        if column.name == "updated_at" and "created_at" in table.columns:
+            connection.execute(text(f"UPDATE {table.name} SET updated_at = created_at WHERE updated_at IS NULL"))
+
+def upgrade_schema(engine):
+    existing_tables = set(inspect(engine).get_table_names())
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        for table in models.Base.metadata.sorted_tables:
+            if table.name in existing_tables:
+                _add_missing_columns(connection, inspector, table)
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(connection)
+        create_search_index(connection)
+        # Sayaç tabloları yeni oluşturulduysa mevcut iş emirlerinden doldur
+        if models.WorkOrderStat.__tablename__ not in existing_tables:
+            stats.rebuild(connection)
@@ -1,4 +1,4 @@
-﻿from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, Boolean
+﻿from sqlalchemy import Column, Computed, Integer, String, Date, DateTime, ForeignKey, Text, Enum, Boolean, Index, JSON, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -16,27 +16,48 @@ class User(Base):
     updates = relationship("WorkOrderUpdate", back_populates="user")
     notifications = relationship("Notification", back_populates="user") # YENİ: Bildirimler için ilişki
 
+# Öncelik metin olarak saklanır ve alfabetik sıralanır; aciliyet sırası için sayısal karşılığı (küçük = acil)
+PRIORITY_RANKS = {"Yüksek": 0, "Normal": 1, "Düşük": 2}
+PRIORITY_RANK_SQL = "CASE priority " + " ".join(f"WHEN '{name}' THEN {rank}" for name, rank in PRIORITY_RANKS.items()) + " ELSE 1 END"
+
 class WorkOrder(Base):
     __tablename__ = "work_orders"
     id = Column(Integer, primary_key=True, index=True)
     is_emri_no = Column(String, unique=True, index=True)
     title = Column(String)
     description = Column(Text, nullable=True)
-    priority = Column(Enum('Düşük', 'Normal', 'Yüksek'), default='Normal')
-    status = Column(Enum('Pending', 'In Progress', 'Completed', 'Cancelled'), default='Pending')
+    priority = Column(Enum('Düşük', 'Normal', 'Yüksek', name='work_order_priority'), default='Normal')
+    status = Column(Enum('Pending', 'In Progress', 'Completed', 'Cancelled', name='work_order_status'), default='Pending')
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # Her UPDATE'te artar; ETag ve iyimser eşzamanlılık kontrolü için (bkz. versions.py)
+    version = Column(Integer, nullable=False, server_default="1")
+    # Veritabanının hesapladığı sütun; iş kuyruğu sıralaması ve indeksi için (bkz. migrations.py)
+    priority_rank = Column(Integer, Computed(PRIORITY_RANK_SQL, persisted=True))
     
     assigned_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     assigned_to_user = relationship("User", back_populates="work_orders")
     
     updates = relationship("WorkOrderUpdate", back_populates="work_order", cascade="all, delete-orphan")
 
+    __mapper_args__ = {"version_id_col": version}
+    # Liste sorguları: [WHERE <filtre> = ?] ORDER BY created_at DESC, id DESC LIMIT n (keyset sayfalama).
+    # Filtre sütunu önde olduğundan eşleşen satırlar zaten sıralı okunur, ayrıca sıralama yapılmaz.
+    __table_args__ = (
+        Index("ix_work_orders_created", "created_at", "id"),
+        Index("ix_work_orders_status_created", "status", "created_at", "id"),
+        Index("ix_work_orders_priority_created", "priority", "created_at", "id"),
+        Index("ix_work_orders_assignee_created", "assigned_user_id", "created_at", "id"),
+        # Kişisel iş kuyruğu: WHERE assigned_user_id = ? AND status IN (açık) ORDER BY priority_rank, created_at, id
+        Index("ix_work_orders_queue", "assigned_user_id", "status", "priority_rank", "created_at", "id"),
+    )
+
 class WorkOrderUpdate(Base):
     __tablename__ = "work_order_updates"
     id = Column(Integer, primary_key=True, index=True)
     description = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     work_order_id = Column(Integer, ForeignKey("work_orders.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -44,6 +65,11 @@ class WorkOrderUpdate(Base):
     work_order = relationship("WorkOrder", back_populates="updates")
     user = relationship("User", back_populates="updates")
 
+    __table_args__ = (
+        # İş emrinin güncellemeleri (selectinload: WHERE work_order_id IN (...)), zaman çizelgesi sayfaları ve dışa aktarımdaki sıralama
+        Index("ix_work_order_updates_order_created", "work_order_id", "created_at", "id"),
+    )
+
 # YENİ: Notification modeli
 class Notification(Base):
     __tablename__ = "notifications"
@@ -51,7 +77,78 @@ class Notification(Base):
     message = Column(String, nullable=False)
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Kullanıcıya olan ilişki
     user_id = Column(Integer, ForeignKey("users.id"))
-    user = relationship("User", back_populates="notifications")
\ No newline at end of file
+    user = relationship("User", back_populates="notifications")
+
+    __table_args__ = (
+        # Okunmamış sayısı: WHERE user_id = ? AND is_read = 0
+        Index("ix_notifications_user_read_created", "user_id", "is_read", "created_at"),
+        # Bildirim geçmişi: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_notifications_user_created", "user_id", "created_at", "id"),
+    )
+
+# İş emri numarası gibi ardışık değerler için sayaç tablosu (bkz. sequences.py)
+class Counter(Base):
+    __tablename__ = "counters"
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+# Pano istatistikleri için artımlı güncellenen sayaçlar (bkz. stats.py)
+class WorkOrderStat(Base):
+    __tablename__ = "work_order_stats"
+    status = Column(String, primary_key=True)
+    priority = Column(String, primary_key=True)
+    assigned_user_id = Column(Integer, primary_key=True)  # 0: atanmamış
+    count = Column(Integer, nullable=False, default=0)
+
+# Açık iş emirlerinin oluşturulma gününe göre sayısı (yaş dağılımı için)
+class OpenWorkOrderDay(Base):
+    __tablename__ = "open_work_order_days"
+    created_on = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+# Silinen kayıtların izi; istemciler delta senkronizasyonda yerel kopyalarını siler (bkz. sync.py)
+class DeletedRecord(Base):
+    __tablename__ = "deleted_records"
+    id = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=True)  # yalnızca bu kullanıcıya ait kayıtlar için (ör. bildirim)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+# İstek dışında yürütülecek yan etkiler (bildirim, e-posta...) için kalıcı kuyruk (bkz. outbox.py).
+# Olay, onu doğuran değişiklikle aynı transaction'da yazılır; commit olmayan değişikliğin olayı da olmaz.
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    claimed_by = Column(String, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # İşlenmeyi bekleyenler: WHERE status = 'pending' AND available_at <= ? ORDER BY id
+        Index("ix_outbox_events_status_available", "status", "available_at"),
+        # Kilitlenen olayların geri okunması: WHERE claimed_by = ?
+        Index("ix_outbox_events_claimed_by", "claimed_by"),
+    )
+
+# Idempotency-Key ile gelen isteklerin saklanan yanıtları (bkz. idempotency.py)
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    key = Column(String, primary_key=True)  # "<kullanıcı>:<istemcinin verdiği anahtar>"
+    fingerprint = Column(String, nullable=False)  # yöntem, yol ve gövdenin özeti
+    status_code = Column(Integer, nullable=True)  # NULL: istek hâlâ işleniyor
+    headers = Column(JSON, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Süresi dolan kayıtlar yeni istekler sırasında toplu silinir: WHERE expires_at < ?
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,38 +1,195 @@
 # backend/notifications.py
 
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+
+from . import config, models, schemas, auth, versions
+from .broker import get_broker
+from .database import AsyncSessionLocal, get_async_db
+from .metrics import TimedRoute
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, after_cursor, decode_cursor, encode_cursor
+
+router = APIRouter(tags=["Bildirimler"], route_class=TimedRoute)
+
+# EventSource başlık gönderemediği için akış uç noktasında token sorgu parametresiyle de kabul edilir
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login", auto_error=False)
+
+def user_channel(user_id: int) -> str:
+    return f"notifications:{user_id}"
+
+def notification_payload(notification: models.Notification) -> dict:
+    return schemas.NotificationRead.model_validate(notification).model_dump(mode="json")
+
+# ORM ile oluşturulan her bildirim, transaction commit edildikten sonra abonelere yayınlanır.
+# Geri alınan transaction'daki bildirimler hiç gönderilmez. İçerik flush sırasında alınır,
+# çünkü commit sonrası nesnenin alanları süresi dolmuş (expired) olabilir.
+@event.listens_for(Session, "after_flush")
+def _collect_new_notifications(session, flush_context):
+    payloads = [notification_payload(obj) for obj in session.new if isinstance(obj, models.Notification)]
+    if payloads:
+        session.info.setdefault("new_notifications", []).extend(payloads)
+
+@event.listens_for(Session, "after_commit")
+def _publish_new_notifications(session):
+    payloads = session.info.pop("new_notifications", None)
+    if not payloads:
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # Event loop dışındaki senkron betiklerde anlık iletim yapılmaz
+        return
+    broker = get_broker()
+    for payload in payloads:
+        broker.publish(user_channel(payload["user_id"]), payload)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_new_notifications(session):
+    session.info.pop("new_notifications", None)
+
+@router.get("/notifications", response_model=schemas.NotificationPage)
+async def get_user_notifications(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    version = await versions.current(db, versions.notifications_version(current_user.id))
+    etag = versions.make_etag("bildirimler", current_user.id, version)
+    cached = versions.not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
 
-from . import models, schemas, auth
-from .database import get_db
+    query = select(models.Notification).where(models.Notification.user_id == current_user.id)
+    position = decode_cursor(cursor)
+    if position:
+        query = query.where(after_cursor(models.Notification.created_at, models.Notification.id, position))
+    query = query.order_by(models.Notification.created_at.desc(), models.Notification.id.desc()).limit(limit + 1)
 
-router = APIRouter(tags=["Bildirimler"])
+    notifications = (await db.execute(query)).scalars().all()
+    next_cursor = None
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        next_cursor = encode_cursor(notifications[-1].created_at, notifications[-1].id)
+    return {"items": notifications, "next_cursor": next_cursor}
 
-@router.get("/notifications", response_model=List[schemas.NotificationRead])
-def get_user_notifications(
-    db: Session = Depends(get_db),
+# Rozet için yalnızca sayı; (user_id, is_read, created_at) indeksinden okunur
+@router.get("/notifications/unread_count", response_model=schemas.UnreadCount)
+async def get_unread_count(
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    notifications = db.query(models.Notification).filter(models.Notification.user_id == current_user.id).order_by(models.Notification.created_at.desc()).all()
-    return notifications
+    query = select(func.count()).select_from(models.Notification).where(
+        models.Notification.user_id == current_user.id,
+        models.Notification.is_read == False  # noqa: E712
+    )
+    return {"unread_count": (await db.execute(query)).scalar_one()}
+
+# Tek bir UPDATE ile toplu okundu işaretleme; ids verilmezse tüm bildirimler
+@router.put("/notifications/read", response_model=schemas.MarkReadResult)
+async def mark_notifications_as_read(
+    ids: Optional[List[int]] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    stmt = update(models.Notification).where(
+        models.Notification.user_id == current_user.id,
+        models.Notification.is_read == False  # noqa: E712
+    )
+    if ids is not None:
+        stmt = stmt.where(models.Notification.id.in_(ids))
+    result = await db.execute(stmt.values(is_read=True).execution_options(synchronize_session=False))
+    # Core UPDATE ORM olaylarını tetiklemediği için koleksiyon sürümü elle artırılır
+    if result.rowcount:
+        await versions.bump(db, versions.notifications_version(current_user.id))
+    await db.commit()
+    return {"updated": result.rowcount}
+
+@router.put("/notifications/read-all", response_model=schemas.MarkReadResult)
+async def mark_all_notifications_as_read(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    return await mark_notifications_as_read(ids=None, db=db, current_user=current_user)
 
 @router.put("/notifications/{notification_id}/read", response_model=schemas.NotificationRead)
-def mark_notification_as_read(
+async def mark_notification_as_read(
     notification_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    notification = db.query(models.Notification).filter(
+    notification = (await db.execute(select(models.Notification).where(
         models.Notification.id == notification_id,
         models.Notification.user_id == current_user.id
-    ).first()
+    ))).scalars().first()
     
     if not notification:
         raise HTTPException(status_code=404, detail="Bildirim bulunamadı veya bu bildirimi okuma yetkiniz yok.")
         
     notification.is_read = True
-    db.commit()
-    db.refresh(notification)
+    await db.commit()
     
-    return notification
\ No newline at end of file
+    return notification
+
+# Server-Sent Events: yeni bildirimler oluşturuldukça istemciye itilir.
+# Yeniden bağlanan istemci Last-Event-ID ile kaçırdığı bildirimleri de alır.
+@router.get("/notifications/stream")
+async def stream_notifications(
+    request: Request,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None),
+    last_event_id: Optional[int] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    token = token or access_token
+    if not token:
+        raise HTTPException(status_code=401, detail="Geçersiz kimlik bilgileri")
+    user_id = (await auth.user_from_token(token, db)).id
+    # Akış boyunca havuzdan bağlantı tutulmasın
+    await db.close()
+
+    async def events():
+        sent_up_to = last_event_id or 0
+        async with get_broker().subscribe(user_channel(user_id)) as queue:
+            # Abone olduktan sonra kaçırılanları oku; böylece arada oluşan bildirim kaybolmaz
+            if last_event_id is not None:
+                async with AsyncSessionLocal() as session:
+                    query = select(models.Notification).where(
+                        models.Notification.user_id == user_id,
+                        models.Notification.id > last_event_id
+                    ).order_by(models.Notification.id)
+                    missed = [notification_payload(n) for n in (await session.execute(query)).scalars()]
+                for payload in missed:
+                    sent_up_to = payload["id"]
+                    yield _format_event(payload)
+
+            while not await request.is_disconnected():
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=config.SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if payload["id"] <= sent_up_to:
+                    continue
+                sent_up_to = payload["id"]
+                yield _format_event(payload)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _format_event(payload: dict) -> str:
+    return f"id: {payload['id']}\nevent: notification\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
@@ -0,0 +1,196 @@
+# backend/outbox.py
+# Transactional outbox: istek yalnızca olayı (ör. "iş emri atandı") kendi transaction'ına yazar ve
+# tek commit ile döner. Olaylar yanıt gönderildikten sonra BackgroundTasks ile aynı process'te,
+# ayrıca kalanlar ve yeniden denenecekler için ayrı bir worker process'inde işlenir:
+#     python -m backend.outbox run            # sürekli çalışan worker
+#     python -m backend.outbox drain          # bekleyenleri bir kez işle
+#     python -m backend.outbox replay [id...] # başarısız olayları yeniden kuyruğa al
+#
+# Olaylar en az bir kez (at-least-once) işlenir; işleyiciler aynı olayı iki kez görmeye dayanıklı olmalıdır.
+# Not: ayrı worker process'inde oluşturulan bildirimlerin anlık iletimi için paylaşılan (Redis) aracı gerekir.
+
+import asyncio
+import logging
+import sys
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import config, models
+from .database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+WORK_ORDER_ASSIGNED = "work_order_assigned"
+
+Handler = Callable[[AsyncSession, List[dict]], Awaitable[None]]
+HANDLERS: Dict[str, Handler] = {}
+
+def handler(kind: str):
+    def register(func: Handler) -> Handler:
+        HANDLERS[kind] = func
+        return func
+    return register
+
+# Olayı çağıranın transaction'ına ekler; commit çağıranın sorumluluğundadır
+def enqueue(db: AsyncSession, kind: str, payload: dict):
+    db.add(models.OutboxEvent(kind=kind, payload=payload))
+
+def enqueue_assignment(db: AsyncSession, order: models.WorkOrder):
+    enqueue(db, WORK_ORDER_ASSIGNED, {
+        "work_order_id": order.id,
+        "user_id": order.assigned_user_id,
+        "title": order.title,
+        "is_emri_no": order.is_emri_no,
+    })
+
+@handler(WORK_ORDER_ASSIGNED)
+async def _notify_assignees(db: AsyncSession, payloads: List[dict]):
+    user_ids = {payload["user_id"] for payload in payloads}
+    existing = set((await db.execute(select(models.User.id).where(models.User.id.in_(user_ids)))).scalars())
+    db.add_all([
+        models.Notification(
+            message=f"Size yeni bir iş emri atandı: {payload['title']} ({payload['is_emri_no']})",
+            user_id=payload["user_id"],
+        )
+        for payload in payloads if payload["user_id"] in existing
+    ])
+    await db.flush()
+
+# Bekleyen olayları bu işleyici adına kilitler. Koşul UPDATE içinde de tekrarlandığından iki
+# işleyici aynı olayı alamaz; işleyici çökerse olay kilit süresi dolunca tekrar alınabilir.
+async def _claim(db: AsyncSession, limit: int) -> List[models.OutboxEvent]:
+    now = datetime.utcnow()
+    token = uuid.uuid4().hex
+    ready = (models.OutboxEvent.status == "pending") & (models.OutboxEvent.available_at <= now)
+    ids = select(models.OutboxEvent.id).where(ready).order_by(models.OutboxEvent.id).limit(limit).scalar_subquery()
+    await db.execute(
+        update(models.OutboxEvent)
+        .where(models.OutboxEvent.id.in_(ids), ready)
+        .values(claimed_by=token, available_at=now + timedelta(seconds=config.OUTBOX_LEASE_SECONDS))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    query = select(models.OutboxEvent).where(models.OutboxEvent.claimed_by == token).order_by(models.OutboxEvent.id)
+    return list((await db.execute(query)).scalars())
+
+def _mark_failed(event: models.OutboxEvent, error: Exception):
+    event.attempts += 1
+    event.last_error = f"{type(error).__name__}: {error}"
+    if event.attempts >= config.OUTBOX_MAX_ATTEMPTS:
+        event.status = "failed"
+        logger.error("Outbox olayı %s (%s) %d denemeden sonra başarısız: %s", event.id, event.kind, event.attempts, event.last_error)
+    else:
+        delay = config.OUTBOX_RETRY_SECONDS * 2 ** (event.attempts - 1)
+        event.available_at = datetime.utcnow() + timedelta(seconds=delay)
+
+def _mark_done(events: List[models.OutboxEvent]):
+    now = datetime.utcnow()
+    for event in events:
+        event.status = "done"
+        event.processed_at = now
+
+# Aynı türdeki olaylar işleyiciye birlikte verilir; toplu işlem hata verirse hatalı olayı
+# bulmak için olaylar tek tek denenir. Her deneme bir savepoint içinde yürür.
+async def _dispatch(db: AsyncSession, kind: str, events: List[models.OutboxEvent]):
+    func = HANDLERS.get(kind)
+    if func is None:
+        for event in events:
+            _mark_failed(event, LookupError(f"İşleyici yok: {kind}"))
+        return
+    try:
+        async with db.begin_nested():
+            await func(db, [event.payload for event in events])
+        _mark_done(events)
+        return
+    except Exception as error:
+        if len(events) == 1:
+            _mark_failed(events[0], error)
+            return
+    for event in events:
+        try:
+            async with db.begin_nested():
+                await func(db, [event.payload])
+            _mark_done([event])
+        except Exception as error:
+            _mark_failed(event, error)
+
+async def process_batch(limit: Optional[int] = None) -> int:
+    async with AsyncSessionLocal() as db:
+        events = await _claim(db, limit or config.OUTBOX_BATCH_SIZE)
+        by_kind = defaultdict(list)
+        for event in events:
+            by_kind[event.kind].append(event)
+        for kind, group in by_kind.items():
+            await _dispatch(db, kind, group)
+        await db.commit()
+        return len(events)
+
+_drain_lock = asyncio.Lock()
+_drain_requested = False
+
+# BackgroundTasks'tan çağrılır. Process başına tek bir boşaltıcı çalışır; o sırada gelen
+# istekler yalnızca işaret bırakır ve çalışan boşaltıcı bir tur daha döner.
+async def drain():
+    global _drain_requested
+    _drain_requested = True
+    if _drain_lock.locked():
+        return
+    async with _drain_lock:
+        while _drain_requested:
+            _drain_requested = False
+            try:
+                while await process_batch():
+                    pass
+            except Exception:
+                # Olaylar kuyrukta kalır; worker kilit süresi dolunca yeniden dener
+                logger.exception("Outbox işlenirken hata oluştu")
+
+async def replay(ids: Optional[List[int]] = None) -> int:
+    async with AsyncSessionLocal() as db:
+        stmt = update(models.OutboxEvent).where(models.OutboxEvent.status == "failed")
+        if ids:
+            stmt = stmt.where(models.OutboxEvent.id.in_(ids))
+        result = await db.execute(stmt.values(
+            status="pending", attempts=0, available_at=datetime.utcnow(), claimed_by=None, last_error=None,
+        ))
+        await db.commit()
+        return result.rowcount
+
+async def run_worker():
+    logger.info("Outbox worker başladı")
+    while True:
+        try:
+            if await process_batch():
+                continue
+        except Exception:
+            logger.exception("Outbox işlenirken hata oluştu")
+        await asyncio.sleep(config.OUTBOX_POLL_SECONDS)
+
+async def _main(command: str, args: List[str]):
+    from .database import async_engine, engine
+    from .migrations import upgrade_schema
+
+    upgrade_schema(engine)
+    try:
+        if command == "run":
+            await run_worker()
+        elif command == "drain":
+            total = 0
+            while count := await process_batch():
+                total += count
+            print(f"{total} olay işlendi.")
+        elif command == "replay":
+            print(f"{await replay([int(arg) for arg in args])} olay yeniden kuyruğa alındı.")
+    finally:
+        await async_engine.dispose()
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("run", "drain", "replay"):
+        sys.exit("Kullanım: python -m backend.outbox run | drain | replay [olay_id ...]")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(sys.argv[1], sys.argv[2:]))
@@ -0,0 +1,38 @@
+# backend/pagination.py
+# Keyset (cursor) sayfalama yardımcıları.
+# İmleç, sayfanın son satırının sıralama anahtarını (varsayılan: created_at, id) taşıyan opak bir metindir.
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Varsayılan sıralama anahtarı (created_at, id); farklı anahtarla sıralanan listeler kendi
+# tiplerini verir (ör. iş kuyruğu: (priority_rank, created_at, id) -> (int, datetime, int))
+CURSOR_KEY = (datetime, int)
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str], key: Tuple[type, ...] = CURSOR_KEY) -> Optional[Tuple]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(key):
+            raise ValueError(cursor)
+        return tuple(datetime.fromisoformat(value) if kind is datetime else kind(value) for kind, value in zip(key, values))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Geçersiz sayfa imleci")
+
+# Sıralama (created_at DESC, id DESC); imleçten sonraki satırları seçen koşul
+def after_cursor(created_at_column, id_column, cursor: Tuple[datetime, int]):
+    created_at, row_id = cursor
+    return (created_at_column < created_at) | ((created_at_column == created_at) & (id_column < row_id))
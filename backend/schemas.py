@@ -1,5 +1,5 @@
-﻿from pydantic import BaseModel, ConfigDict
-from typing import Optional, List
+﻿from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 
 class UserOut(BaseModel):
@@ -39,10 +39,96 @@ class WorkOrderOut(WorkOrderBase):
     is_emri_no: str
     created_at: datetime
     updated_at: datetime
+    version: Optional[int] = None
     assigned_to_user: Optional[UserOut] = None
     updates: List[WorkOrderUpdateOut] = []
     model_config = ConfigDict(from_attributes=True)
 
+# Detay görünümü: updates_limit verilirse yalnızca son N güncelleme gömülür; öncekiler
+# updates_next_cursor ile /emirler/{id}/updates uç noktasından sayfa sayfa alınır
+class WorkOrderDetail(WorkOrderOut):
+    updates_total: int
+    updates_next_cursor: Optional[str] = None
+
+# Toplu işlemler: kayıtlar tek tek doğrulanır, hatalı olanlar diğerlerini engellemez
+class WorkOrderBulkCreate(BaseModel):
+    items: List[Dict[str, Any]]
+
+class WorkOrderBulkUpdateItem(BaseModel):
+    id: int
+    version: Optional[int] = None  # verilirse iyimser eşzamanlılık kontrolü yapılır
+    title: Optional[str] = None
+    description: Optional[str] = None
+    priority: Optional[str] = None
+    assigned_user_id: Optional[int] = None
+    status: Optional[str] = None
+
+class WorkOrderBulkUpdate(BaseModel):
+    items: List[Dict[str, Any]]
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    is_emri_no: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+# İş emri listesi için imleçli sayfa
+class WorkOrderPage(BaseModel):
+    items: List[WorkOrderOut]
+    next_cursor: Optional[str] = None
+
+# Güncelleme zaman çizelgesi; en yeni kayıt önce gelir
+class WorkOrderUpdatePage(BaseModel):
+    items: List[WorkOrderUpdateOut]
+    next_cursor: Optional[str] = None
+
+# Liste ekranı için hafif şema; fields= ile istenmeyen alanlar yanıtta yer almaz
+class WorkOrderSummary(BaseModel):
+    id: int
+    is_emri_no: Optional[str] = None
+    title: Optional[str] = None
+    status: Optional[str] = None
+    priority: Optional[str] = None
+    assignee_name: Optional[str] = None
+
+class WorkOrderSummaryPage(BaseModel):
+    items: List[WorkOrderSummary]
+    next_cursor: Optional[str] = None
+
+# Arama sonuçları alaka düzeyine göre sıralı olduğundan sayfalama offset ile yapılır
+class WorkOrderSearchPage(BaseModel):
+    items: List[WorkOrderSummary]
+    next_offset: Optional[int] = None
+
+# Pano istatistikleri
+class AssigneeCount(BaseModel):
+    assigned_user_id: Optional[int] = None
+    username: Optional[str] = None
+    count: int
+
+class StatBreakdown(BaseModel):
+    status: str
+    priority: str
+    assigned_user_id: Optional[int] = None
+    count: int
+
+class AgeBucket(BaseModel):
+    label: str
+    count: int
+
+class WorkOrderStats(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+    by_assignee: List[AssigneeCount]
+    breakdown: List[StatBreakdown]
+    open_age_distribution: List[AgeBucket]
+
 # YENİ: Bildirim okuma şeması
 class NotificationRead(BaseModel):
     id: int
@@ -50,4 +136,64 @@ class NotificationRead(BaseModel):
     is_read: bool
     created_at: datetime
     user_id: int
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class NotificationPage(BaseModel):
+    items: List[NotificationRead]
+    next_cursor: Optional[str] = None
+
+class UnreadCount(BaseModel):
+    unread_count: int
+
+class MarkReadResult(BaseModel):
+    updated: int
+
+# Delta senkronizasyon (bkz. sync.py)
+class WorkOrderSyncItem(WorkOrderBase):
+    id: int
+    is_emri_no: str
+    created_at: datetime
+    updated_at: datetime
+    assigned_to_user: Optional[UserOut] = None
+    model_config = ConfigDict(from_attributes=True)
+
+class WorkOrderUpdateSyncItem(WorkOrderUpdateOut):
+    updated_at: datetime
+
+class NotificationSyncItem(NotificationRead):
+    updated_at: datetime
+
+class DeletedRecordOut(BaseModel):
+    entity: str
+    entity_id: int
+    deleted_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class SyncResponse(BaseModel):
+    work_orders: List[WorkOrderSyncItem]
+    updates: List[WorkOrderUpdateSyncItem]
+    notifications: List[NotificationSyncItem]
+    deleted: List[DeletedRecordOut]
+    next_token: str
+    has_more: bool
+
+class SyncToken(BaseModel):
+    token: str
+
+# Toplu istek: alt istekler sırayla, tek kimlik doğrulama ve tek veritabanı oturumuyla yürütülür
+class BatchSubRequest(BaseModel):
+    method: str = Field("GET", pattern="^(GET|POST|PUT|DELETE)$")
+    path: str  # sorgu dizesi dahil, ör. /api/emirler/5?updates_limit=20
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest]
+
+class BatchSubResponse(BaseModel):
+    status: int
+    headers: Dict[str, str]
+    body: Optional[Any] = None
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
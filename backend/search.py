@@ -0,0 +1,214 @@
+# backend/search.py
+# İş emirleri ve güncelleme kayıtları üzerinde tam metin arama.
+# SQLite: FTS5 sanal tabloları, tetikleyicilerle (trigger) güncel tutulur.
+# PostgreSQL: work_order_search tablosunda tsvector belgeleri ve GIN indeksi, yine tetikleyicilerle güncel tutulur.
+#
+# Türkçe büyük/küçük harf dönüşümü (İ/i, I/ı) Python'un lower() fonksiyonuyla doğru
+# yapılamadığından hem indekslenen metin hem de arama sorgusu tr_fold ile normalize edilir.
+# SQLite'ta tr_fold her bağlantıya fonksiyon olarak kaydedilir (bkz. database.py); bu yüzden
+# work_orders/work_order_updates tablolarına bu uygulama dışından yazılmamalıdır.
+
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+
+# İ, I, ı ve i aynı harf kabul edilir; diğer Türkçe harfler de aksansız karşılıklarına indirgenir
+_FOLD_TABLE = str.maketrans("İIıŞşĞğÇçÖöÜü", "iiissggccoouu")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def tr_fold(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    return value.translate(_FOLD_TABLE).lower()
+
+def query_tokens(q: str) -> List[str]:
+    return _TOKEN_RE.findall(tr_fold(q))[:16]
+
+# İş emrinin arama belgesi: başlık, açıklama ve tüm güncelleme kayıtları tek satırda. Güncellemeler
+# ayrı bir tabloda indekslenseydi sık geçen kelimelerde her eşleşen güncelleme tek tek puanlanırdı
+# (1M güncellemede "pompa" ~190 bin eşleşme); böylece en fazla iş emri sayısı kadar belge puanlanır.
+_SQLITE_DOCUMENT_VIEW = """CREATE VIEW IF NOT EXISTS work_order_search_documents AS
+    SELECT w.id AS id, tr_fold(w.title) AS title, tr_fold(w.description) AS description,
+        (SELECT group_concat(tr_fold(u.description), ' ') FROM work_order_updates u WHERE u.work_order_id = w.id) AS updates
+    FROM work_orders w"""
+
+_SQLITE_SETUP = [
+    # contentless tablo: yalnızca indeks tutulur, metin ana tablolarda kalır
+    """CREATE VIRTUAL TABLE work_order_search USING fts5(
+        title, description, updates, content='', tokenize='unicode61 remove_diacritics 2')""",
+]
+
+# Contentless tablodan belge silinirken indekslenen metnin aynısı verilmelidir; bu yüzden eski belge
+# değişiklikten önce (BEFORE) görünümden okunarak silinir, yenisi değişiklikten sonra eklenir.
+_DELETE_DOCUMENT = """INSERT INTO work_order_search(work_order_search, rowid, title, description, updates)
+        SELECT 'delete', id, title, description, updates FROM work_order_search_documents WHERE id = {id};"""
+_INSERT_DOCUMENT = """INSERT INTO work_order_search(rowid, title, description, updates)
+        SELECT id, title, description, updates FROM work_order_search_documents WHERE id = {id};"""
+
+_SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS work_orders_search_ai AFTER INSERT ON work_orders BEGIN
+        {_INSERT_DOCUMENT.format(id="new.id")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS work_orders_search_bd BEFORE DELETE ON work_orders BEGIN
+        {_DELETE_DOCUMENT.format(id="old.id")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS work_orders_search_bu BEFORE UPDATE OF title, description ON work_orders BEGIN
+        {_DELETE_DOCUMENT.format(id="old.id")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS work_orders_search_au AFTER UPDATE OF title, description ON work_orders BEGIN
+        {_INSERT_DOCUMENT.format(id="new.id")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS work_order_updates_search_bi BEFORE INSERT ON work_order_updates BEGIN
+        {_DELETE_DOCUMENT.format(id="new.work_order_id")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS work_order_updates_search_ai AFTER INSERT ON work_order_updates BEGIN
+        {_INSERT_DOCUMENT.format(id="new.work_order_id")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS work_order_updates_search_bd BEFORE DELETE ON work_order_updates BEGIN
+        {_DELETE_DOCUMENT.format(id="old.work_order_id")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS work_order_updates_search_ad AFTER DELETE ON work_order_updates BEGIN
+        {_INSERT_DOCUMENT.format(id="old.work_order_id")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS work_order_updates_search_bu BEFORE UPDATE OF description ON work_order_updates BEGIN
+        {_DELETE_DOCUMENT.format(id="old.work_order_id")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS work_order_updates_search_au AFTER UPDATE OF description ON work_order_updates BEGIN
+        {_INSERT_DOCUMENT.format(id="new.work_order_id")}
+    END""",
+]
+
+# Güncellemeleri ayrı tabloda indeksleyen önceki sürümün tabloları ve tetikleyicileri
+_SQLITE_LEGACY = [
+    "DROP TRIGGER IF EXISTS work_orders_fts_ai",
+    "DROP TRIGGER IF EXISTS work_orders_fts_ad",
+    "DROP TRIGGER IF EXISTS work_orders_fts_au",
+    "DROP TRIGGER IF EXISTS work_order_updates_fts_ai",
+    "DROP TRIGGER IF EXISTS work_order_updates_fts_ad",
+    "DROP TRIGGER IF EXISTS work_order_updates_fts_au",
+    "DROP TABLE IF EXISTS work_order_fts",
+    "DROP TABLE IF EXISTS work_order_update_fts",
+]
+
+_SQLITE_REBUILD = [
+    "INSERT INTO work_order_search(work_order_search) VALUES ('delete-all')",
+    """INSERT INTO work_order_search(rowid, title, description, updates)
+        SELECT id, title, description, updates FROM work_order_search_documents""",
+]
+
+# PostgreSQL'de de iş emri başına tek belge tutulur: başlık (A), açıklama (B) ve güncellemeler (C)
+# ağırlıklarıyla tek bir tsvector. Kaynaklar ayrı ayrı puanlanıp sonradan birleştirilseydi her sayfa
+# farklı bir aday kümesini sıralardı; tek belgeyle sıralama sayfadan bağımsızdır.
+_POSTGRES_DOCUMENT = """setweight(to_tsvector('simple', tr_fold(coalesce(w.title, ''))), 'A')
+        || setweight(to_tsvector('simple', tr_fold(coalesce(w.description, ''))), 'B')
+        || setweight(to_tsvector('simple', tr_fold(coalesce(
+            (SELECT string_agg(u.description, ' ') FROM work_order_updates u WHERE u.work_order_id = w.id), ''))), 'C')"""
+
+_POSTGRES_SETUP = [
+    """CREATE OR REPLACE FUNCTION tr_fold(text) RETURNS text AS $$
+        SELECT lower(translate($1, 'İIıŞşĞğÇçÖöÜü', 'iiissggccoouu'))
+    $$ LANGUAGE sql IMMUTABLE""",
+    # Tabloları ayrı ayrı indeksleyen önceki sürümün ifade indeksleri
+    "DROP INDEX IF EXISTS ix_work_orders_fts",
+    "DROP INDEX IF EXISTS ix_work_order_updates_fts",
+    """CREATE TABLE IF NOT EXISTS work_order_search (
+        work_order_id integer PRIMARY KEY REFERENCES work_orders(id) ON DELETE CASCADE,
+        document tsvector NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_work_order_search_document ON work_order_search USING gin (document)",
+    # Aynı iş emrine eşzamanlı eklenen güncellemeler belgeyi sırayla yeniden oluşturur: kilit alındıktan
+    # sonraki ifade yeni bir anlık görüntüyle çalıştığından önce commit edilen güncelleme kaybolmaz
+    f"""CREATE OR REPLACE FUNCTION refresh_work_order_search(order_id integer) RETURNS void AS $$
+    BEGIN
+        PERFORM 1 FROM work_order_search WHERE work_order_id = order_id FOR UPDATE;
+        INSERT INTO work_order_search(work_order_id, document)
+            SELECT w.id, {_POSTGRES_DOCUMENT} FROM work_orders w WHERE w.id = order_id
+        ON CONFLICT (work_order_id) DO UPDATE SET document = EXCLUDED.document;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE OR REPLACE FUNCTION work_orders_search_trigger() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_work_order_search(NEW.id);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE OR REPLACE FUNCTION work_order_updates_search_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM refresh_work_order_search(OLD.work_order_id);
+        END IF;
+        IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.work_order_id IS DISTINCT FROM OLD.work_order_id) THEN
+            PERFORM refresh_work_order_search(NEW.work_order_id);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS work_orders_search ON work_orders",
+    """CREATE TRIGGER work_orders_search AFTER INSERT OR UPDATE OF title, description ON work_orders
+        FOR EACH ROW EXECUTE FUNCTION work_orders_search_trigger()""",
+    "DROP TRIGGER IF EXISTS work_order_updates_search ON work_order_updates",
+    """CREATE TRIGGER work_order_updates_search AFTER INSERT OR DELETE OR UPDATE OF description, work_order_id
+        ON work_order_updates FOR EACH ROW EXECUTE FUNCTION work_order_updates_search_trigger()""",
+]
+
+_POSTGRES_REBUILD = [
+    "DELETE FROM work_order_search",
+    f"""INSERT INTO work_order_search(work_order_id, document)
+        SELECT w.id, {_POSTGRES_DOCUMENT} FROM work_orders w""",
+]
+
+# Arama indeksini oluşturur; SQLite'ta tablo ilk kez oluşturuluyorsa mevcut kayıtlar da indekslenir
+def create_search_index(connection):
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        existing = {row[0] for row in connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+        for statement in _SQLITE_LEGACY:
+            connection.execute(text(statement))
+        connection.execute(text(_SQLITE_DOCUMENT_VIEW))
+        created = "work_order_search" not in existing
+        if created:
+            for statement in _SQLITE_SETUP:
+                connection.execute(text(statement))
+        for statement in _SQLITE_TRIGGERS:
+            connection.execute(text(statement))
+        if created:
+            rebuild_search_index(connection)
+    elif dialect == "postgresql":
+        created = connection.execute(text("SELECT to_regclass('work_order_search')")).scalar() is None
+        for statement in _POSTGRES_SETUP:
+            connection.execute(text(statement))
+        if created:
+            rebuild_search_index(connection)
+
+# İndeksi ana tablolardan baştan oluşturur
+def rebuild_search_index(connection):
+    dialect = connection.dialect.name
+    statements = _SQLITE_REBUILD if dialect == "sqlite" else _POSTGRES_REBUILD if dialect == "postgresql" else []
+    for statement in statements:
+        connection.execute(text(statement))
+
+# Sorguyla eşleşen iş emri id'lerini, en alakalı önce olacak şekilde döndürür.
+# Başlık/açıklama eşleşmeleri güncelleme kayıtlarındaki eşleşmelerden daha ağır basar.
+def search_statement(dialect: str, tokens: List[str], limit: int, offset: int) -> Tuple[text, dict]:
+    params = {"limit": limit, "offset": offset}
+    if dialect == "postgresql":
+        params["q"] = " & ".join(f"{token}:*" for token in tokens)
+        # Ağırlıklar {D, C, B, A} sırasıyla: güncellemeler 0.1, açıklama 0.2, başlık 1.0 (SQLite'taki 1:2:10)
+        statement = text("""
+            WITH q AS (SELECT to_tsquery('simple', :q) AS query)
+            SELECT work_order_id, ts_rank(CAST('{0.1, 0.1, 0.2, 1.0}' AS real[]), document, q.query) AS score
+            FROM work_order_search, q WHERE document @@ q.query
+            ORDER BY score DESC, work_order_id DESC
+            LIMIT :limit OFFSET :offset
+        """)
+    else:
+        # Her kelime önek olarak aranır: "kapı boya" -> "kapi"* "boya"*
+        params["q"] = " ".join(f'"{token}"*' for token in tokens)
+        statement = text("""
+            SELECT rowid AS work_order_id, -bm25(work_order_search, 10.0, 2.0, 1.0) AS score
+            FROM work_order_search WHERE work_order_search MATCH :q
+            ORDER BY score DESC, work_order_id DESC
+            LIMIT :limit OFFSET :offset
+        """)
+    return statement, params
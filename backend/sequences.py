@@ -0,0 +1,38 @@
+# backend/sequences.py
+# Sayaç tablosu üzerinden atomik, boşluksuz numara üretimi.
+# Sayaç, çağıranın transaction'ı içinde artırılır; transaction geri alınırsa numara da geri alınır.
+
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import models
+from .database import upsert_insert
+
+WORK_ORDER_NO = "work_order_no"
+
+async def _insert_counter_if_missing(db: AsyncSession, name: str, value: int):
+    insert = upsert_insert(db)
+    await db.execute(insert(models.Counter).values(name=name, value=value).on_conflict_do_nothing(index_elements=["name"]))
+
+# count adet ardışık değer ayırır ve ilkini döndürür.
+# UPDATE satırı kilitlediği için eşzamanlı istekler aynı değeri alamaz.
+async def allocate(db: AsyncSession, name: str, count: int = 1, seed: Optional[Callable[[AsyncSession], Awaitable[int]]] = None) -> int:
+    stmt = update(models.Counter).where(models.Counter.name == name).values(value=models.Counter.value + count)
+    if (await db.execute(stmt)).rowcount == 0:
+        # Sayaç ilk kez kullanılıyor; mevcut verilere göre başlangıç değeri ile oluştur
+        await _insert_counter_if_missing(db, name, await seed(db) if seed else 0)
+        await db.execute(stmt)
+    value = (await db.execute(select(models.Counter.value).where(models.Counter.name == name))).scalar_one()
+    return value - count + 1
+
+# Sayaç tablosundan önce oluşturulmuş iş emirleriyle çakışmamak için en büyük numaradan başla
+async def _seed_work_order_no(db: AsyncSession) -> int:
+    result = await db.execute(select(models.WorkOrder.is_emri_no))
+    numbers = [int(no[2:]) for no in result.scalars() if no and no[2:].isdigit()]
+    return max(numbers, default=0)
+
+async def allocate_work_order_numbers(db: AsyncSession, count: int = 1) -> List[str]:
+    first = await allocate(db, WORK_ORDER_NO, count, seed=_seed_work_order_no)
+    return ["WO" + str(number).zfill(4) for number in range(first, first + count)]
@@ -0,0 +1,88 @@
+# backend/serializers.py
+# Yanıt serileştirme için hızlı yol. Veritabanından gelen ve şemaya uyduğu bilinen ORM nesneleri ile
+# satırlar Pydantic modellerinden geçirilmeden doğrudan dict'e çevrilir ve orjson (kuruluysa) ile
+# JSON'a yazılır. Çıktı, response_model ile üretilen JSON'un aynısıdır; schemas.py'deki WorkOrderOut,
+# WorkOrderDetail, WorkOrderUpdateOut ve UserOut alanları değişirse buradaki fonksiyonlar da güncellenmelidir
+# (python -m bench.serialization iki yolun çıktısını karşılaştırır).
+#
+# Endpoint Response nesnesi döndürdüğünde FastAPI response_model doğrulamasını atlar; şema yine
+# OpenAPI belgeleri için route üzerinde kalır. FAST_JSON_RESPONSES=false ile eski yola dönülür.
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from fastapi.responses import JSONResponse
+
+from . import metrics, models
+
+try:
+    import orjson
+except ImportError:  # isteğe bağlı bağımlılık; yoksa standart json kullanılır
+    orjson = None
+
+def _default(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    # Yanıt endpoint içinde oluşturulduğundan JSON'a çevirme süresi ayrıca ölçülür
+    def render(self, content: Any) -> bytes:
+        with metrics.serialization():
+            return dumps(content)
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None) -> FastJSONResponse:
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
+
+# --- ORM nesneleri (ilişkileri önceden yüklenmiş olmalı; bkz. isemri.WORK_ORDER_OUT_OPTIONS) ---
+
+def user_out(user: Optional[models.User]) -> Optional[Dict]:
+    if user is None:
+        return None
+    return {"id": user.id, "username": user.username, "email": user.email}
+
+# WorkOrderUpdateOut.user zorunludur; güncellemeler her zaman yazan kullanıcıyla oluşturulur
+def work_order_update_out(update: models.WorkOrderUpdate) -> Dict:
+    return {
+        "description": update.description,
+        "id": update.id,
+        "work_order_id": update.work_order_id,
+        "created_at": update.created_at,
+        "user": {"username": update.user.username},
+    }
+
+def work_order_out(order: models.WorkOrder) -> Dict:
+    return {
+        "title": order.title,
+        "description": order.description,
+        "priority": order.priority,
+        "assigned_user_id": order.assigned_user_id,
+        "status": order.status,
+        "id": order.id,
+        "is_emri_no": order.is_emri_no,
+        "created_at": order.created_at,
+        "updated_at": order.updated_at,
+        "version": order.version,
+        "assigned_to_user": user_out(order.assigned_to_user),
+        "updates": [work_order_update_out(update) for update in order.updates],
+    }
+
+def work_order_detail_out(order: models.WorkOrder, updates_total: int, updates_next_cursor: Optional[str]) -> Dict:
+    content = work_order_out(order)
+    content["updates_total"] = updates_total
+    content["updates_next_cursor"] = updates_next_cursor
+    return content
+
+def work_order_page(orders: Iterable[models.WorkOrder], next_cursor: Optional[str]) -> Dict:
+    return {"items": [work_order_out(order) for order in orders], "next_cursor": next_cursor}
+
+# --- Satırlar: sütun adları sorgudaki sıraya göre verilir ---
+
+def rows_to_dicts(names: Sequence[str], rows: Iterable[Sequence]) -> List[Dict]:
+    return [dict(zip(names, row)) for row in rows]
@@ -0,0 +1,156 @@
+# backend/stats.py
+# Pano istatistikleri: iş emri tablosunu taramak yerine, her oluşturma/güncelleme/silme
+# işleminde aynı transaction içinde artırılıp azaltılan sayaç tabloları kullanılır.
+# Sayaçlar bozulursa tablolardan yeniden hesaplanabilir:
+#     python -m backend.stats rebuild
+
+import sys
+from collections import Counter
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import models
+from .database import upsert_insert
+
+OPEN_STATUSES = ("Pending", "In Progress")
+
+# Yaş dağılımı dilimleri: (etiket, en az gün, en fazla gün)
+AGE_BUCKETS = (
+    ("0-1 gün", 0, 1),
+    ("2-3 gün", 2, 3),
+    ("4-7 gün", 4, 7),
+    ("8-30 gün", 8, 30),
+    ("30+ gün", 31, None),
+)
+
+# Bir iş emrinin sayaçlara etkisini belirleyen alanlar
+StatKey = Tuple[str, str, int, date]
+
+def stat_key(order: models.WorkOrder) -> StatKey:
+    return (order.status or "", order.priority or "", order.assigned_user_id or 0, order.created_at.date())
+
+def diff(old: Optional[StatKey], new: Optional[StatKey]) -> Counter:
+    deltas = Counter()
+    if old == new:
+        return deltas
+    if old:
+        deltas[old] -= 1
+    if new:
+        deltas[new] += 1
+    return deltas
+
+async def apply(db: AsyncSession, deltas: Counter):
+    insert_stmt = upsert_insert(db)
+    stat_deltas = Counter()
+    day_deltas = Counter()
+    for (status, priority, assigned_user_id, created_on), delta in deltas.items():
+        stat_deltas[(status, priority, assigned_user_id)] += delta
+        if status in OPEN_STATUSES:
+            day_deltas[created_on] += delta
+
+    # Satırlar her zaman aynı sırayla kilitlenir; A->B ve B->A güncellemeleri birbirini beklemesin (deadlock).
+    # stat_key atanmamış iş emrini 0 ile yazdığından anahtarlar doğrudan sıralanabilir.
+    for (status, priority, assigned_user_id), delta in sorted(stat_deltas.items()):
+        if delta:
+            stmt = insert_stmt(models.WorkOrderStat).values(
+                status=status, priority=priority, assigned_user_id=assigned_user_id, count=delta
+            )
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=["status", "priority", "assigned_user_id"],
+                set_={"count": models.WorkOrderStat.count + stmt.excluded.count},
+            ))
+    for created_on, delta in sorted(day_deltas.items()):
+        if delta:
+            stmt = insert_stmt(models.OpenWorkOrderDay).values(created_on=created_on, count=delta)
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=["created_on"],
+                set_={"count": models.OpenWorkOrderDay.count + stmt.excluded.count},
+            ))
+
+async def record_change(db: AsyncSession, old: Optional[StatKey], new: Optional[StatKey]):
+    await apply(db, diff(old, new))
+
+def _age_bucket(age_days: int) -> str:
+    for label, low, high in AGE_BUCKETS:
+        if age_days >= low and (high is None or age_days <= high):
+            return label
+    return AGE_BUCKETS[0][0]
+
+async def get_stats(db: AsyncSession, today: Optional[date] = None) -> Dict:
+    today = today or datetime.utcnow().date()
+    query = (
+        select(models.WorkOrderStat, models.User.username)
+        .outerjoin(models.User, models.WorkOrderStat.assigned_user_id == models.User.id)
+        .where(models.WorkOrderStat.count != 0)
+    )
+    by_status, by_priority, by_assignee = Counter(), Counter(), {}
+    breakdown = []
+    for stat, username in (await db.execute(query)).all():
+        by_status[stat.status] += stat.count
+        by_priority[stat.priority] += stat.count
+        assignee = by_assignee.setdefault(stat.assigned_user_id, {
+            "assigned_user_id": stat.assigned_user_id or None,
+            "username": username,
+            "count": 0,
+        })
+        assignee["count"] += stat.count
+        breakdown.append({
+            "status": stat.status,
+            "priority": stat.priority,
+            "assigned_user_id": stat.assigned_user_id or None,
+            "count": stat.count,
+        })
+
+    ages = Counter({label: 0 for label, _, _ in AGE_BUCKETS})
+    days = await db.execute(select(models.OpenWorkOrderDay).where(models.OpenWorkOrderDay.count != 0))
+    for day in days.scalars():
+        ages[_age_bucket((today - day.created_on).days)] += day.count
+
+    return {
+        "total": sum(by_status.values()),
+        "by_status": dict(by_status),
+        "by_priority": dict(by_priority),
+        "by_assignee": list(by_assignee.values()),
+        "breakdown": breakdown,
+        "open_age_distribution": [{"label": label, "count": ages[label]} for label, _, _ in AGE_BUCKETS],
+    }
+
+# Sayaçları iş emri tablosundan baştan hesaplar (senkron engine ile, tek transaction)
+def rebuild(connection):
+    work_orders = models.WorkOrder.__table__
+    connection.execute(delete(models.WorkOrderStat))
+    connection.execute(delete(models.OpenWorkOrderDay))
+    group = (
+        func.coalesce(work_orders.c.status, ""),
+        func.coalesce(work_orders.c.priority, ""),
+        func.coalesce(work_orders.c.assigned_user_id, 0),
+    )
+    connection.execute(insert(models.WorkOrderStat).from_select(
+        ["status", "priority", "assigned_user_id", "count"],
+        select(*group, func.count()).group_by(*group),
+    ))
+    created_on = func.date(work_orders.c.created_at)
+    rows = connection.execute(
+        select(created_on, func.count())
+        .where(work_orders.c.status.in_(OPEN_STATUSES))
+        .group_by(created_on)
+    ).all()
+    if rows:
+        connection.execute(insert(models.OpenWorkOrderDay), [
+            {"created_on": day if isinstance(day, date) else date.fromisoformat(day), "count": count}
+            for day, count in rows
+        ])
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("Kullanım: python -m backend.stats rebuild")
+    from .database import engine
+    from .migrations import upgrade_schema
+
+    upgrade_schema(engine)
+    with engine.begin() as connection:
+        rebuild(connection)
+    print("İstatistik sayaçları yeniden hesaplandı.")
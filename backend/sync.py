@@ -0,0 +1,146 @@
+# backend/sync.py
+# Mobil istemciler için delta senkronizasyon: her yenilemede tüm listeyi indirmek yerine
+# yalnızca son token'dan sonra değişen iş emirleri, güncellemeler, bildirimler ve
+# silinen kayıtların izleri (tombstone) döner.
+#
+# Token opaktır. Tur tamamlandığında yalnızca bir başlangıç zamanı taşır; satır sınırına
+# takılan uzun turlarda her kayıt türü için (updated_at, id) konumunu da taşır ve istemci
+# has_more false olana kadar next_token ile devam eder. Aynı satır birden fazla kez
+# gelebilir; istemci id'ye göre üzerine yazmalıdır.
+
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import event, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+
+from . import config, models, schemas
+from .auth import get_current_user
+from .database import get_async_db
+from .metrics import TimedRoute
+
+router = APIRouter(tags=["Senkronizasyon"], route_class=TimedRoute)
+
+# Silinen nesnelerin tombstone'da kullanılan adları
+DELETED_ENTITIES = {
+    models.WorkOrder: "work_order",
+    models.WorkOrderUpdate: "work_order_update",
+    models.Notification: "notification",
+}
+
+# ORM ile silinen her kayıt için aynı transaction içinde bir tombstone yazılır.
+# Cascade ile silinen güncellemeler de session.deleted içinde yer alır.
+@event.listens_for(Session, "before_flush")
+def _record_deleted(session, flush_context, instances):
+    for obj in list(session.deleted):
+        entity = DELETED_ENTITIES.get(type(obj))
+        if entity:
+            user_id = obj.user_id if isinstance(obj, models.Notification) else None
+            session.add(models.DeletedRecord(entity=entity, entity_id=obj.id, user_id=user_id))
+
+def encode_token(state: dict) -> str:
+    raw = json.dumps(state, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_token(token: Optional[str]) -> dict:
+    if not token:
+        return {}
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return {
+            "floor": datetime.fromisoformat(state["f"]) if state.get("f") else None,
+            "start": datetime.fromisoformat(state["s"]) if state.get("s") else None,
+            "positions": {
+                name: (datetime.fromisoformat(position[0]), int(position[1])) if position else None
+                for name, position in state.get("p", {}).items()
+            },
+        }
+    except (ValueError, TypeError, KeyError, AttributeError, IndexError):
+        raise HTTPException(status_code=400, detail="Geçersiz senkronizasyon token'ı")
+
+# Bir sonraki turun başlangıcı; commit'i gecikmiş transaction'lar için geriye pay bırakılır
+def _next_round_token(start: datetime) -> str:
+    return encode_token({"f": (start - timedelta(seconds=config.SYNC_OVERLAP_SECONDS)).isoformat()})
+
+@router.get("/sync/token", response_model=schemas.SyncToken)
+async def get_sync_token(current_user: models.User = Depends(get_current_user)):
+    # İstemci listeyi tam yüklemeden önce alır; sonraki yenilemeler bu token'dan devam eder
+    return {"token": _next_round_token(datetime.utcnow())}
+
+@router.get("/sync", response_model=schemas.SyncResponse)
+async def sync_changes(
+    since: Optional[str] = None,
+    limit: int = Query(config.SYNC_PAGE_SIZE, ge=1, le=max(config.SYNC_PAGE_SIZE, 1000)),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    state = decode_token(since)
+    floor = state.get("floor")
+    # Devam eden turda başlangıç zamanı korunur; yeni turda şimdiki zaman alınır
+    start = state.get("start") or datetime.utcnow()
+    positions = state.get("positions")
+
+    sources = {
+        "work_orders": (
+            models.WorkOrder, models.WorkOrder.updated_at,
+            select(models.WorkOrder).options(joinedload(models.WorkOrder.assigned_to_user)),
+        ),
+        "updates": (
+            models.WorkOrderUpdate, models.WorkOrderUpdate.updated_at,
+            select(models.WorkOrderUpdate).options(joinedload(models.WorkOrderUpdate.user)),
+        ),
+        "notifications": (
+            models.Notification, models.Notification.updated_at,
+            select(models.Notification).where(models.Notification.user_id == current_user.id),
+        ),
+    }
+    # İlk (tam) senkronizasyonda silinmiş kayıtların izi gerekmez
+    if floor is not None:
+        sources["deleted"] = (
+            models.DeletedRecord, models.DeletedRecord.deleted_at,
+            select(models.DeletedRecord).where(or_(
+                models.DeletedRecord.user_id.is_(None),
+                models.DeletedRecord.user_id == current_user.id,
+            )),
+        )
+
+    result = {"work_orders": [], "updates": [], "notifications": [], "deleted": []}
+    next_positions = {}
+    for name, (model, changed_at, query) in sources.items():
+        # Bu turda tamamlanmış kayıt türleri tekrar sorgulanmaz
+        if positions is not None and name in positions and positions[name] is None:
+            next_positions[name] = None
+            continue
+        if floor is not None:
+            query = query.where(changed_at >= floor)
+        position = positions.get(name) if positions else None
+        if position:
+            query = query.where(tuple_(changed_at, model.id) > tuple_(*position))
+        query = query.order_by(changed_at, model.id).limit(limit + 1)
+        rows = (await db.execute(query)).scalars().all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_positions[name] = (getattr(last, changed_at.key), last.id)
+        else:
+            next_positions[name] = None
+        result[name] = rows
+
+    has_more = any(position is not None for position in next_positions.values())
+    if has_more:
+        next_token = encode_token({
+            "f": floor.isoformat() if floor else None,
+            "s": start.isoformat(),
+            "p": {
+                name: [position[0].isoformat(), position[1]] if position else None
+                for name, position in next_positions.items()
+            },
+        })
+    else:
+        next_token = _next_round_token(start)
+    return {**result, "next_token": next_token, "has_more": has_more}
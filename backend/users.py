@@ -1,35 +1,36 @@
 ﻿# backend/users.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from .database import get_db
+from .database import get_async_db
 from .models import User
 from .schemas import UserOut # UserOut şemasını import ettiğinizden emin olun
 from .auth import get_current_user
+from .metrics import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 # Yeni endpoint: Tüm kullanıcıları listeler
 @router.get("/users", response_model=List[UserOut])
-def get_all_users(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    users = db.query(User).all()
+async def get_all_users(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    users = (await db.execute(select(User))).scalars().all()
     return users
 
 @router.post("/users", status_code=status.HTTP_201_CREATED)
-def create_user(user: dict, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.username == user.get("username")).first()
+async def create_user(user: dict, db: AsyncSession = Depends(get_async_db)):
+    db_user = (await db.execute(select(User).where(User.username == user.get("username")))).scalars().first()
     if db_user:
         raise HTTPException(status_code=400, detail="Username already registered")
     
     # Basit bir kullanıcı oluşturma örneği
     new_user = User(username=user.get("username"), hashed_password=user.get("password"))
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
     return {"message": "User created successfully"}
 
 @router.get("/users/me", response_model=UserOut)
-def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: User = Depends(get_current_user)):
     return current_user
\ No newline at end of file
@@ -0,0 +1,88 @@
+# backend/versions.py
+# Koşullu istekler (ETag / If-None-Match / If-Match) için sürüm bilgisi.
+# Tek iş emri için satırdaki version sütunu (her UPDATE'te SQLAlchemy artırır),
+# listeler için sayaç tablosunda tutulan koleksiyon sürümleri kullanılır. Koleksiyon
+# sürümleri ORM ile yapılan her değişiklikte aynı transaction içinde artırılır; ORM dışı
+# (Core) toplu UPDATE'lerden sonra bump() ayrıca çağrılmalıdır.
+#
+# Kilit sırası: yazma yolları önce pano sayaçlarını (stats.apply), sonra flush/commit sırasında
+# sürüm sayacını günceller. Sürüm satırı tektir; iş emri yazan tüm transaction'lar commit'e kadar
+# bu satırda sıraya girer. Bu yüzden sürüm artışı transaction'ın son adımlarında yapılır.
+
+from typing import Iterable, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import upsert_insert
+
+WORK_ORDERS = "version:work_orders"
+
+def notifications_version(user_id: int) -> str:
+    return f"version:notifications:{user_id}"
+
+def _bump_statement(db, names: Iterable[str]):
+    insert = upsert_insert(db)
+    stmt = insert(models.Counter).values([{"name": name, "value": 1} for name in names])
+    return stmt.on_conflict_do_update(index_elements=["name"], set_={"value": models.Counter.value + 1})
+
+# İş emri yanıtlarına gömülen kullanıcı alanları (atanan kişi, güncellemeyi yazan); bunlar değişince
+# iş emri listeleri de değişmiş olur
+_EMBEDDED_USER_FIELDS = ("username", "email")
+
+def _embedded_user_changed(session: Session, user: models.User) -> bool:
+    if user in session.new:
+        return False
+    if user in session.deleted:
+        return True
+    attrs = inspect(user).attrs
+    return any(attrs[name].history.has_changes() for name in _EMBEDDED_USER_FIELDS)
+
+def _changed_versions(session: Session) -> set:
+    names = set()
+    changed = list(session.new) + list(session.deleted)
+    changed += [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in changed:
+        if isinstance(obj, (models.WorkOrder, models.WorkOrderUpdate)):
+            names.add(WORK_ORDERS)
+        elif isinstance(obj, models.User) and _embedded_user_changed(session, obj):
+            names.add(WORK_ORDERS)
+        elif isinstance(obj, models.Notification) and obj.user_id:
+            names.add(notifications_version(obj.user_id))
+    return names
+
+@event.listens_for(Session, "before_flush")
+def _bump_changed_versions(session, flush_context, instances):
+    names = _changed_versions(session)
+    if names:
+        session.execute(_bump_statement(session, sorted(names)))
+
+async def bump(db: AsyncSession, *names: str):
+    await db.execute(_bump_statement(db, sorted(set(names))))
+
+async def current(db: AsyncSession, name: str) -> int:
+    value = (await db.execute(select(models.Counter.value).where(models.Counter.name == name))).scalar()
+    return value or 0
+
+def make_etag(*parts) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+def _etag_list(header: Optional[str]) -> list:
+    if not header:
+        return []
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+# If-None-Match zayıf karşılaştırma ile değerlendirilir (W/ öneki yok sayılır)
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    tags = [tag[2:] if tag.startswith("W/") else tag for tag in _etag_list(request.headers.get("if-none-match"))]
+    if "*" in tags or etag in tags:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
+
+# If-Match güçlü karşılaştırma ister; başlık yoksa koşul yok sayılır
+def matches(if_match: Optional[str], etag: str) -> bool:
+    tags = _etag_list(if_match)
+    return not tags or "*" in tags or etag in tags
@@ -0,0 +1,111 @@
+# bench/batch.py
+# Detay ekranının açılışı: iş emri, atanan kişi seçicisi için kullanıcı listesi ve bildirimler.
+# Uygulamanın yaptığı gibi üç ayrı sıralı istek ile tek bir POST /api/batch karşılaştırılır.
+# Mobil bağlantının gidiş-dönüş süresi (RTT), her HTTP isteğinden önce beklenerek taklit edilir.
+#
+#     python -m bench.seed --work-orders 100000 --reset
+#     python -m bench.batch --rtt-ms 0,50,150,300 --repeat 50 -o batch.json
+#
+# Ölçümden önce toplu yanıttaki gövdelerin tek tek alınanlarla aynı olduğu doğrulanır.
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from . import report, scenarios
+from .seed import BENCH_PASSWORD, DEFAULT_DATABASE_URL
+from .targets import AsgiTarget
+
+class LatencyTransport(httpx.AsyncBaseTransport):
+    # Her isteğe bir gidiş-dönüş süresi ekler; sunucu tarafı süre aynen ölçülür
+    def __init__(self, transport: httpx.AsyncBaseTransport, rtt: float):
+        self.transport = transport
+        self.rtt = rtt
+
+    async def handle_async_request(self, request):
+        if self.rtt:
+            await asyncio.sleep(self.rtt)
+        return await self.transport.handle_async_request(request)
+
+def detail_paths(work_order_id: int) -> List[str]:
+    return [f"/api/emirler/{work_order_id}", "/api/users", "/api/notifications?limit=20"]
+
+async def sequential(client, headers: Dict[str, str], work_order_id: int) -> int:
+    status = 200
+    for path in detail_paths(work_order_id):
+        status = max(status, (await client.get(path, headers=headers)).status_code)
+    return status
+
+async def batched(client, headers: Dict[str, str], work_order_id: int) -> int:
+    requests = [{"method": "GET", "path": path} for path in detail_paths(work_order_id)]
+    response = await client.post("/api/batch", json={"requests": requests}, headers=headers)
+    if response.status_code != 200:
+        return response.status_code
+    return max(item["status"] for item in response.json()["responses"])
+
+async def measure(client, operation, headers, ctx, repeat: int, seed: int) -> Dict:
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        work_order_id = rng.choice(list(ctx.etags))
+        call_started = time.perf_counter()
+        if await operation(client, headers, work_order_id) >= 400:
+            errors += 1
+        else:
+            latencies.append(time.perf_counter() - call_started)
+    return report.scenario_result(latencies, errors, time.perf_counter() - started)
+
+async def check_equal(client, headers, work_order_id: int):
+    paths = detail_paths(work_order_id)
+    requests = [{"method": "GET", "path": path} for path in paths]
+    combined = (await client.post("/api/batch", json={"requests": requests}, headers=headers)).json()["responses"]
+    for path, item in zip(paths, combined):
+        if item["body"] != (await client.get(path, headers=headers)).json():
+            sys.exit(f"Toplu yanıttaki {path} gövdesi tek istekle alınandan farklı")
+
+async def main_async(args) -> Dict:
+    target = AsgiTarget({"DATABASE_URL": args.database_url})
+    results = {}
+    async with target:
+        async with target.client() as client:
+            ctx = await scenarios.prepare(client, password=args.password)
+            await check_equal(client, ctx.headers, next(iter(ctx.etags)))
+
+        for rtt_ms in args.rtt_ms:
+            transport = LatencyTransport(httpx.ASGITransport(app=target.app), rtt_ms / 1000)
+            async with httpx.AsyncClient(transport=transport, base_url=target.base_url, timeout=60) as client:
+                for name, operation in (("sequential", sequential), ("batch", batched)):
+                    key = f"{name}_{rtt_ms}ms"
+                    results[key] = await measure(client, operation, ctx.headers, ctx, args.repeat, args.seed)
+                    print(f"{key}: p50 {results[key]['latency_ms']['p50']} ms", file=sys.stderr)
+
+    return {
+        "meta": report.run_metadata(
+            database_url=args.database_url.split("@")[-1], repeat=args.repeat, rtt_ms=args.rtt_ms,
+            requests_per_screen=len(detail_paths(0)),
+        ),
+        "scenarios": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Sıralı istekleri tek toplu istekle karşılaştırır")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--rtt-ms", default="0,50,150,300", help="virgülle ayrılmış gidiş-dönüş süreleri (ms)")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args()
+    args.rtt_ms = [int(value) for value in args.rtt_ms.split(",") if value.strip()]
+    report.write_report(asyncio.run(main_async(args)), args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# bench/compare.py
+# İki bench.run çıktısını karşılaştırır: python -m bench.compare eski.json yeni.json
+
+import json
+import sys
+
+def _change(old, new) -> str:
+    if old in (None, 0) or new is None:
+        return "-"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+def compare(old: dict, new: dict):
+    print(f"{'senaryo':<20} {'istek/sn':>22} {'p50 ms':>22} {'p95 ms':>22} {'p99 ms':>22}")
+    for name, current in new["scenarios"].items():
+        previous = old["scenarios"].get(name)
+        if not previous:
+            continue
+        cells = [f"{previous['throughput_rps']} → {current['throughput_rps']} ({_change(previous['throughput_rps'], current['throughput_rps'])})"]
+        for key in ("p50", "p95", "p99"):
+            before, after = previous["latency_ms"][key], current["latency_ms"][key]
+            cells.append(f"{before} → {after} ({_change(before, after)})")
+        print(f"{name:<20} " + " ".join(f"{cell:>22}" for cell in cells))
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("Kullanım: python -m bench.compare eski.json yeni.json")
+    with open(sys.argv[1], encoding="utf-8") as old_file, open(sys.argv[2], encoding="utf-8") as new_file:
+        compare(json.load(old_file), json.load(new_file))
@@ -0,0 +1,97 @@
+# bench/export_rss.py
+# Dışa aktarımın bellek kullanımını doğrular: büyük bir tabloyu uvicorn üzerinden akış halinde indirir,
+# sunucu process'inin RSS değerini örnekler ve artış sınırı aşılırsa sıfırdan farklı kodla çıkar.
+#
+#     python -m bench.seed --work-orders 500000 --updates 1 --reset
+#     python -m bench.export_rss --format csv --min-rows 500000 --max-growth-mb 150
+#
+# RSS /proc üzerinden okunduğu için yalnızca Linux'ta çalışır.
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from . import report
+from .seed import BENCH_PASSWORD, DEFAULT_DATABASE_URL, username
+from .targets import UvicornTarget
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmRSS okunamadı")
+
+async def measure(args) -> dict:
+    target = UvicornTarget({"DATABASE_URL": args.database_url}, port=args.port, workers=1)
+    async with target:
+        pid = target.process.pid
+        async with target.client() as client:
+            login = await client.post("/api/login", data={"username": username(1), "password": args.password})
+            login.raise_for_status()
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            # İlk istekler import ve önbellekleri ısıtır; taban değer bunlardan sonra alınır
+            await client.get("/api/emirler", params={"limit": 50}, headers=headers)
+            baseline = rss_mb(pid)
+            peak = baseline
+
+            async def sample():
+                nonlocal peak
+                while True:
+                    peak = max(peak, rss_mb(pid))
+                    await asyncio.sleep(0.05)
+
+            sampler = asyncio.create_task(sample())
+            rows = 0
+            size = 0
+            started = time.perf_counter()
+            try:
+                async with client.stream("GET", "/api/emirler/export", params={"format": args.format}, headers=headers) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        rows += 1
+                        size += len(line) + 1
+            finally:
+                sampler.cancel()
+                await asyncio.gather(sampler, return_exceptions=True)
+            duration = time.perf_counter() - started
+
+    if args.format == "csv":
+        # Başlık satırı; CSV'de güncelleme geçmişi hücreleri birden fazla satıra yayılabilir
+        rows -= 1
+    return {
+        "meta": report.run_metadata(target="uvicorn", database_url=args.database_url.split("@")[-1], format=args.format),
+        "export": {
+            "lines": rows,
+            "bytes": size,
+            "duration_s": round(duration, 3),
+            "mb_per_second": round(size / 1024 / 1024 / duration, 2) if duration else None,
+            "rss_baseline_mb": round(baseline, 1),
+            "rss_peak_mb": round(peak, 1),
+            "rss_growth_mb": round(peak - baseline, 1),
+        },
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Dışa aktarımın bellek kullanımını ölçer")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="ndjson")
+    parser.add_argument("--min-rows", type=int, default=0, help="beklenen en az satır (NDJSON'da iş emri sayısı)")
+    parser.add_argument("--max-growth-mb", type=float, default=150)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args()
+
+    result = asyncio.run(measure(args))
+    report.write_report(result, args.output)
+    export = result["export"]
+    if export["lines"] < args.min_rows:
+        sys.exit(f"Beklenenden az satır geldi: {export['lines']} < {args.min_rows}")
+    if export["rss_growth_mb"] > args.max_growth_mb:
+        sys.exit(f"Bellek artışı sınırı aştı: {export['rss_growth_mb']} MB > {args.max_growth_mb} MB")
+
+if __name__ == "__main__":
+    main()
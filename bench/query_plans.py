@@ -0,0 +1,209 @@
+# bench/query_plans.py
+# Sorgu planı regresyon kontrolü: uygulamaya ASGI üzerinden her router'ın uç noktalarını çağıran bir
+# istek dizisi gönderilir, bu sırada çalışan tüm SQL ifadeleri yakalanır ve her biri için
+# EXPLAIN QUERY PLAN (SQLite) veya EXPLAIN (PostgreSQL) çalıştırılır. Büyük bir tabloyu baştan sona
+# tarayan (SQLite: "SCAN tablo", PostgreSQL: "Seq Scan on tablo") bir plan varsa sıfırdan farklı
+# kodla çıkar. Planlar ancak dolu bir veritabanında anlamlıdır:
+#
+#     python -m bench.seed --work-orders 1000000 --updates 1 --reset
+#     python -m bench.query_plans [--show-plans]
+#
+# PostgreSQL'de planlayıcı istatistiklere baktığı için seed sonrasında ANALYZE çalıştırılmalıdır.
+# Test takımı (tests/test_query_plans.py) aynı kontrolü küçük bir SQLite veritabanında çalıştırır;
+# istatistik olmadan SQLite planlayıcısı indeks seçimini veri hacminden bağımsız yapar.
+# Yeni bir uç nokta eklendiğinde aşağıdaki run_requests dizisine de eklenmelidir.
+
+import argparse
+import asyncio
+import os
+import re
+import sys
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .seed import BENCH_PASSWORD, DEFAULT_DATABASE_URL, username
+from .targets import AsgiTarget
+
+# Planda yer alabilecek ama tarama gerektirmeyen ifadeler (işlem kontrolü, PRAGMA vb.) atlanır
+EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+@dataclass
+class Statement:
+    sql: str
+    parameters: object
+    labels: List[str] = field(default_factory=list)
+    allowed: Set[str] = field(default_factory=set)
+
+class Recorder:
+    def __init__(self, table_names: Set[str]):
+        self.table_names = table_names
+        self.statements: Dict[str, Statement] = {}
+        self.label = ""
+        self.allowed: Set[str] = set()
+
+    def on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not EXPLAINABLE.match(statement):
+            return
+        # executemany ve insertmanyvalues'ta parametre listesi gelir; ilk satır yeterlidir
+        if parameters and isinstance(parameters, (list, tuple)) and isinstance(parameters[0], (list, tuple, dict)):
+            parameters = parameters[0]
+        # Sürücü parametreleri liste veya tuple olarak verir; EXPLAIN için aynen tekrar kullanılır
+        parameters = dict(parameters) if isinstance(parameters, dict) else tuple(parameters or ())
+        entry = self.statements.get(statement)
+        if entry is None:
+            entry = self.statements[statement] = Statement(statement, parameters)
+        if self.label not in entry.labels:
+            entry.labels.append(self.label)
+        entry.allowed |= self.allowed
+
+    # SQLAlchemy'nin takma adları tablo adına _1, _2 ekler (users_1)
+    def table_of(self, name: str) -> Optional[str]:
+        if name in self.table_names:
+            return name
+        base = re.sub(r"_\d+$", "", name)
+        return base if base in self.table_names else None
+
+async def run_requests(client, recorder: Recorder):
+    async def call(label: str, method: str, url: str, allow: Sequence[str] = (), expect: Tuple[int, ...] = (200,), **kwargs):
+        recorder.label = f"{method} {label}"
+        recorder.allowed = set(allow)
+        response = await client.request(method, url, **kwargs)
+        if response.status_code not in expect:
+            raise RuntimeError(f"{method} {url} -> {response.status_code}: {response.text[:200]}")
+        return response
+
+    login = await call("/api/login", "POST", "/api/login", data={"username": username(2), "password": BENCH_PASSWORD})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    me = (await call("/api/users/me", "GET", "/api/users/me", headers=headers)).json()
+    # Kullanıcı listesi açılır menü içindir; tablonun tamamını okuması beklenir
+    await call("/api/users", "GET", "/api/users", allow=["users"], headers=headers)
+
+    page = (await call("/api/emirler", "GET", "/api/emirler", headers=headers)).json()
+    await call("/api/emirler?cursor", "GET", "/api/emirler", params={"cursor": page["next_cursor"]}, headers=headers)
+    for params in ({"status": "Pending"}, {"priority": "Yüksek"}, {"assigned_user_id": me["id"]},
+                   {"status": "In Progress", "assigned_user_id": me["id"]}, {"view": "summary"}, {"fields": "title,assignee_name"}):
+        await call("/api/emirler?" + ",".join(params), "GET", "/api/emirler", params=params, headers=headers)
+
+    queue = (await call("/api/emirler/mine", "GET", "/api/emirler/mine", params={"limit": 5}, headers=headers)).json()
+    if queue["next_cursor"]:
+        await call("/api/emirler/mine?cursor", "GET", "/api/emirler/mine", params={"limit": 5, "cursor": queue["next_cursor"]}, headers=headers)
+
+    work_order_id = page["items"][len(page["items"]) // 2]["id"]
+    detail = await call("/api/emirler/{id}", "GET", f"/api/emirler/{work_order_id}", headers=headers)
+    await call("/api/emirler/{id} (304)", "GET", f"/api/emirler/{work_order_id}", expect=(304,),
+               headers={**headers, "If-None-Match": detail.headers["etag"]})
+    await call("/api/emirler/{id}?updates_limit", "GET", f"/api/emirler/{work_order_id}", params={"updates_limit": 1}, headers=headers)
+    timeline = (await call("/api/emirler/{id}/updates", "GET", f"/api/emirler/{work_order_id}/updates",
+                           params={"limit": 1}, headers=headers)).json()
+    if timeline["next_cursor"]:
+        await call("/api/emirler/{id}/updates?cursor", "GET", f"/api/emirler/{work_order_id}/updates",
+                   params={"limit": 1, "cursor": timeline["next_cursor"]}, headers=headers)
+    await call("/api/emirler/search", "GET", "/api/emirler/search", params={"q": "pompa arıza"}, headers=headers)
+    # Pano sayaç tabloları küçüktür (durum x öncelik x kullanıcı, gün sayısı); tamamı okunur
+    await call("/api/emirler/stats", "GET", "/api/emirler/stats",
+               allow=["work_order_stats", "open_work_order_days", "users"], headers=headers)
+    day = datetime.utcnow() - timedelta(days=3)
+    await call("/api/emirler/export", "GET", "/api/emirler/export", headers=headers, params={
+        "format": "ndjson", "status": "Pending",
+        "created_from": day.isoformat(), "created_to": (day + timedelta(hours=6)).isoformat(),
+    })
+
+    # Idempotency-Key: ilk istek anahtarı kaydeder, tekrarı saklanan yanıtı döner
+    keyed = {**headers, "Idempotency-Key": uuid.uuid4().hex}
+    created = (await call("/api/emirler (Idempotency-Key)", "POST", "/api/emirler", expect=(201,), headers=keyed,
+                          json={"title": "plan kontrolü", "assigned_user_id": me["id"]})).json()
+    await call("/api/emirler (Idempotency-Key tekrarı)", "POST", "/api/emirler", expect=(201,), headers=keyed,
+               json={"title": "plan kontrolü", "assigned_user_id": me["id"]})
+    update = (await call("/api/emirler/{id}/updates", "POST", f"/api/emirler/{created['id']}/updates", expect=(201,),
+                         headers=headers, json={"description": "plan kontrolü"})).json()
+    await call("/api/updates/{id}", "PUT", f"/api/updates/{update['id']}", headers=headers, json={"description": "plan kontrolü 2"})
+    current = await call("/api/emirler/{id}", "GET", f"/api/emirler/{created['id']}", headers=headers)
+    await call("/api/emirler/{id}", "PUT", f"/api/emirler/{created['id']}", headers={**headers, "If-Match": current.headers["etag"]},
+               json={"title": "plan kontrolü", "status": "Completed"})
+    await call("/api/emirler/{id}", "DELETE", f"/api/emirler/{created['id']}", expect=(204,), headers=headers)
+
+    bulk = (await call("/api/emirler/bulk", "POST", "/api/emirler/bulk", headers=headers,
+                       json={"items": [{"title": "plan kontrolü", "assigned_user_id": me["id"]} for _ in range(3)]})).json()
+    ids = [item["id"] for item in bulk["results"]]
+    await call("/api/emirler/bulk", "PUT", "/api/emirler/bulk", headers=headers,
+               json={"items": [{"id": work_order, "status": "In Progress"} for work_order in ids]})
+    await call("/api/emirler/bulk", "DELETE", "/api/emirler/bulk", params={"ids": ids}, headers=headers)
+
+    notifications = (await call("/api/notifications", "GET", "/api/notifications", headers=headers)).json()
+    if notifications["next_cursor"]:
+        await call("/api/notifications?cursor", "GET", "/api/notifications", params={"cursor": notifications["next_cursor"]}, headers=headers)
+    await call("/api/notifications/unread_count", "GET", "/api/notifications/unread_count", headers=headers)
+    if notifications["items"]:
+        await call("/api/notifications/{id}/read", "PUT", f"/api/notifications/{notifications['items'][0]['id']}/read", headers=headers)
+    await call("/api/notifications/read", "PUT", "/api/notifications/read", headers=headers)
+
+    # Alt istekler aynı router'lardan geçer; toplu isteğin kendine ait sorgusu yoktur
+    await call("/api/batch", "POST", "/api/batch", allow=["users"], headers=headers, json={"requests": [
+        {"path": f"/api/emirler/{work_order_id}"}, {"path": "/api/users"}, {"path": "/api/notifications"},
+    ]})
+
+    token = (await call("/api/sync/token", "GET", "/api/sync/token", headers=headers)).json()["token"]
+    await call("/api/sync", "GET", "/api/sync", params={"since": token}, headers=headers)
+
+def explain_sqlite(rows) -> Tuple[List[str], List[str]]:
+    lines = [row[3] for row in rows]
+    scanned = [match.group(1) for match in map(SQLITE_SCAN.match, lines) if match]
+    return lines, scanned
+
+def explain_postgres(rows) -> Tuple[List[str], List[str]]:
+    lines = [row[0] for row in rows]
+    scanned = [match.group(1) for line in lines for match in POSTGRES_SCAN.finditer(line)]
+    return lines, scanned
+
+async def check_plans(engine, recorder: Recorder, show_plans: bool) -> int:
+    dialect = engine.dialect.name
+    prefix, parse = ("EXPLAIN QUERY PLAN ", explain_sqlite) if dialect == "sqlite" else ("EXPLAIN ", explain_postgres)
+    violations = 0
+    async with engine.connect() as connection:
+        for entry in recorder.statements.values():
+            result = await connection.exec_driver_sql(prefix + entry.sql, entry.parameters)
+            lines, scanned = parse(result.all())
+            tables = {recorder.table_of(name) for name in scanned} - {None}
+            bad = sorted(tables - entry.allowed)
+            if bad:
+                violations += 1
+            if bad or show_plans:
+                status = f"TAM TARAMA: {', '.join(bad)}" if bad else "OK"
+                print(f"\n[{status}] {' | '.join(entry.labels)}\n  {' '.join(entry.sql.split())[:400]}", file=sys.stderr)
+                for line in lines:
+                    print(f"    {line}", file=sys.stderr)
+    return violations
+
+async def main_async(args) -> int:
+    target = AsgiTarget({"DATABASE_URL": args.database_url, "FAST_JSON_RESPONSES": "true"})
+    from sqlalchemy import event
+    from backend import models
+    from backend.database import async_engine
+
+    recorder = Recorder(set(models.Base.metadata.tables))
+    async with target:
+        event.listen(async_engine.sync_engine, "before_cursor_execute", recorder.on_execute)
+        try:
+            async with target.client() as client:
+                await run_requests(client, recorder)
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", recorder.on_execute)
+        violations = await check_plans(async_engine, recorder, args.show_plans)
+
+    print(f"\n{len(recorder.statements)} farklı SQL ifadesi incelendi, {violations} tanesi tam tarama yapıyor.", file=sys.stderr)
+    return violations
+
+def main():
+    parser = argparse.ArgumentParser(description="Router sorgularının planlarında tam tablo taraması arar")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--show-plans", action="store_true", help="sorunsuz planları da yazdır")
+    args = parser.parse_args()
+    if asyncio.run(main_async(args)):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# bench/report.py
+# Gecikme ölçümlerinin özetlenmesi ve çalıştırmalar arasında karşılaştırılabilir JSON çıktısı.
+
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    # En yakın sıra (nearest-rank) yöntemi
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+def latency_summary(latencies: List[float]) -> Dict:
+    values = sorted(latency * 1000 for latency in latencies)
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    return {
+        "p50": round(percentile(values, 0.50), 3),
+        "p95": round(percentile(values, 0.95), 3),
+        "p99": round(percentile(values, 0.99), 3),
+        "mean": round(sum(values) / len(values), 3),
+        "max": round(values[-1], 3),
+    }
+
+def scenario_result(latencies: List[float], errors: int, duration: float, rows_per_request: int = 1, **extra) -> Dict:
+    requests = len(latencies) + errors
+    throughput = len(latencies) / duration if duration else 0.0
+    result = {
+        "requests": requests,
+        "errors": errors,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(throughput, 2),
+        "latency_ms": latency_summary(latencies),
+    }
+    if rows_per_request != 1:
+        result["rows_per_second"] = round(throughput * rows_per_request, 2)
+    result.update({key: value for key, value in extra.items() if value is not None})
+    return result
+
+def git_commit(path: Optional[str] = None) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=path or os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_metadata(**fields) -> Dict:
+    return {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        **fields,
+    }
+
+def write_report(report: Dict, output: Optional[str]):
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if output:
+        with open(output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+        print(f"Sonuçlar yazıldı: {output}", file=sys.stderr)
+    else:
+        print(text)
@@ -0,0 +1,191 @@
+# bench/run.py
+# Senaryoları gerçek FastAPI uygulamasına karşı çalıştırır ve sonuçları JSON olarak yazar.
+#
+#     python -m bench.seed --work-orders 100000 --reset
+#     python -m bench.run --target asgi --scenarios list,detail,search --requests 2000 --concurrency 20
+#     python -m bench.run --target uvicorn --workers 4 --scenarios login --env PASSWORD_HASH_WORKERS=4 -o login-4.json
+#     python -m bench.run --target uvicorn --scenarios sse_fanout --sse-subscribers 200
+#     python -m bench.compare eski.json yeni.json
+#
+# Aynı ölçüm SQLite ve PostgreSQL için --database-url değiştirilerek tekrarlanabilir.
+#     python -m bench.run --target uvicorn --app-dir ../icom-eski --scenarios list_detail --concurrency 200 --duration 30
+#
+# ASGI hedefinde her senaryo için istek başına SQL sayısı ve event loop gecikmesi de raporlanır.
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+from . import report, scenarios
+from .seed import BENCH_PASSWORD, DEFAULT_DATABASE_URL
+from .targets import REPO_ROOT, AsgiTarget, UvicornTarget
+
+class QueryCounter:
+    # Engine üzerinde çalışan her SQL ifadesini sayar (yalnızca aynı process'teki uygulama için)
+    def __init__(self):
+        from sqlalchemy import event
+        from backend.database import async_engine
+
+        self.count = 0
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+class LoopLagProbe:
+    # Event loop'u bloklayan işleri görmek için: kısa uyku süresinin ne kadar aşıldığını ölçer
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(time.perf_counter() - started - self.interval)
+
+    def start(self):
+        self.samples = []
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> Dict:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        return report.latency_summary(self.samples)
+
+# duration verilirse istek sayısı yerine süre sınırı uygulanır: süre dolduğunda yanıt bekleyen
+# istekler iptal edilir ve sayılmaz. Yük altında hiç yanıt veremeyen bir sunucu da böylece ölçülebilir.
+async def run_scenario(client, ctx, operation, requests: int, concurrency: int, seed: int, duration: Optional[float] = None):
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker(worker_id: int):
+        nonlocal remaining, errors
+        rng = random.Random(seed * 1000 + worker_id)
+        while duration or remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                status = await operation(client, ctx, rng)
+            except Exception:
+                status = 599
+            if status >= 400:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    workers = [asyncio.create_task(worker(index)) for index in range(concurrency)]
+    if duration:
+        await asyncio.wait(workers, timeout=duration)
+        for task in workers:
+            task.cancel()
+    await asyncio.gather(*workers, return_exceptions=bool(duration))
+    return latencies, errors, time.perf_counter() - started
+
+async def main_async(args, env: Dict[str, str]) -> Dict:
+    if args.target == "asgi":
+        target = AsgiTarget(env)
+    else:
+        target = UvicornTarget(env, port=args.port, workers=args.workers, app_dir=args.app_dir)
+
+    results = {}
+    async with target:
+        async with target.client() as client:
+            ctx = await scenarios.prepare(client, password=args.password, bulk_size=args.bulk_size)
+            query_counter = QueryCounter() if target.in_process else None
+            probe = LoopLagProbe() if target.in_process else None
+
+            for name in args.scenarios:
+                if name == "sse_fanout":
+                    outcome = await scenarios.sse_fanout(client, ctx, args.sse_subscribers, args.sse_rounds)
+                    results[name] = report.scenario_result(
+                        outcome["latencies"], outcome["errors"], outcome["duration"], subscribers=outcome["subscribers"],
+                    )
+                    continue
+
+                operation = scenarios.SCENARIOS[name]
+                if args.warmup:
+                    await run_scenario(client, ctx, operation, args.warmup, min(args.concurrency, args.warmup), args.seed)
+                queries_before = query_counter.count if query_counter else 0
+                if probe:
+                    probe.start()
+                latencies, errors, duration = await run_scenario(
+                    client, ctx, operation, args.requests, args.concurrency, args.seed, duration=args.duration,
+                )
+                loop_lag = await probe.stop() if probe else None
+                results[name] = report.scenario_result(
+                    latencies, errors, duration,
+                    rows_per_request=args.bulk_size if name == "bulk_create" else 1,
+                    queries_per_request=round((query_counter.count - queries_before) / max(len(latencies) + errors, 1), 2) if query_counter else None,
+                    loop_lag_ms=loop_lag,
+                )
+                print(f"{name}: {results[name]['throughput_rps']} istek/sn, p95 {results[name]['latency_ms']['p95']} ms", file=sys.stderr)
+
+    return {
+        "meta": report.run_metadata(
+            target=args.target,
+            workers=args.workers if args.target == "uvicorn" else None,
+            app_dir=args.app_dir if args.target == "uvicorn" else None,
+            app_commit=report.git_commit(args.app_dir) if args.target == "uvicorn" else None,
+            database_url=env["DATABASE_URL"].split("@")[-1],
+            requests=args.requests,
+            duration=args.duration,
+            concurrency=args.concurrency,
+            env={key: value for key, value in env.items() if key != "DATABASE_URL"},
+        ),
+        "scenarios": results,
+    }
+
+def parse_env(pairs: List[str]) -> Dict[str, str]:
+    env = {}
+    for pair in pairs:
+        key, separator, value = pair.partition("=")
+        if not separator:
+            raise SystemExit(f"--env ANAHTAR=DEĞER biçiminde olmalı: {pair}")
+        env[key] = value
+    return env
+
+def main():
+    available = list(scenarios.SCENARIOS) + ["sse_fanout"]
+    parser = argparse.ArgumentParser(description="API yük testi ve mikro ölçümler")
+    parser.add_argument("--target", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--scenarios", default="list,detail,create,notification_poll,login",
+                        help=f"virgülle ayrılmış: {', '.join(available)}")
+    parser.add_argument("--requests", type=int, default=500, help="senaryo başına istek")
+    parser.add_argument("--duration", type=float, help="istek sayısı yerine senaryo başına süre (sn)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--bulk-size", type=int, default=100)
+    parser.add_argument("--sse-subscribers", type=int, default=50)
+    parser.add_argument("--sse-rounds", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker sayısı")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--app-dir", default=REPO_ROOT, help="uvicorn hedefinde ölçülecek uygulamanın checkout dizini")
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--env", action="append", default=[], help="uygulamaya verilecek ortam değişkeni (ANAHTAR=DEĞER)")
+    parser.add_argument("-o", "--output", help="JSON çıktısının yazılacağı dosya (verilmezse stdout)")
+    args = parser.parse_args()
+
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in args.scenarios if name not in available]
+    if unknown:
+        parser.error(f"Bilinmeyen senaryo: {', '.join(unknown)}")
+    if args.app_dir != REPO_ROOT and args.target != "uvicorn":
+        parser.error("--app-dir yalnızca --target uvicorn ile çalışır")
+    if "sse_fanout" in args.scenarios and args.target != "uvicorn":
+        parser.error("sse_fanout yalnızca --target uvicorn ile çalışır")
+
+    env = {"DATABASE_URL": args.database_url, **parse_env(args.env)}
+    report.write_report(asyncio.run(main_async(args, env)), args.output)
+
+if __name__ == "__main__":
+    main()
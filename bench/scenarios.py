@@ -0,0 +1,167 @@
+# bench/scenarios.py
+# Senaryolar: her biri tek bir kullanıcı işlemini (bir veya birkaç HTTP isteği) yürütür ve son
+# yanıtın durum kodunu döner. Veri bench.seed ile üretilmiş olmalıdır.
+
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from .seed import BENCH_PASSWORD, WORDS, username
+
+@dataclass
+class Context:
+    headers: Dict[str, str]
+    users: int
+    max_work_order_id: int
+    sync_token: str
+    password: str = BENCH_PASSWORD
+    bulk_size: int = 100
+    etags: Dict[int, str] = field(default_factory=dict)
+
+async def prepare(client: httpx.AsyncClient, password: str = BENCH_PASSWORD, bulk_size: int = 100) -> Context:
+    response = await client.post("/api/login", data={"username": username(1), "password": password})
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    users = len((await client.get("/api/users", headers=headers)).json())
+    newest = (await client.get("/api/emirler", params={"limit": 1, "view": "summary"}, headers=headers)).json()["items"]
+    if not newest:
+        raise RuntimeError("Veritabanında iş emri yok; önce python -m bench.seed çalıştırın")
+    # /api/sync ve ETag eski sürümlerde yoktur (bkz. run.py --app-dir); yalnızca sync ve detail_cached
+    # senaryoları bunları kullanır
+    sync = await client.get("/api/sync/token", headers=headers)
+    token = sync.json()["token"] if sync.status_code == 200 else ""
+    context = Context(headers=headers, users=users, max_work_order_id=newest[0]["id"], sync_token=token, password=password, bulk_size=bulk_size)
+    for work_order_id in random.Random(1).sample(range(1, context.max_work_order_id + 1), min(50, context.max_work_order_id)):
+        detail = await client.get(f"/api/emirler/{work_order_id}", headers=headers)
+        if detail.status_code == 200 and "etag" in detail.headers:
+            context.etags[work_order_id] = detail.headers["etag"]
+    return context
+
+def _work_order(rng: random.Random, ctx: Context) -> dict:
+    return {
+        "title": " ".join(rng.choices(WORDS, k=3)),
+        "description": " ".join(rng.choices(WORDS, k=10)),
+        "priority": rng.choice(["Düşük", "Normal", "Yüksek"]),
+        "assigned_user_id": rng.randint(1, ctx.users) if ctx.users else None,
+    }
+
+Operation = Callable[[httpx.AsyncClient, Context, random.Random], Awaitable[int]]
+
+async def login(client, ctx, rng):
+    data = {"username": username(rng.randint(1, max(ctx.users, 1))), "password": ctx.password}
+    return (await client.post("/api/login", data=data)).status_code
+
+async def list_full(client, ctx, rng):
+    return (await client.get("/api/emirler", params={"limit": 50}, headers=ctx.headers)).status_code
+
+async def list_summary(client, ctx, rng):
+    return (await client.get("/api/emirler", params={"limit": 50, "view": "summary"}, headers=ctx.headers)).status_code
+
+async def detail(client, ctx, rng):
+    work_order_id = rng.randint(1, ctx.max_work_order_id)
+    return (await client.get(f"/api/emirler/{work_order_id}", headers=ctx.headers)).status_code
+
+# Liste ve detay isteklerinin eşit karışımı; sync ve async oturum yollarının karşılaştırması için (bkz. README.md)
+async def list_detail(client, ctx, rng):
+    if rng.random() < 0.5:
+        return (await client.get("/api/emirler", params={"limit": 20}, headers=ctx.headers)).status_code
+    return await detail(client, ctx, rng)
+
+# İstemcide önbelleğe alınmış kopya: If-None-Match ile 304 yolu
+async def detail_cached(client, ctx, rng):
+    work_order_id, etag = rng.choice(list(ctx.etags.items()))
+    return (await client.get(f"/api/emirler/{work_order_id}", headers={**ctx.headers, "If-None-Match": etag})).status_code
+
+async def create(client, ctx, rng):
+    return (await client.post("/api/emirler", json=_work_order(rng, ctx), headers=ctx.headers)).status_code
+
+async def bulk_create(client, ctx, rng):
+    items = [_work_order(rng, ctx) for _ in range(ctx.bulk_size)]
+    return (await client.post("/api/emirler/bulk", json={"items": items}, headers=ctx.headers)).status_code
+
+# Uygulamanın bildirim yoklaması: rozet sayısı ve son 20 bildirim birlikte istenir
+async def notification_poll(client, ctx, rng):
+    count, page = await asyncio.gather(
+        client.get("/api/notifications/unread_count", headers=ctx.headers),
+        client.get("/api/notifications", params={"limit": 20}, headers=ctx.headers),
+    )
+    return max(count.status_code, page.status_code)
+
+# Teknisyenin iş kuyruğu; kullanıcı başına ~10k geçmiş iş emri için örn. --users 20 --work-orders 250000
+async def my_queue(client, ctx, rng):
+    return (await client.get("/api/emirler/mine", headers=ctx.headers)).status_code
+
+async def search(client, ctx, rng):
+    q = " ".join(rng.sample(WORDS, rng.randint(1, 2)))
+    return (await client.get("/api/emirler/search", params={"q": q, "limit": 20}, headers=ctx.headers)).status_code
+
+async def dashboard_stats(client, ctx, rng):
+    return (await client.get("/api/emirler/stats", headers=ctx.headers)).status_code
+
+async def delta_sync(client, ctx, rng):
+    return (await client.get("/api/sync", params={"since": ctx.sync_token}, headers=ctx.headers)).status_code
+
+SCENARIOS: Dict[str, Operation] = {
+    "login": login,
+    "list": list_full,
+    "list_summary": list_summary,
+    "detail": detail,
+    "detail_cached": detail_cached,
+    "list_detail": list_detail,
+    "create": create,
+    "bulk_create": bulk_create,
+    "notification_poll": notification_poll,
+    "mine": my_queue,
+    "search": search,
+    "stats": dashboard_stats,
+    "sync": delta_sync,
+}
+
+# Anlık bildirim dağıtımı: aynı kullanıcının N açık SSE bağlantısı varken iş emri atanır ve
+# bildirimin her bağlantıya ulaşma süresi ölçülür. Gerçek akış gerektiği için uvicorn hedefiyle çalışır.
+async def sse_fanout(client: httpx.AsyncClient, ctx: Context, subscribers: int, rounds: int) -> Dict:
+    token = ctx.headers["Authorization"].split(" ", 1)[1]
+    user_id = (await client.get("/api/users/me", headers=ctx.headers)).json()["id"]
+    queues: List[asyncio.Queue] = [asyncio.Queue() for _ in range(subscribers)]
+    connected = 0
+
+    async def listen(queue: asyncio.Queue):
+        nonlocal connected
+        async with client.stream("GET", "/api/notifications/stream", params={"access_token": token}) as response:
+            connected += 1
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    queue.put_nowait((time.perf_counter(), json.loads(line[6:])))
+
+    listeners = [asyncio.create_task(listen(queue)) for queue in queues]
+    latencies, missed = [], 0
+    try:
+        while connected < subscribers:
+            await asyncio.sleep(0.05)
+        # Abonelik, yanıt başlıkları gönderildikten sonra kurulur; kısa bir pay bırakılır
+        await asyncio.sleep(0.5)
+        fanout_started = time.perf_counter()
+        for round_no in range(rounds):
+            title = f"sse-fanout-{round_no}-{time.time_ns()}"
+            started = time.perf_counter()
+            await client.post("/api/emirler", json={"title": title, "assigned_user_id": user_id}, headers=ctx.headers)
+            for queue in queues:
+                try:
+                    while True:
+                        received_at, payload = await asyncio.wait_for(queue.get(), timeout=10)
+                        if title in payload["message"]:
+                            latencies.append(received_at - started)
+                            break
+                except asyncio.TimeoutError:
+                    missed += 1
+        duration = time.perf_counter() - fanout_started
+    finally:
+        for listener in listeners:
+            listener.cancel()
+        await asyncio.gather(*listeners, return_exceptions=True)
+    return {"latencies": latencies, "errors": missed, "duration": duration, "subscribers": subscribers}
@@ -0,0 +1,158 @@
+# bench/seed.py
+# Ölçümler için istenen hacimde sentetik veri üretir. Aynı --seed ile her seferinde aynı veri oluşur.
+#
+#     python -m bench.seed --users 200 --work-orders 100000 --updates 2 --notifications 50
+#     python -m bench.seed --database-url postgresql+psycopg2://... --work-orders 1000000 --reset
+#
+# Tüm kullanıcıların şifresi aynıdır (varsayılan "bench"); kullanıcı adları user0001, user0002, ...
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+DEFAULT_DATABASE_URL = "sqlite:///./bench.db"
+BENCH_PASSWORD = "bench"
+
+WORDS = [
+    "kapı", "boya", "pompa", "arıza", "bakım", "elektrik", "su", "kaçak", "klima", "filtre",
+    "değişim", "kontrol", "aydınlatma", "şalter", "jeneratör", "asansör", "çatı", "izolasyon",
+    "kazan", "vana", "sigorta", "priz", "kamera", "yangın", "dolap", "cam", "zemin", "ısıtma",
+    "havalandırma", "motor", "kompresör", "kablo", "tesisat", "montaj", "onarım", "temizlik",
+]
+PRIORITIES = (("Düşük", 3), ("Normal", 6), ("Yüksek", 2))
+STATUSES = (("Pending", 4), ("In Progress", 3), ("Completed", 6), ("Cancelled", 1))
+
+def username(index: int) -> str:
+    return f"user{index:04d}"
+
+def _choice(rng: random.Random, weighted):
+    values, weights = zip(*weighted)
+    return rng.choices(values, weights)[0]
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+def _insert_chunks(connection, table, rows, chunk_size: int):
+    for start in range(0, len(rows), chunk_size):
+        connection.execute(table.insert(), rows[start:start + chunk_size])
+
+def _reset(database_url: str, models, engine):
+    if database_url.startswith("sqlite") and ":memory:" not in database_url:
+        engine.dispose()
+        path = database_url.split(":///", 1)[1]
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    else:
+        models.Base.metadata.drop_all(bind=engine)
+
+def seed(args):
+    os.environ["DATABASE_URL"] = args.database_url
+    from backend import models, stats
+    from backend.database import engine
+    from backend.hashing import get_password_hash
+    from backend.migrations import upgrade_schema
+    from backend.sequences import WORK_ORDER_NO
+
+    if args.reset:
+        _reset(args.database_url, models, engine)
+    upgrade_schema(engine)
+
+    with engine.connect() as connection:
+        if connection.execute(models.WorkOrder.__table__.select().limit(1)).first():
+            sys.exit("Veritabanı boş değil; baştan oluşturmak için --reset kullanın.")
+
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    hashed_password = get_password_hash(args.password)
+    started = time.perf_counter()
+
+    with engine.begin() as connection:
+        users = [
+            {"id": index, "username": username(index), "email": f"{username(index)}@example.com", "hashed_password": hashed_password}
+            for index in range(1, args.users + 1)
+        ]
+        _insert_chunks(connection, models.User.__table__, users, args.chunk_size)
+
+        update_id = 0
+        for start in range(1, args.work_orders + 1, args.chunk_size):
+            orders, updates = [], []
+            for work_order_id in range(start, min(start + args.chunk_size, args.work_orders + 1)):
+                created_at = now - timedelta(seconds=rng.randint(0, args.days * 86400))
+                updated_at = min(now, created_at + timedelta(seconds=rng.randint(0, 7 * 86400)))
+                orders.append({
+                    "id": work_order_id,
+                    "is_emri_no": "WO" + str(work_order_id).zfill(4),
+                    "title": _sentence(rng, 2, 5),
+                    "description": _sentence(rng, 5, 20),
+                    "priority": _choice(rng, PRIORITIES),
+                    "status": _choice(rng, STATUSES),
+                    "created_at": created_at,
+                    "updated_at": updated_at,
+                    "version": 1,
+                    "assigned_user_id": rng.randint(1, args.users) if args.users and rng.random() < 0.8 else None,
+                })
+                for _ in range(rng.randint(0, 2 * args.updates)):
+                    update_id += 1
+                    update_time = min(now, created_at + timedelta(seconds=rng.randint(0, 7 * 86400)))
+                    updates.append({
+                        "id": update_id,
+                        "work_order_id": work_order_id,
+                        "user_id": rng.randint(1, args.users) if args.users else None,
+                        "description": _sentence(rng, 3, 12),
+                        "created_at": update_time,
+                        "updated_at": update_time,
+                    })
+            connection.execute(models.WorkOrder.__table__.insert(), orders)
+            if updates:
+                connection.execute(models.WorkOrderUpdate.__table__.insert(), updates)
+
+        notifications = []
+        for user_id in range(1, args.users + 1):
+            for _ in range(args.notifications):
+                created_at = now - timedelta(seconds=rng.randint(0, args.days * 86400))
+                notifications.append({
+                    "user_id": user_id,
+                    "message": f"Size yeni bir iş emri atandı: {_sentence(rng, 2, 4)}",
+                    "is_read": rng.random() < 0.7,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                })
+        _insert_chunks(connection, models.Notification.__table__, notifications, args.chunk_size)
+
+        connection.execute(models.Counter.__table__.insert(), [{"name": WORK_ORDER_NO, "value": args.work_orders}])
+        stats.rebuild(connection)
+        if connection.dialect.name == "postgresql":
+            # id'ler elle verildiği için serial dizileri ileri alınır
+            for table in ("users", "work_orders", "work_order_updates"):
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+                ))
+
+    print(
+        f"{args.users} kullanıcı, {args.work_orders} iş emri, {update_id} güncelleme, "
+        f"{len(notifications)} bildirim {time.perf_counter() - started:.1f} sn'de oluşturuldu.",
+        file=sys.stderr,
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Ölçümler için sentetik veri üretir")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--work-orders", type=int, default=10000)
+    parser.add_argument("--updates", type=int, default=2, help="iş emri başına ortalama güncelleme")
+    parser.add_argument("--notifications", type=int, default=20, help="kullanıcı başına bildirim")
+    parser.add_argument("--days", type=int, default=180, help="oluşturulma tarihlerinin yayıldığı gün sayısı")
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--reset", action="store_true", help="mevcut veritabanını silip baştan oluştur")
+    seed(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# bench/serialization.py
+# İş emri listesi yanıtının serileştirme maliyeti: response_model yolu (Pydantic from_attributes
+# doğrulaması + dump_json, FastAPI'nin yaptığı gibi) ile serializers.py'deki hızlı yol karşılaştırılır.
+# Veritabanı kullanılmaz; ilişkileri doldurulmuş ORM nesneleri bellekte üretilir.
+#
+#     python -m bench.serialization --orders 10000 --updates 2 --repeat 10 -o serialization.json
+#
+# Ölçümden önce iki yolun ürettiği JSON'un aynı olduğu doğrulanır; farklıysa sıfırdan farklı kodla çıkar.
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Union
+
+from . import report
+from .seed import WORDS, username
+
+def build_orders(count: int, updates: int, users: int, seed: int):
+    from backend import models
+
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    people = [models.User(id=index, username=username(index), email=f"{username(index)}@example.com") for index in range(1, users + 1)]
+    orders = []
+    update_id = 0
+    for order_id in range(1, count + 1):
+        created_at = now - timedelta(seconds=rng.randint(0, 180 * 86400), microseconds=rng.randint(0, 999999))
+        assignee = rng.choice(people) if rng.random() < 0.8 else None
+        order = models.WorkOrder(
+            id=order_id,
+            is_emri_no="WO" + str(order_id).zfill(4),
+            title=" ".join(rng.choices(WORDS, k=3)),
+            description=" ".join(rng.choices(WORDS, k=12)),
+            priority=rng.choice(["Düşük", "Normal", "Yüksek"]),
+            status=rng.choice(["Pending", "In Progress", "Completed"]),
+            created_at=created_at,
+            updated_at=created_at,
+            version=1,
+            assigned_user_id=assignee.id if assignee else None,
+            assigned_to_user=assignee,
+        )
+        for _ in range(updates):
+            update_id += 1
+            author = rng.choice(people)
+            order.updates.append(models.WorkOrderUpdate(
+                id=update_id, work_order_id=order_id, description=" ".join(rng.choices(WORDS, k=6)),
+                created_at=created_at, updated_at=created_at, user_id=author.id, user=author,
+            ))
+        orders.append(order)
+    return orders
+
+def measure(function: Callable[[], bytes], repeat: int) -> dict:
+    latencies: List[float] = []
+    size = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call_started = time.perf_counter()
+        size = len(function())
+        latencies.append(time.perf_counter() - call_started)
+    return report.scenario_result(latencies, 0, time.perf_counter() - started, bytes=size)
+
+def main():
+    parser = argparse.ArgumentParser(description="Yanıt serileştirme yollarını karşılaştırır")
+    parser.add_argument("--orders", type=int, default=10000)
+    parser.add_argument("--updates", type=int, default=2, help="iş emri başına güncelleme")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args()
+
+    from pydantic import TypeAdapter
+    from backend import schemas, serializers
+
+    orders = build_orders(args.orders, args.updates, args.users, args.seed)
+    # isemri.get_work_orders ile aynı response_model ve exclude_unset ayarı
+    adapter = TypeAdapter(Union[schemas.WorkOrderPage, schemas.WorkOrderSummaryPage])
+
+    def response_model_path() -> bytes:
+        value = adapter.validate_python({"items": orders, "next_cursor": None})
+        return adapter.dump_json(value, exclude_unset=True)
+
+    def fast_path() -> bytes:
+        return serializers.dumps(serializers.work_order_page(orders, None))
+
+    def fast_path_stdlib() -> bytes:
+        content = serializers.work_order_page(orders, None)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=serializers._default).encode("utf-8")
+
+    if json.loads(response_model_path()) != json.loads(fast_path()):
+        sys.exit("Hızlı yolun çıktısı response_model çıktısından farklı; serializers.py şemayla uyumsuz")
+
+    scenarios = {"response_model": measure(response_model_path, args.repeat)}
+    if serializers.orjson is not None:
+        scenarios["fast_orjson"] = measure(fast_path, args.repeat)
+    scenarios["fast_stdlib_json"] = measure(fast_path_stdlib, args.repeat)
+    for name, result in scenarios.items():
+        print(f"{name}: p50 {result['latency_ms']['p50']} ms ({args.orders} iş emri)", file=sys.stderr)
+
+    report.write_report({
+        "meta": report.run_metadata(orders=args.orders, updates=args.updates, repeat=args.repeat, orjson=serializers.orjson is not None),
+        "scenarios": scenarios,
+    }, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# bench/targets.py
+# Ölçülen uygulama: aynı process içinde ASGI üzerinden ya da ayrı bir uvicorn process'i olarak.
+# Ortam değişkenleri (DATABASE_URL, PASSWORD_HASH_WORKERS, ...) backend import edilmeden önce verilmelidir.
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, Optional
+
+import httpx
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class AsgiTarget:
+    # İstemci ile uygulama aynı event loop'ta çalışır; ağ maliyeti olmadan uygulamanın kendisi ölçülür.
+    # SQL sayacı ve event loop gecikmesi yalnızca bu hedefte ölçülebilir.
+    name = "asgi"
+    base_url = "http://bench"
+    in_process = True
+
+    def __init__(self, env: Dict[str, str]):
+        os.environ.update(env)
+        from backend.main import app
+
+        self.app = app
+        self._lifespan = None
+
+    async def __aenter__(self):
+        self._lifespan = self.app.router.lifespan_context(self.app)
+        await self._lifespan.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._lifespan.__aexit__(*exc_info)
+
+    def client(self, **kwargs) -> httpx.AsyncClient:
+        transport = httpx.ASGITransport(app=self.app)
+        return httpx.AsyncClient(transport=transport, base_url=self.base_url, timeout=60, **kwargs)
+
+class UvicornTarget:
+    # Gerçek HTTP yığını ve birden fazla worker ile ölçüm; SSE gibi akış senaryoları yalnızca burada çalışır
+    name = "uvicorn"
+    in_process = False
+
+    # app_dir başka bir checkout'u (ör. git worktree ile açılmış eski bir commit) gösterebilir;
+    # böylece aynı ölçüm betiğiyle eski ve yeni sürüm karşılaştırılır
+    def __init__(self, env: Dict[str, str], port: int = 8765, workers: int = 1, app_dir: str = REPO_ROOT):
+        # Göreli sqlite yolları ölçümü başlatan dizine göre çözülsün diye process aynı dizinde açılır
+        python_path = os.pathsep.join(filter(None, [app_dir, os.environ.get("PYTHONPATH")]))
+        self.env = {**os.environ, **env, "PYTHONPATH": python_path}
+        self.port = port
+        self.workers = workers
+        self.app_dir = app_dir
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.process: Optional[subprocess.Popen] = None
+
+    async def __aenter__(self):
+        command = [
+            sys.executable, "-m", "uvicorn", "backend.main:app", "--app-dir", self.app_dir,
+            "--host", "127.0.0.1", "--port", str(self.port),
+            "--workers", str(self.workers), "--log-level", "warning",
+        ]
+        self.process = subprocess.Popen(command, env=self.env)
+        deadline = time.monotonic() + 60
+        async with httpx.AsyncClient(base_url=self.base_url) as client:
+            while time.monotonic() < deadline:
+                if self.process.poll() is not None:
+                    raise RuntimeError("uvicorn başlatılamadı")
+                try:
+                    if (await client.get("/")).status_code == 200:
+                        return self
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.2)
+        await self.__aexit__(None, None, None)
+        raise RuntimeError("uvicorn zamanında hazır olmadı")
+
+    async def __aexit__(self, *exc_info):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def client(self, **kwargs) -> httpx.AsyncClient:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        return httpx.AsyncClient(base_url=self.base_url, timeout=60, limits=limits, **kwargs)
@@ -59,5 +59,11 @@
       }
     );
 
+    // Idempotency-Key: zaman aşımından sonra tekrar gönderilen form sunucuda ikinci kez işlenmez,
+    // ilk yanıt döner. Anahtar her yeni gönderim için bir kez üretilir ve başarılı olana kadar
+    // (veya form değişene kadar) aynı kalmalıdır.
+    export const yeniIstekAnahtari = () =>
+      `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}${Math.random().toString(36).slice(2)}`;
+
     export default api;
     
\ No newline at end of file
@@ -1,11 +1,43 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { View, Text, Pressable, StyleSheet } from 'react-native';
+import api from '../lib/api';
+
+const DURUM_ETIKETLERI = {
+  Pending: 'Bekleyen',
+  'In Progress': 'Devam Eden',
+  Completed: 'Tamamlanan',
+  Cancelled: 'İptal',
+};
 
 export default function Dashboard({ onNavigate }) {
+  const [istatistik, setIstatistik] = useState(null);
+
+  // Sayılar sunucuda hazır tutulur; tüm iş emirlerini indirmeye gerek yok
+  useEffect(() => {
+    api.get('/api/emirler/stats')
+      .then((res) => setIstatistik(res.data))
+      .catch((err) => console.error('İstatistikler alınamadı:', err.response?.data || err.message));
+  }, []);
+
   return (
     <View style={styles.container}>
       <Text style={styles.title}>Hoş Geldiniz!</Text>
       <Text style={styles.subtitle}>İşlemlerinize başlamak için aşağıdaki menüyü kullanın.</Text>
+
+      {istatistik && (
+        <View style={styles.statRow}>
+          <View style={styles.statBox}>
+            <Text style={styles.statValue}>{istatistik.total}</Text>
+            <Text style={styles.statLabel}>Toplam</Text>
+          </View>
+          {Object.entries(istatistik.by_status).map(([durum, sayi]) => (
+            <View key={durum} style={styles.statBox}>
+              <Text style={styles.statValue}>{sayi}</Text>
+              <Text style={styles.statLabel}>{DURUM_ETIKETLERI[durum] || durum}</Text>
+            </View>
+          ))}
+        </View>
+      )}
       
       <View style={styles.buttonGroup}>
         <Pressable
@@ -45,6 +77,30 @@ const styles = StyleSheet.create({
     textAlign: 'center',
     marginBottom: 30,
   },
+  statRow: {
+    flexDirection: 'row',
+    flexWrap: 'wrap',
+    justifyContent: 'center',
+    gap: 10,
+    marginBottom: 30,
+  },
+  statBox: {
+    backgroundColor: '#FFFFFF',
+    paddingVertical: 10,
+    paddingHorizontal: 16,
+    borderRadius: 8,
+    alignItems: 'center',
+    minWidth: 80,
+  },
+  statValue: {
+    fontSize: 22,
+    fontWeight: 'bold',
+    color: '#374151',
+  },
+  statLabel: {
+    fontSize: 13,
+    color: '#6B7280',
+  },
   buttonGroup: {
     flexDirection: 'column',
     gap: 15, // Düğmeler arasında boşluk
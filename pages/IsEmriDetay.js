@@ -1,7 +1,7 @@
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import { View, Text, StyleSheet, Pressable, ScrollView, ActivityIndicator, Alert, TextInput } from "react-native";
 import AsyncStorage from "@react-native-async-storage/async-storage"; // AsyncStorage importu
-import api from "../lib/api";
+import api, { yeniIstekAnahtari } from "../lib/api";
 
 export default function IsEmriDetay({ workOrderId, onNavigate, onMessage }) {
   const [emir, setEmir] = useState(null);
@@ -10,6 +10,8 @@ export default function IsEmriDetay({ workOrderId, onNavigate, onMessage }) {
 
   const [newUpdate, setNewUpdate] = useState("");
   const [isAddingUpdate, setIsAddingUpdate] = useState(false);
+  // Aynı güncellemenin tekrarları aynı anahtarı taşır; sunucu kaydı ikinci kez eklemez
+  const guncellemeAnahtari = useRef(yeniIstekAnahtari());
 
   const [editingUpdateId, setEditingUpdateId] = useState(null);
   const [editUpdateText, setEditUpdateText] = useState("");
@@ -54,11 +56,13 @@ export default function IsEmriDetay({ workOrderId, onNavigate, onMessage }) {
         {
           headers: {
             Authorization: `Bearer ${token}`,
+            "Idempotency-Key": guncellemeAnahtari.current,
           },
         }
       );
 
       onMessage("Güncelleme başarıyla eklendi!", "success");
+      guncellemeAnahtari.current = yeniIstekAnahtari();
       setNewUpdate("");
       await veriGetir();
     } catch (err) {
@@ -181,7 +185,10 @@ export default function IsEmriDetay({ workOrderId, onNavigate, onMessage }) {
           <TextInput
             style={[styles.input, styles.textArea]}
             value={newUpdate}
-            onChangeText={setNewUpdate}
+            onChangeText={(text) => {
+              guncellemeAnahtari.current = yeniIstekAnahtari();
+              setNewUpdate(text);
+            }}
             placeholder="Güncelleme notlarınızı buraya yazın..."
             multiline
             numberOfLines={3}
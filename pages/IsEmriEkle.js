@@ -1,7 +1,7 @@
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import { View, Text, TextInput, Pressable, StyleSheet, ActivityIndicator, ScrollView, Dimensions } from "react-native";
 import { Picker } from '@react-native-picker/picker'; // Picker bileşeni için import
-import api from "../lib/api"; // Axios API istemciniz
+import api, { yeniIstekAnahtari } from "../lib/api"; // Axios API istemciniz
 
 // Ekran boyutlarını almak için Dimensions API'yi kullanıyoruz
 const { width } = Dimensions.get('window');
@@ -19,6 +19,8 @@ export default function IsEmriEkle({ onNavigate, onMessage }) {
   const [users, setUsers] = useState([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  // Aynı gönderimin tekrarları aynı anahtarı taşır; sunucu çift iş emri oluşturmaz
+  const istekAnahtari = useRef(yeniIstekAnahtari());
 
   useEffect(() => {
     setLoadingUsers(true);
@@ -40,6 +42,7 @@ export default function IsEmriEkle({ onNavigate, onMessage }) {
   }, []);
 
   const handleChange = (name, value) => {
+    istekAnahtari.current = yeniIstekAnahtari();
     setForm(prevForm => ({
       ...prevForm,
       [name]: value === "" ? null : value, // Boş string yerine null atama
@@ -51,7 +54,8 @@ export default function IsEmriEkle({ onNavigate, onMessage }) {
     setError(null);
 
     try {
-      await api.post("/api/emirler", form);
+      await api.post("/api/emirler", form, { headers: { "Idempotency-Key": istekAnahtari.current } });
+      istekAnahtari.current = yeniIstekAnahtari();
       onMessage("Yeni iş emri başarıyla eklendi!", "success");
       onNavigate('IsEmriListesi');
     } catch (error) {
@@ -2,17 +2,35 @@ import React, { useEffect, useState } from "react";
 import { View, Text, Pressable, StyleSheet, ScrollView, ActivityIndicator, Alert, Platform } from "react-native"; // Platform import edildi
 import api from "../lib/api";
 
+// Sayfalar arası geçişte liste korunur; geri dönüldüğünde yalnızca değişenler indirilir
+let onbellek = null;
+
+const siralama = (a, b) => (a.created_at < b.created_at ? 1 : a.created_at > b.created_at ? -1 : b.id - a.id);
+
 export default function IsEmriListesi({ onNavigate, onMessage }) {
-  const [emirler, setEmirler] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const [emirler, setEmirler] = useState(onbellek?.emirler || []);
+  const [loading, setLoading] = useState(!onbellek);
   const [error, setError] = useState(null);
+  const [nextCursor, setNextCursor] = useState(onbellek?.nextCursor || null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [syncToken, setSyncToken] = useState(onbellek?.syncToken || null);
+
+  const SAYFA_BOYUTU = 50;
+
+  useEffect(() => {
+    onbellek = { emirler, nextCursor, syncToken };
+  }, [emirler, nextCursor, syncToken]);
 
   const veriGetir = async () => {
     setLoading(true);
     setError(null);
     try {
-      const res = await api.get("/api/emirler");
-      setEmirler(res.data);
+      // Token listeden önce alınır ki arada yapılan değişiklikler kaçmasın
+      const tokenRes = await api.get("/api/sync/token");
+      const res = await api.get("/api/emirler", { params: { limit: SAYFA_BOYUTU } });
+      setEmirler(res.data.items);
+      setNextCursor(res.data.next_cursor);
+      setSyncToken(tokenRes.data.token);
     } catch (err) {
       console.error("Veri alınamadı:", err.response?.data || err.message);
       onMessage(err.response?.data?.detail || err.message || "İş emirleri yüklenirken bir hata oluştu.", "error");
@@ -22,8 +40,68 @@ export default function IsEmriListesi({ onNavigate, onMessage }) {
     }
   };
 
+  // Yenileme: son token'dan sonra değişen iş emirleri yerel listeye işlenir
+  const senkronizeEt = async () => {
+    if (!syncToken) return veriGetir();
+    try {
+      let token = syncToken;
+      let degisen = [];
+      let silinen = new Map();
+      let devam = true;
+      while (devam) {
+        const res = await api.get("/api/sync", { params: { since: token } });
+        degisen = degisen.concat(res.data.work_orders);
+        res.data.deleted
+          .filter((kayit) => kayit.entity === "work_order")
+          .forEach((kayit) => silinen.set(kayit.entity_id, kayit.deleted_at));
+        token = res.data.next_token;
+        devam = res.data.has_more;
+      }
+      setEmirler((onceki) => {
+        const harita = new Map(onceki.map((e) => [e.id, e]));
+        const enEski = onceki.length ? onceki[onceki.length - 1] : null;
+        degisen.forEach((e) => {
+          // Henüz yüklenmemiş sayfalara düşen kayıtlar "Daha Fazla Yükle" ile gelir
+          if (harita.has(e.id) || !nextCursor || !enEski || siralama(e, enEski) <= 0) {
+            harita.set(e.id, { ...harita.get(e.id), ...e });
+          }
+        });
+        // SQLite silinen id'yi yeniden kullanabilir; silmeden sonra oluşan kayıt korunur
+        silinen.forEach((silinmeZamani, id) => {
+          const emir = harita.get(id);
+          if (emir && emir.updated_at <= silinmeZamani) harita.delete(id);
+        });
+        return Array.from(harita.values()).sort(siralama);
+      });
+      setSyncToken(token);
+    } catch (err) {
+      console.error("Senkronizasyon hatası:", err.response?.data || err.message);
+      onMessage(err.response?.data?.detail || err.message || "İş emirleri yenilenemedi.", "error");
+    }
+  };
+
+  // Sonraki sayfayı imleç ile yükle
+  const dahaFazlaGetir = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const res = await api.get("/api/emirler", { params: { limit: SAYFA_BOYUTU, cursor: nextCursor } });
+      setEmirler((onceki) => [...onceki, ...res.data.items]);
+      setNextCursor(res.data.next_cursor);
+    } catch (err) {
+      console.error("Veri alınamadı:", err.response?.data || err.message);
+      onMessage(err.response?.data?.detail || err.message || "İş emirleri yüklenirken bir hata oluştu.", "error");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
-    veriGetir();
+    if (onbellek?.syncToken) {
+      senkronizeEt();
+    } else {
+      veriGetir();
+    }
   }, []);
 
   const handleSil = (id) => {
@@ -119,6 +197,10 @@ export default function IsEmriListesi({ onNavigate, onMessage }) {
         <Text style={styles.createButtonText}>+ Yeni İş Emri Oluştur</Text>
       </Pressable>
 
+      <Pressable onPress={senkronizeEt} style={styles.refreshButton}>
+        <Text style={styles.refreshButtonText}>Yenile</Text>
+      </Pressable>
+
       {loading ? (
         <View style={styles.loadingContainer}>
           <ActivityIndicator size="large" color="#2563EB" />
@@ -199,6 +281,19 @@ export default function IsEmriListesi({ onNavigate, onMessage }) {
               </View>
             </Pressable>
           ))}
+          {nextCursor && (
+            <Pressable
+              onPress={dahaFazlaGetir}
+              style={styles.loadMoreButton}
+              disabled={loadingMore}
+            >
+              {loadingMore ? (
+                <ActivityIndicator size="small" color="#2563EB" />
+              ) : (
+                <Text style={styles.loadMoreButtonText}>Daha Fazla Yükle</Text>
+              )}
+            </Pressable>
+          )}
         </ScrollView>
       )}
     </View>
@@ -236,6 +331,18 @@ const styles = StyleSheet.create({
     fontSize: 16,
     fontWeight: '600',
   },
+  refreshButton: {
+    alignSelf: 'flex-end',
+    paddingVertical: 6,
+    paddingHorizontal: 12,
+    marginTop: -12,
+    marginBottom: 12,
+  },
+  refreshButtonText: {
+    color: '#2563EB',
+    fontSize: 14,
+    fontWeight: '600',
+  },
   loadingContainer: {
     flex: 1,
     justifyContent: 'center',
@@ -422,6 +529,17 @@ const styles = StyleSheet.create({
     color: '#B91C1C', // text-red-700
     fontSize: 14,
   },
+  loadMoreButton: {
+    backgroundColor: '#DBEAFE', // bg-blue-100
+    paddingVertical: 12,
+    borderRadius: 8,
+    alignItems: 'center',
+  },
+  loadMoreButtonText: {
+    color: '#1D4ED8', // text-blue-700
+    fontSize: 16,
+    fontWeight: '600',
+  },
   // Durum renkleri
   statusPending: { backgroundColor: '#FEF3C7', color: '#B45309' }, // bg-yellow-100 text-yellow-800
   statusInProgress: { backgroundColor: '#DBEAFE', color: '#1D4ED8' }, // bg-blue-100 text-blue-800
@@ -0,0 +1,73 @@
+# tests/conftest.py
+# Testler geçici bir SQLite veritabanı üzerinde, uygulamaya ASGI üzerinden (httpx) istek göndererek
+# çalışır. Ortam değişkenleri backend import edilmeden önce verilmelidir (bkz. backend/config.py).
+#
+#     pip install -r backend/requirements.txt pytest
+#     python -m pytest -q
+
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+
+DATABASE_DIR = tempfile.mkdtemp(prefix="icom-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_DIR}/test.db"
+# Şifre hashleme testlerde process havuzu yerine thread havuzunda çalışır
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from backend.database import async_engine
+from backend.main import app as asgi_app
+
+PASSWORD = "test-password"
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(scope="session")
+async def app(anyio_backend):
+    async with asgi_app.router.lifespan_context(asgi_app):
+        yield asgi_app
+
+@pytest.fixture(scope="session")
+async def client(app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=30) as client:
+        yield client
+
+async def create_user(client: httpx.AsyncClient) -> dict:
+    name = f"test-{uuid.uuid4().hex[:12]}"
+    response = await client.post("/api/register", json={"username": name, "email": f"{name}@example.com", "password": PASSWORD})
+    assert response.status_code == 201, response.text
+    response = await client.post("/api/login", data={"username": name, "password": PASSWORD})
+    token = response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    me = (await client.get("/api/users/me", headers=headers)).json()
+    return {"id": me["id"], "username": name, "token": token, "headers": headers}
+
+# Her test kendi kullanıcısıyla çalışır; sayaçlar ve bildirimler testler arasında karışmaz
+@pytest.fixture
+async def user(client):
+    return await create_user(client)
+
+# Blok içinde veritabanına gönderilen SQL ifadelerini toplar:
+#     with capture_statements() as statements: ...
+@pytest.fixture
+def capture_statements():
+    return _capture_statements
+
+@contextmanager
+def _capture_statements():
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", on_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", on_execute)
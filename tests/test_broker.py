@@ -0,0 +1,119 @@
+# tests/test_broker.py
+# Anlık bildirim dağıtımı: aracının tüm abonelere iletmesi ve /api/notifications/stream akışının
+# çok sayıda eşzamanlı bağlantıda her aboneye bildirimi ulaştırması (bkz. broker.py, notifications.py).
+
+import asyncio
+import json
+import time
+from contextlib import AsyncExitStack
+
+import pytest
+
+from backend.broker import Broker, InMemoryBroker, get_broker
+from backend.notifications import user_channel
+
+pytestmark = pytest.mark.anyio
+
+SUBSCRIBERS = 200
+STREAMS = 50
+# Oluşturma isteğinin başından son aboneye ulaşana kadar geçen süre için üst sınır
+DELIVERY_TIMEOUT_SECONDS = 5
+
+def test_broker_is_abstract():
+    with pytest.raises(TypeError):
+        Broker()
+
+async def test_in_memory_broker_delivers_to_every_subscriber():
+    broker = InMemoryBroker(queue_size=10)
+    async with AsyncExitStack() as stack:
+        queues = [await stack.enter_async_context(broker.subscribe("kanal")) for _ in range(SUBSCRIBERS)]
+        other = await stack.enter_async_context(broker.subscribe("başka kanal"))
+        assert broker.subscriber_count("kanal") == SUBSCRIBERS
+
+        broker.publish("kanal", {"id": 1})
+
+        assert all(queue.get_nowait() == {"id": 1} for queue in queues)
+        assert other.empty()
+    assert broker.subscriber_count("kanal") == 0
+
+async def test_in_memory_broker_drops_oldest_for_slow_subscriber():
+    broker = InMemoryBroker(queue_size=2)
+    async with broker.subscribe("kanal") as queue:
+        for index in range(4):
+            broker.publish("kanal", {"id": index})
+        assert [queue.get_nowait(), queue.get_nowait()] == [{"id": 2}, {"id": 3}]
+
+# httpx'in ASGITransport'u yanıtın tamamını beklediği için sonsuz SSE akışı uygulamaya doğrudan
+# ASGI üzerinden açılır; gelen parçalar sırayla okunur, bitince istemci bağlantıyı keser.
+class EventStream:
+    def __init__(self, app, token: str):
+        self.app = app
+        self.token = token
+        self.chunks: asyncio.Queue = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.buffer = ""
+        self.task = None
+
+    def open(self):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": "/api/notifications/stream", "raw_path": b"/api/notifications/stream", "root_path": "",
+            "query_string": b"", "client": ("127.0.0.1", 50000), "server": ("test", 80),
+            "headers": [(b"host", b"test"), (b"authorization", f"Bearer {self.token}".encode())],
+        }
+        self.task = asyncio.create_task(self.app(scope, self._receive, self._send))
+
+    async def _receive(self):
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+        elif message["type"] == "http.response.body" and message.get("body"):
+            self.chunks.put_nowait(message["body"].decode())
+
+    async def next_event(self) -> dict:
+        while "\n\n" not in self.buffer:
+            self.buffer += await self.chunks.get()
+        event, self.buffer = self.buffer.split("\n\n", 1)
+        if event.startswith(":"):
+            return await self.next_event()
+        fields = dict(line.split(": ", 1) for line in event.splitlines())
+        return {"id": fields["id"], "received_at": time.perf_counter(), **json.loads(fields["data"])}
+
+    async def close(self):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, timeout=DELIVERY_TIMEOUT_SECONDS)
+
+async def wait_for_subscribers(channel: str, count: int):
+    async def poll():
+        while get_broker().subscriber_count(channel) < count:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout=DELIVERY_TIMEOUT_SECONDS)
+
+async def test_stream_delivers_to_many_concurrent_subscribers(app, client, user):
+    streams = [EventStream(app, user["token"]) for _ in range(STREAMS)]
+    for stream in streams:
+        stream.open()
+    try:
+        await wait_for_subscribers(user_channel(user["id"]), STREAMS)
+
+        started = time.perf_counter()
+        response = await client.post("/api/emirler", json={"title": "akış testi", "assigned_user_id": user["id"]}, headers=user["headers"])
+        assert response.status_code == 201, response.text
+        is_emri_no = response.json()["is_emri_no"]
+
+        events = await asyncio.wait_for(
+            asyncio.gather(*(stream.next_event() for stream in streams)), timeout=DELIVERY_TIMEOUT_SECONDS
+        )
+    finally:
+        for stream in streams:
+            await stream.close()
+
+    assert len(events) == STREAMS
+    assert all(event["user_id"] == user["id"] and is_emri_no in event["message"] for event in events)
+    assert len({event["id"] for event in events}) == 1
+    latencies = sorted(event["received_at"] - started for event in events)
+    assert latencies[-1] < DELIVERY_TIMEOUT_SECONDS, latencies
+    assert get_broker().subscriber_count(user_channel(user["id"])) == 0
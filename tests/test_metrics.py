@@ -0,0 +1,62 @@
+# tests/test_metrics.py
+# İstek metrikleri: yalnızca yanıt gönderilene kadarki iş sayılır (yanıttan sonra çalışan arka plan
+# görevleri, ör. outbox'ın boşaltılması, istek süresine ve SQL sayısına eklenmez) ve hızlı yoldaki
+# JSON'a çevirme serileştirme süresine dahildir.
+
+import time
+
+import pytest
+
+from backend import config, metrics, serializers
+
+pytestmark = pytest.mark.anyio
+
+ROUTE = ("POST", "/api/emirler")
+
+def observed_sql_statements() -> float:
+    series = metrics.REQUEST_SQL_STATEMENTS._values.get(ROUTE)
+    return series[-2] if series else 0
+
+async def create_and_measure(client, capture_statements, headers, body):
+    before = observed_sql_statements()
+    with capture_statements() as statements:
+        response = await client.post("/api/emirler", json=body, headers=headers)
+    assert response.status_code == 201, response.text
+    return observed_sql_statements() - before, len(statements)
+
+async def test_background_tasks_are_not_counted_in_request_sql(client, user, capture_statements):
+    headers = user["headers"]
+    # İlk istek kullanıcıyı önbelleğe alır; karşılaştırılan istekler aynı koşulda çalışsın
+    await create_and_measure(client, capture_statements, headers, {"title": "metrik"})
+    unassigned, unassigned_total = await create_and_measure(client, capture_statements, headers, {"title": "metrik"})
+    assigned, assigned_total = await create_and_measure(
+        client, capture_statements, headers, {"title": "metrik", "assigned_user_id": user["id"]}
+    )
+
+    # Atamasız istekte arka plan işi yoktur; sayılan her ifade isteğe aittir
+    assert unassigned == unassigned_total
+    # Atamada outbox'a yazılan olay isteğe, bildirimi oluşturan boşaltma ise yanıttan sonraya aittir
+    assert assigned == unassigned + 1
+    assert assigned_total > assigned
+    unread = (await client.get("/api/notifications/unread_count", headers=headers)).json()["unread_count"]
+    assert unread == 1
+
+# Hızlı yolda JSON endpoint içinde üretilir; JSON'a çevirme süresi yine serileştirme histogramına düşmeli
+async def test_fast_json_encoding_is_counted_as_serialization(client, user, monkeypatch):
+    monkeypatch.setattr(config, "FAST_JSON_RESPONSES", True)
+    dumps = serializers.dumps
+    delay = 0.05
+
+    def slow_dumps(content):
+        time.sleep(delay)
+        return dumps(content)
+
+    monkeypatch.setattr(serializers, "dumps", slow_dumps)
+    labels = ("GET", "/api/emirler")
+    before = list(metrics.SERIALIZATION_DURATION._values.get(labels, [0, 0]))
+    response = await client.get("/api/emirler", params={"limit": 5}, headers=user["headers"])
+    after = metrics.SERIALIZATION_DURATION._values[labels]
+
+    assert response.status_code == 200
+    assert after[-1] == before[-1] + 1
+    assert after[-2] - before[-2] >= delay
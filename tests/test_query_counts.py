@@ -0,0 +1,58 @@
+# tests/test_query_counts.py
+# Liste ve detay uç noktalarında istek başına SQL ifadesi sayısı iş emri ve güncelleme sayısından
+# bağımsız olmalıdır (N+1 lazy load geri gelmesin). Sayılan ifadeler:
+#   liste: kullanıcı (önbellekte yoksa), koleksiyon sürümü, iş emirleri + atanan kişi, güncellemeler + yazanları
+#   detay: kullanıcı (önbellekte yoksa), ETag için sürüm, iş emri + atanan kişi, güncellemeler + yazanları
+
+import pytest
+
+from backend import config
+
+pytestmark = pytest.mark.anyio
+
+LIST_MAX_STATEMENTS = 4
+DETAIL_MAX_STATEMENTS = 4
+
+async def create_orders(client, user, count: int, updates_per_order: int):
+    items = [{"title": f"sorgu sayısı {index}", "assigned_user_id": user["id"]} for index in range(count)]
+    response = await client.post("/api/emirler/bulk", json={"items": items}, headers=user["headers"])
+    assert response.status_code == 200, response.text
+    ids = [result["id"] for result in response.json()["results"]]
+    for work_order_id in ids:
+        for index in range(updates_per_order):
+            response = await client.post(
+                f"/api/emirler/{work_order_id}/updates", json={"description": f"not {index}"}, headers=user["headers"]
+            )
+            assert response.status_code == 201, response.text
+    return ids
+
+@pytest.fixture(params=[True, False], ids=["fast-json", "pydantic"])
+def fast_json(request, monkeypatch):
+    monkeypatch.setattr(config, "FAST_JSON_RESPONSES", request.param)
+    return request.param
+
+@pytest.mark.parametrize("count, updates_per_order", [(1, 0), (5, 1), (40, 3)])
+async def test_list_statement_count_is_bounded(client, user, fast_json, capture_statements, count, updates_per_order):
+    await create_orders(client, user, count, updates_per_order)
+
+    with capture_statements() as statements:
+        response = await client.get("/api/emirler", params={"assigned_user_id": user["id"], "limit": 100}, headers=user["headers"])
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == count
+    assert all(len(item["updates"]) == updates_per_order for item in items)
+    assert len(statements) <= LIST_MAX_STATEMENTS, statements
+
+@pytest.mark.parametrize("updates_per_order", [0, 1, 25])
+async def test_detail_statement_count_is_bounded(client, user, fast_json, capture_statements, updates_per_order):
+    work_order_id = (await create_orders(client, user, 1, updates_per_order))[0]
+
+    with capture_statements() as statements:
+        response = await client.get(f"/api/emirler/{work_order_id}", headers=user["headers"])
+
+    assert response.status_code == 200
+    detail = response.json()
+    assert len(detail["updates"]) == updates_per_order
+    assert detail["assigned_to_user"]["id"] == user["id"]
+    assert len(statements) <= DETAIL_MAX_STATEMENTS, statements
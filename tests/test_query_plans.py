@@ -0,0 +1,26 @@
+# tests/test_query_plans.py
+# Router sorgularının hiçbiri büyük bir tabloyu baştan sona taramamalıdır (bkz. bench/query_plans.py).
+# Kontrol, ayrı bir process'te kendi seed edilmiş veritabanı üzerinde çalışır; test veritabanındaki
+# kullanıcılar ve iş emirleri ölçüm betiğinin beklediği veriyle aynı değildir.
+
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_module(module: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", module, *args], cwd=REPO_ROOT, capture_output=True, text=True, timeout=600,
+    )
+
+def test_router_queries_use_indexes(tmp_path):
+    database_url = f"sqlite:///{tmp_path}/plans.db"
+    seeded = run_module("bench.seed", "--database-url", database_url, "--users", "20",
+                        "--work-orders", "5000", "--updates", "2", "--notifications", "30", "--reset")
+    assert seeded.returncode == 0, seeded.stderr
+
+    checked = run_module("bench.query_plans", "--database-url", database_url)
+
+    assert checked.returncode == 0, checked.stderr
+    assert "0 tanesi tam tarama yapıyor" in checked.stderr
@@ -0,0 +1,44 @@
+# tests/test_search.py
+# Arama sayfaları birbirini tamamlamalıdır: her eşleşen iş emri tam olarak bir sayfada görünür.
+# Çok sayıda güncellemesi eşleşen bir iş emri diğer eşleşmelerin yerini almamalıdır (bkz. search.py).
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+QUERY = "kavitasyon"
+PAGE_SIZE = 4
+
+async def create_order(client, headers, title: str, updates: int = 0) -> int:
+    response = await client.post("/api/emirler", json={"title": title}, headers=headers)
+    assert response.status_code == 201, response.text
+    work_order_id = response.json()["id"]
+    for index in range(updates):
+        response = await client.post(
+            f"/api/emirler/{work_order_id}/updates", json={"description": f"{QUERY} sesi {index}"}, headers=headers
+        )
+        assert response.status_code == 201, response.text
+    return work_order_id
+
+async def test_search_pages_do_not_repeat_or_skip_matches(client, user):
+    headers = user["headers"]
+    noisy = await create_order(client, headers, "pompa dairesi", updates=30)
+    by_title = [await create_order(client, headers, f"{QUERY} kontrolü {index}") for index in range(6)]
+    by_update = [await create_order(client, headers, f"vana {index}", updates=1) for index in range(5)]
+    await create_order(client, headers, "ilgisiz iş emri", updates=0)
+
+    seen, pages, offset = [], [], 0
+    while offset is not None:
+        response = await client.get("/api/emirler/search", params={"q": QUERY, "limit": PAGE_SIZE, "offset": offset}, headers=headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        pages.append(len(page["items"]))
+        seen += [item["id"] for item in page["items"]]
+        offset = page["next_offset"]
+
+    expected = {noisy, *by_title, *by_update}
+    assert len(seen) == len(set(seen)), "aynı iş emri birden fazla sayfada döndü"
+    assert set(seen) == expected
+    assert all(size == PAGE_SIZE for size in pages[:-1]), pages
+    # Başlıkta eşleşenler yalnızca güncellemelerinde eşleşenlerden önce gelir
+    assert set(seen[:len(by_title)]) == set(by_title)
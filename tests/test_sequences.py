@@ -0,0 +1,68 @@
+# tests/test_sequences.py
+# İş emri numaraları eşzamanlı isteklerde de tekil ve boşluksuz olmalıdır (bkz. sequences.py).
+
+import asyncio
+
+import pytest
+
+from backend.database import AsyncSessionLocal
+from backend.sequences import allocate_work_order_numbers
+
+pytestmark = pytest.mark.anyio
+
+def as_numbers(values):
+    return sorted(int(value[2:]) for value in values)
+
+def assert_contiguous(values):
+    numbers = as_numbers(values)
+    assert len(set(numbers)) == len(numbers), "aynı numara birden fazla kez verildi"
+    assert numbers == list(range(numbers[0], numbers[0] + len(numbers))), "numaralarda boşluk var"
+
+async def allocate_in_own_transaction(count: int, commit: bool = True):
+    async with AsyncSessionLocal() as db:
+        numbers = await allocate_work_order_numbers(db, count)
+        if commit:
+            await db.commit()
+        else:
+            await db.rollback()
+        return numbers
+
+async def test_concurrent_allocations_are_unique_and_contiguous(app):
+    counts = [1] * 20 + [5, 3, 10]
+    results = await asyncio.gather(*(allocate_in_own_transaction(count) for count in counts))
+
+    for numbers, count in zip(results, counts):
+        assert len(numbers) == count
+        assert_contiguous(numbers)
+    assert_contiguous([number for numbers in results for number in numbers])
+
+async def test_rolled_back_allocation_is_reused(app):
+    last = (await allocate_in_own_transaction(1))[0]
+    await allocate_in_own_transaction(3, commit=False)
+
+    assert as_numbers(await allocate_in_own_transaction(1)) == [int(last[2:]) + 1]
+
+async def test_parallel_creates_get_unique_gap_free_numbers(client, user):
+    headers = user["headers"]
+    before = await client.post("/api/emirler", json={"title": "numara öncesi"}, headers=headers)
+
+    async def create(index: int):
+        response = await client.post("/api/emirler", json={"title": f"paralel {index}", "assigned_user_id": user["id"]}, headers=headers)
+        assert response.status_code == 201, response.text
+        return [response.json()["is_emri_no"]]
+
+    async def bulk_create(size: int):
+        items = [{"title": f"toplu {index}"} for index in range(size)]
+        response = await client.post("/api/emirler/bulk", json={"items": items}, headers=headers)
+        assert response.status_code == 200, response.text
+        return [result["is_emri_no"] for result in response.json()["results"]]
+
+    results = await asyncio.gather(*[create(index) for index in range(15)], bulk_create(10), bulk_create(4))
+    after = await client.post("/api/emirler", json={"title": "numara sonrası"}, headers=headers)
+
+    numbers = [before.json()["is_emri_no"]] + [number for numbers in results for number in numbers] + [after.json()["is_emri_no"]]
+    assert len(numbers) == 1 + 15 + 10 + 4 + 1
+    assert_contiguous(numbers)
+    # Toplu istekteki numaralar kendi içinde de ardışıktır
+    assert_contiguous(results[-2])
+    assert_contiguous(results[-1])
@@ -0,0 +1,39 @@
+# tests/test_serializers.py
+# Hızlı yoldaki dict'ler, aynı satır için Pydantic şemasının ürettiği JSON'un aynısı olmalıdır (bkz. serializers.py).
+
+import json
+
+import pytest
+from sqlalchemy import select
+
+from backend import models, schemas, serializers
+from backend.database import AsyncSessionLocal
+from backend.isemri import WORK_ORDER_OUT_OPTIONS
+
+pytestmark = pytest.mark.anyio
+
+def fast_json(content):
+    return json.loads(serializers.dumps(content))
+
+async def load_work_order(work_order_id: int) -> models.WorkOrder:
+    async with AsyncSessionLocal() as db:
+        query = select(models.WorkOrder).options(*WORK_ORDER_OUT_OPTIONS).where(models.WorkOrder.id == work_order_id)
+        return (await db.execute(query)).scalar_one()
+
+async def test_fast_path_matches_pydantic_schemas(client, user):
+    headers = user["headers"]
+    response = await client.post(
+        "/api/emirler", json={"title": "serileştirme", "description": "açıklama", "assigned_user_id": user["id"]}, headers=headers
+    )
+    assert response.status_code == 201, response.text
+    work_order_id = response.json()["id"]
+    for description in ("ilk not", "ikinci not"):
+        response = await client.post(f"/api/emirler/{work_order_id}/updates", json={"description": description}, headers=headers)
+        assert response.status_code == 201, response.text
+
+    order = await load_work_order(work_order_id)
+
+    assert len(order.updates) == 2
+    for update in order.updates:
+        assert fast_json(serializers.work_order_update_out(update)) == schemas.WorkOrderUpdateOut.model_validate(update).model_dump(mode="json")
+    assert fast_json(serializers.work_order_out(order)) == schemas.WorkOrderOut.model_validate(order).model_dump(mode="json")
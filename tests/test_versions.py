@@ -0,0 +1,34 @@
+# tests/test_versions.py
+# Liste ETag'i, listede görünen her şey değiştiğinde değişmelidir; atanan kişinin kullanıcı adı dahil (bkz. versions.py).
+
+import pytest
+
+from backend import models
+from backend.database import AsyncSessionLocal
+from conftest import create_user
+
+pytestmark = pytest.mark.anyio
+
+async def rename_user(user_id: int, username: str):
+    async with AsyncSessionLocal() as db:
+        user = await db.get(models.User, user_id)
+        user.username = username
+        await db.commit()
+
+async def test_list_etag_changes_when_assignee_is_renamed(client, user):
+    headers = user["headers"]
+    assignee = await create_user(client)
+    response = await client.post("/api/emirler", json={"title": "etag", "assigned_user_id": assignee["id"]}, headers=headers)
+    assert response.status_code == 201, response.text
+    params = {"assigned_user_id": assignee["id"]}
+    first = await client.get("/api/emirler", params=params, headers=headers)
+    etag = first.headers["etag"]
+    assert (await client.get("/api/emirler", params=params, headers={**headers, "If-None-Match": etag})).status_code == 304
+
+    renamed = assignee["username"] + "-yeni"
+    await rename_user(assignee["id"], renamed)
+    second = await client.get("/api/emirler", params=params, headers={**headers, "If-None-Match": etag})
+
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+    assert {item["assigned_to_user"]["username"] for item in second.json()["items"]} == {renamed}